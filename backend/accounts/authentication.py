@@ -0,0 +1,23 @@
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .tenancy import set_current_firm
+
+
+def resolve_firm(user, token):
+    """The firm named by the token's claim; it must still be the user's firm."""
+    firm_id = token.get("firm", user.firm_id)
+    if firm_id != user.firm_id:
+        raise AuthenticationFailed("This token was issued for another firm. Please sign in again.")
+    return firm_id
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that also scopes the rest of the request to the token's firm."""
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            user, token = result
+            set_current_firm(resolve_firm(user, token))
+        return result
@@ -1,19 +1,27 @@
 """
-Management command: python manage.py create_admin
+Management command: python manage.py create_admin [--firm SLUG --firm-name NAME]
 
 Creates the CaseBox admin superuser using credentials from .env
 Run once after first migration. Safe to re-run (idempotent).
+With --firm, the admin belongs to that firm, which is created if missing —
+this is how a new firm is onboarded.
 """
 import os
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 
+from accounts.models import Firm
+
 User = get_user_model()
 
 
 class Command(BaseCommand):
     help = "Create the CaseBox admin superuser from environment variables"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--firm", default=Firm.DEFAULT_SLUG, help="Slug of the admin's firm")
+        parser.add_argument("--firm-name", help="Display name if the firm has to be created")
+
     def handle(self, *args, **options):
         username = os.getenv("ADMIN_USERNAME", "admin")
         password = os.getenv("ADMIN_PASSWORD")
@@ -32,8 +40,13 @@ class Command(BaseCommand):
             )
             return
 
+        firm, _ = Firm.objects.get_or_create(
+            slug=options["firm"],
+            defaults={"name": options["firm_name"] or options["firm"].replace("-", " ").title()},
+        )
         User.objects.create_superuser(
             username=username,
+            firm=firm,
             password=password,
             email=os.getenv("ADMIN_EMAIL", "admin@casebox.law"),
             role="admin",
@@ -42,5 +55,5 @@ class Command(BaseCommand):
             last_name="Admin",
         )
         self.stdout.write(
-            self.style.SUCCESS(f"✅ Admin user '{username}' created successfully.")
+            self.style.SUCCESS(f"✅ Admin user '{username}' created successfully for {firm.name}.")
         )
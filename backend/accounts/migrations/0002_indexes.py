@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at'], name='user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_approved'], name='user_role_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_approved', False), ('role', 'client')), fields=['-created_at'], name='user_pending_client_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import accounts.tenancy
+
+
+def create_default_firm(apps, schema_editor):
+    """Every row that exists before tenancy belongs to the default firm."""
+    Firm = apps.get_model("accounts", "Firm")
+    User = apps.get_model("accounts", "User")
+    firm, _ = Firm.objects.get_or_create(slug="default", defaults={"name": "Default firm"})
+    User.objects.filter(firm__isnull=True).update(firm=firm)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Firm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.SlugField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', accounts.tenancy.TenantUserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RunPython(create_default_firm, migrations.RunPython.noop),
+    ]
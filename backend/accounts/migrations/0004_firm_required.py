@@ -0,0 +1,43 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Separate from 0003 so the backfill's UPDATE has committed before the
+# ALTER TABLE (PostgreSQL refuses both in one transaction with deferred FKs)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_firm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_role_approved_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_pending_client_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['firm', '-created_at'], name='user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['firm', 'role', 'is_approved'], name='user_role_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_approved', False), ('role', 'client')), fields=['firm', '-created_at'], name='user_pending_client_idx'),
+        ),
+    ]
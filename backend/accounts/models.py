@@ -1,8 +1,58 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
 
+from .tenancy import TenantManager, TenantUserManager, current_firm_id
 
-class User(AbstractUser):
+
+class Firm(models.Model):
+    """A law firm hosted on this instance; the tenant every core row belongs to."""
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    DEFAULT_SLUG = "default"
+    _default_id = None
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def default_id(cls):
+        """The firm rows land in when nobody names one (self-registration, scripts, pre-tenancy data)."""
+        if cls._default_id is None:
+            firm, _ = cls.objects.get_or_create(slug=cls.DEFAULT_SLUG, defaults={"name": "Default firm"})
+            cls._default_id = firm.pk
+        return cls._default_id
+
+
+class TenantModel(models.Model):
+    """
+    Base for per-firm tables. `objects` only sees the current request's firm
+    and `all_firms` sees everything (see accounts/tenancy.py). Composite
+    indexes on these tables lead with `firm` so each firm reads its own slice.
+    """
+    firm = models.ForeignKey(
+        Firm, on_delete=models.PROTECT, related_name="+",
+        db_index=False,  # every table leads a composite index with it
+    )
+
+    objects = TenantManager()
+    all_firms = models.Manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.firm_id is None:
+            self.firm_id = current_firm_id() or Firm.default_id()
+        super().save(*args, **kwargs)
+
+
+class User(TenantModel, AbstractUser):
     ROLE_CHOICES = (
         ("admin", "Admin"),
         ("advocate", "Advocate"),
@@ -31,6 +81,20 @@ class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     profile_note = models.TextField(blank=True, help_text="Admin notes about this user")
 
+    objects = TenantUserManager()
+    all_firms = models.Manager()
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["firm", "-created_at"], name="user_created_idx"),
+            models.Index(fields=["firm", "role", "is_approved"], name="user_role_approved_idx"),
+            # Pending-approval queue: a handful of rows however many users exist
+            models.Index(
+                fields=["firm", "-created_at"], name="user_pending_client_idx",
+                condition=Q(role="client", is_approved=False),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.get_full_name() or self.username} ({self.role})"
 
@@ -9,6 +9,7 @@ class CaseBoxTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Embed role + approval status in the JWT so the frontend can
     know the user's role immediately on decode — no extra /me/ call needed.
+    The firm claim scopes every request made with the token to that firm.
     """
 
     def validate(self, attrs):
@@ -31,6 +32,7 @@ class CaseBoxTokenObtainPairSerializer(TokenObtainPairSerializer):
             "role": user.role,
             "is_approved": user.is_approved,
             "phone": user.phone,
+            "firm": user.firm_id,
         }
         return data
 
@@ -39,6 +41,7 @@ class CaseBoxTokenObtainPairSerializer(TokenObtainPairSerializer):
         token = super().get_token(user)
         token["role"] = user.role
         token["is_approved"] = user.is_approved
+        token["firm"] = user.firm_id
         return token
 
 
@@ -74,13 +77,14 @@ class UserCreateSerializer(serializers.ModelSerializer):
             "password", "role", "phone", "address",
         ]
 
+    # Usernames and emails stay unique across firms, since login doesn't name a firm
     def validate_username(self, value):
-        if User.objects.filter(username=value).exists():
+        if User.all_firms.filter(username=value).exists():
             raise serializers.ValidationError("This username is already taken.")
         return value
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.all_firms.filter(email=value).exists():
             raise serializers.ValidationError("This email is already registered.")
         return value
 
@@ -0,0 +1,65 @@
+"""
+Firm tenancy.
+
+Every core row (users, cases, documents, audit entries) belongs to one Firm.
+The firm for a request comes from the `firm` claim of its JWT (see
+accounts/authentication.py) and is held in a context variable for the rest
+of the request. Each tenant model's default manager, `objects`, filters on
+it, so viewsets, serializers and related-field validation only ever see the
+caller's firm. TenantMiddleware clears it again when the response is done.
+
+Outside a request (management commands, the Django admin) no firm is set
+and `objects` sees every row. `all_firms` is always unscoped. It is for code
+that serves every firm at once, such as the in-memory indexes, or that must
+not depend on who is asking, such as signal handlers.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import UserManager
+from django.db import models
+
+_current_firm = ContextVar("casebox_firm", default=None)
+
+
+def current_firm_id():
+    return _current_firm.get()
+
+
+def set_current_firm(firm_id):
+    _current_firm.set(firm_id)
+
+
+@contextmanager
+def use_firm(firm_id):
+    """Scope tenant managers to `firm_id` inside the block (e.g. in scripts)."""
+    token = _current_firm.set(firm_id)
+    try:
+        yield
+    finally:
+        _current_firm.reset(token)
+
+
+class TenantManager(models.Manager):
+    def get_queryset(self):
+        qs = super().get_queryset()
+        firm_id = current_firm_id()
+        return qs if firm_id is None else qs.filter(firm_id=firm_id)
+
+
+class TenantUserManager(TenantManager, UserManager):
+    pass
+
+
+class TenantMiddleware:
+    """Start every request with no firm and drop it afterwards, so worker threads never carry one over."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _current_firm.set(None)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_firm.reset(token)
@@ -8,6 +8,8 @@ from .serializers import (
     UserSerializer, UserCreateSerializer,
     ClientApprovalSerializer, MeSerializer,
 )
+from casebox.coalesce import single_flight
+from .models import Firm
 from .permissions import IsAdmin
 
 User = get_user_model()
@@ -45,9 +47,12 @@ def change_password(request):
 
 
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all().order_by("-created_at")
     permission_classes = [IsAdmin]
 
+    def get_queryset(self):
+        # Built per request: the manager scopes to the caller's firm
+        return User.objects.all().order_by("-created_at")
+
     def get_serializer_class(self):
         if self.action == "create":
             return UserCreateSerializer
@@ -56,8 +61,10 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path="pending-clients")
     def pending_clients(self, request):
         """Admin: list clients waiting for approval."""
-        pending = User.objects.filter(role="client", is_approved=False).order_by("-created_at")
-        return Response(UserSerializer(pending, many=True).data)
+        def pending():
+            clients = User.objects.filter(role="client", is_approved=False).order_by("-created_at")
+            return UserSerializer(clients, many=True).data
+        return Response(single_flight(request, pending))
 
     @action(detail=True, methods=["patch"], url_path="approve")
     def approve(self, request, pk=None):
@@ -103,16 +110,19 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 class RegisterView(generics.CreateAPIView):
-    """Public endpoint: clients self-register (pending admin approval)."""
+    """Public endpoint: clients self-register (pending admin approval) with the firm named by `firm`."""
     serializer_class = UserCreateSerializer
     permission_classes = [AllowAny]
 
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
         data["role"] = "client"  # Force client role on self-registration
+        firm = Firm.objects.filter(slug=request.data.get("firm") or Firm.DEFAULT_SLUG).first()
+        if firm is None:
+            return Response({"firm": ["Unknown firm."]}, status=status.HTTP_400_BAD_REQUEST)
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(firm=firm)
         return Response(
             {"message": "Registration successful. An admin will review and approve your account."},
             status=status.HTTP_201_CREATED,
@@ -0,0 +1,53 @@
+"""
+Plumbing for the async (ASGI) endpoints under /api/async/.
+
+DRF views are synchronous, so these are plain Django async views. They
+authenticate with the same JWT access tokens and apply the same approval
+rule as IsApprovedClient; blocking work that has no async API is pushed to
+a thread with sync_to_async.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import TenantJWTAuthentication
+from accounts.permissions import IsApprovedClient
+from accounts.tenancy import set_current_firm
+from .renderers import FastJSONRenderer
+
+
+def _authenticate(request):
+    result = TenantJWTAuthentication().authenticate(request)
+    return result[0] if result else None
+
+
+def async_api_view(admin_only=False):
+    """GET-only async view with JWT auth; sets request.user before calling the view."""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != "GET":
+                return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+            try:
+                user = await sync_to_async(_authenticate)(request)
+            except AuthenticationFailed as exc:
+                return JsonResponse({"detail": str(exc.detail)}, status=401)
+            if user is None:
+                return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+            if not user.can_access:
+                return JsonResponse({"detail": IsApprovedClient.message}, status=403)
+            if admin_only and user.role != "admin":
+                return JsonResponse(
+                    {"detail": "You do not have permission to perform this action."}, status=403
+                )
+            request.user = user
+            set_current_firm(user.firm_id)   # the thread that authenticated had its own context
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), status=status, content_type="application/json")
@@ -0,0 +1,14 @@
+# Async endpoints, mounted at /api/async/. Serve them with casebox.asgi under uvicorn.
+from django.urls import path
+
+from cases import async_views as cases
+from documents import async_views as documents
+from logs import async_views as logs
+
+urlpatterns = [
+    path("cases/", cases.case_list, name="async-case-list"),
+    path("cases/<int:pk>/", cases.case_detail, name="async-case-detail"),
+    path("documents/", documents.document_list, name="async-document-list"),
+    path("documents/<int:pk>/download/", documents.document_download, name="async-document-download"),
+    path("logs/", logs.log_list, name="async-log-list"),
+]
@@ -0,0 +1,127 @@
+"""
+Single-flight for expensive read views.
+
+When identical requests (same path, query params, firm and role scope)
+arrive while one of them is already computing its response data, the rest
+wait for that computation and reuse its result instead of running the same
+queries again.
+
+Inside a process, waiters block on the leader's threading.Event. Across
+gunicorn workers, the leader holds a lock in the shared cache (cache.add)
+and publishes its result under a key named after its lock token. Waiters in
+other workers poll for that key. A result is only ever handed to requests
+that arrived while it was being computed, so nothing is served stale. If
+the leader fails or takes longer than SINGLE_FLIGHT_WAIT_SECONDS, a waiter
+computes the data itself. Without REDIS_URL the cache is per process and
+only the in-process part applies.
+"""
+import hashlib
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import SINGLE_FLIGHT
+
+POLL_SECONDS = 0.025
+_MISSING = object()
+
+_lock = threading.Lock()
+_flights = {}   # key -> _Flight, for computations running in this process
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = _MISSING
+        self.error = None
+
+
+def scope_for(user):
+    """Who may share a result with `user`: every admin of a firm, otherwise only the user."""
+    if user.role == "admin":
+        return f"firm{user.firm_id}:admin"
+    return f"firm{user.firm_id}:{user.role}:{user.pk}"
+
+
+def request_key(request, *parts):
+    params = sorted((k, v) for k, values in request.GET.lists() for v in values)
+    signature = repr((request.path, scope_for(request.user), params, parts)).encode()
+    return "single-flight:" + hashlib.sha1(signature).hexdigest()
+
+
+def single_flight(request, compute, *parts):
+    """
+    compute(), or the result of an identical request already computing it.
+    `parts` are extra values the result depends on (e.g. a row's updated_at).
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return compute()
+    key = request_key(request, *parts)
+    match = getattr(request, "resolver_match", None)
+    endpoint = (match.view_name if match else "") or request.path
+
+    with _lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(settings.SINGLE_FLIGHT_WAIT_SECONDS):
+            if flight.error is not None:
+                raise flight.error
+            SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="shared")
+            return flight.result
+        SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="timed_out")
+        return compute()
+
+    try:
+        flight.result = _across_workers(key, compute, endpoint)
+        return flight.result
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _across_workers(key, compute, endpoint):
+    lock_key = f"{key}:lock"
+    timeout = settings.SINGLE_FLIGHT_WAIT_SECONDS
+    deadline = time.monotonic() + timeout
+    while True:
+        token = uuid.uuid4().hex
+        if cache.add(lock_key, token, timeout):
+            try:
+                result = compute()
+                cache.set(f"{key}:{token}", result, timeout)
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+            SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="led")
+            return result
+
+        holder = cache.get(lock_key)
+        while holder is not None and time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+            result = cache.get(f"{key}:{holder}", _MISSING)
+            if result is not _MISSING:
+                SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="shared")
+                return result
+            if cache.get(lock_key) != holder:
+                # Released between our two reads: the result may have just landed
+                result = cache.get(f"{key}:{holder}", _MISSING)
+                if result is not _MISSING:
+                    SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="shared")
+                    return result
+                break   # the leader failed; try to take over
+        if time.monotonic() >= deadline:
+            SINGLE_FLIGHT.inc(endpoint=endpoint, outcome="timed_out")
+            return compute()
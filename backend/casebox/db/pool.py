@@ -0,0 +1,231 @@
+"""
+A small bounded connection pool, one per database alias per process.
+
+Idle connections are reused most-recently-used first, so a quiet period lets
+the surplus age out through idle reaping instead of keeping every connection
+half-warm. A connection is health-checked on checkout only when it has sat
+idle for longer than `check_after`, is retired once it reaches
+`max_lifetime`, and is rolled back on checkin so no transaction state leaks
+to the next borrower.
+
+After os.fork() the child starts with empty pools. Connections inherited
+from the parent are kept referenced but never closed there: closing would
+send a terminate message down a socket the parent is still using.
+"""
+import collections
+import os
+import threading
+import time
+
+from casebox.metrics import Counter, Histogram
+
+POOL_CHECKOUTS = Counter(
+    "casebox_db_pool_checkouts_total", "Pool checkouts by alias and outcome (reused, opened, timeout).",
+    ("alias", "outcome"),
+)
+POOL_WAIT = Histogram(
+    "casebox_db_pool_wait_seconds", "Time spent waiting for a pooled connection.",
+    ("alias",), buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+POOL_CLOSED = Counter(
+    "casebox_db_pool_closed_total", "Pooled connections closed, by alias and reason.",
+    ("alias", "reason"),
+)
+
+_pools = []
+_inherited = []
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class _Entry:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn, now):
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+
+
+class ConnectionPool:
+    """
+    `connect()` opens a connection, `check(conn)` returns whether an idle
+    connection still works, `reset(conn)` prepares a returned connection for
+    reuse (raising if it can't be), and `close(conn)` discards one.
+    """
+
+    def __init__(self, alias, connect, check, reset, close, *, min_size=0, max_size=10,
+                 timeout=10.0, max_lifetime=1800.0, max_idle=300.0, check_after=30.0):
+        self.alias = alias
+        self._connect = connect
+        self._check = check
+        self._reset = reset
+        self._close = close
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._retired = False
+        self._init_state()
+        _pools.append(self)
+
+    def _init_state(self):
+        self._cond = threading.Condition()
+        self._idle = collections.deque()
+        self._in_use = {}
+        self._size = 0          # idle + in use + being opened
+        self._waiting = 0
+        self.totals = collections.Counter()
+
+    def checkout(self):
+        start = time.monotonic()
+        while True:
+            entry = self._take(start + self.timeout)
+            if entry is None:
+                return self._open(start)
+            if time.monotonic() - entry.last_used >= self.check_after and not self._check(entry.conn):
+                self._discard(entry, "broken")
+                continue
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self.totals["reused"] += 1
+            self._record_checkout("reused", start)
+            return entry.conn
+
+    def checkin(self, conn):
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            _inherited.append(conn)  # not opened by this process's pool
+            return
+        if self._retired:
+            self._discard(entry, "retired")
+            return
+        try:
+            self._reset(conn)
+        except Exception:
+            self._discard(entry, "broken")
+            return
+        now = time.monotonic()
+        if now - entry.created_at >= self.max_lifetime:
+            self._discard(entry, "lifetime")
+            return
+        entry.last_used = now
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "alias": self.alias,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "max_size": self.max_size,
+                **self.totals,
+            }
+
+    def retire(self):
+        """Stop pooling: close idle connections now and the rest as they are checked in."""
+        with self._cond:
+            self._retired = True
+        if self in _pools:
+            _pools.remove(self)
+        self.close_all()
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), collections.deque()
+        for entry in idle:
+            self._discard(entry, "shutdown")
+
+    # ── internals ────────────────────────────────────────────────────────────
+
+    def _take(self, deadline):
+        """An idle entry, or None once a slot has been reserved for a new connection."""
+        with self._cond:
+            while True:
+                reaped = self._reap(time.monotonic())
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.totals["timeouts"] += 1
+                    POOL_CHECKOUTS.inc(alias=self.alias, outcome="timeout")
+                    raise PoolTimeout(
+                        f"No connection available in the '{self.alias}' pool "
+                        f"within {self.timeout}s ({self.max_size} in use)."
+                    )
+                self._waiting += 1
+                self._cond.wait(remaining)
+                self._waiting -= 1
+        for stale in reaped:
+            self._discard(stale, "idle", counted=False)
+        if entry is not None and time.monotonic() - entry.created_at >= self.max_lifetime:
+            self._discard(entry, "lifetime")
+            return self._take(deadline)
+        return entry
+
+    def _reap(self, now):
+        """Pop connections idle past max_idle (oldest first), keeping min_size. Caller holds the lock."""
+        reaped = []
+        while (self._idle and self._size - len(reaped) > self.min_size
+               and now - self._idle[0].last_used >= self.max_idle):
+            reaped.append(self._idle.popleft())
+        self._size -= len(reaped)
+        return reaped
+
+    def _open(self, start):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._in_use[id(conn)] = _Entry(conn, time.monotonic())
+            self.totals["opened"] += 1
+        self._record_checkout("opened", start)
+        return conn
+
+    def _discard(self, entry, reason, counted=True):
+        if counted:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+        self.totals[f"closed_{reason}"] += 1
+        POOL_CLOSED.inc(alias=self.alias, reason=reason)
+        try:
+            self._close(entry.conn)
+        except Exception:
+            pass
+
+    def _record_checkout(self, outcome, start):
+        POOL_CHECKOUTS.inc(alias=self.alias, outcome=outcome)
+        POOL_WAIT.observe(time.monotonic() - start, alias=self.alias)
+
+    def _after_fork(self):
+        _inherited.extend(entry.conn for entry in self._idle)
+        _inherited.extend(entry.conn for entry in self._in_use.values())
+        self._init_state()
+
+
+def _reset_pools_in_child():
+    for pool in _pools:
+        pool._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_in_child)
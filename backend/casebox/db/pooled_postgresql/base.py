@@ -0,0 +1,92 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Use it with ENGINE "casebox.db.pooled_postgresql" and an optional "POOL" dict
+in the database settings (MIN_SIZE, MAX_SIZE, TIMEOUT, MAX_LIFETIME,
+MAX_IDLE, CHECK_AFTER; times in seconds). Leave CONN_MAX_AGE at 0: Django
+then "closes" the connection at the end of every request, which here hands
+it back to the pool instead of tearing it down.
+"""
+import threading
+
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.db.backends.postgresql.base import IsolationLevel
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from casebox.db.pool import ConnectionPool, PoolTimeout
+
+_pools = {}   # alias -> (connection params key, pool)
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias):
+    current = _pools.get(alias)
+    return current[1] if current else None
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    _pool = None   # the pool self.connection was checked out from
+
+    def _pool_for(self, conn_params):
+        """
+        The alias's pool for these connection params. When the params change
+        (e.g. the test runner switching NAME to test_<NAME>) the old pool is
+        retired, so no connection to the previous database is handed out again.
+        """
+        key = repr(sorted(conn_params.items()))
+        with _pools_lock:
+            current = _pools.get(self.alias)
+            if current is not None and current[0] == key:
+                return current[1]
+            pool = self._make_pool(conn_params)
+            _pools[self.alias] = (key, pool)
+        if current is not None:
+            current[1].retire()
+        return pool
+
+    def _make_pool(self, conn_params):
+        options = {key.lower(): value for key, value in self.settings_dict.get("POOL", {}).items()}
+        return ConnectionPool(
+            self.alias,
+            connect=lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            check=self._check_pooled,
+            reset=self._reset_pooled,
+            close=lambda conn: conn.close(),
+            **options,
+        )
+
+    def get_new_connection(self, conn_params):
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+        pool = self._pool_for(conn_params)
+        try:
+            connection = pool.checkout()
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        self._pool = pool
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool.checkin(self.connection)
+
+    @staticmethod
+    def _check_pooled(conn):
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                conn.rollback()   # outside autocommit the check opened a transaction
+            return True
+        except Exception:
+            return False
+
+    def _reset_pooled(self, conn):
+        if conn.closed:
+            raise self.Database.InterfaceError("connection already closed")
+        if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            conn.rollback()
@@ -0,0 +1,179 @@
+"""
+SQLite backend tuned for a multi-threaded, multi-worker deployment.
+
+Every connection gets WAL journalling (readers never block the writer),
+synchronous=NORMAL, a memory map, a larger page cache and a busy timeout.
+Writes are serialised through one writer lock per database file — a thread
+lock inside the process plus an flock() on "<db>.writer-lock" across gunicorn
+workers — so concurrent requests queue for their turn instead of failing with
+"database is locked". Transactions start with BEGIN IMMEDIATE while holding
+that lock, which also removes the deferred-transaction upgrade deadlock where
+SQLite gives up on a reader that tries to become a writer.
+
+An atomic() block holds the writer lock until it commits or rolls back, so
+keep read-only work out of atomic blocks.
+
+Override any PRAGMA with a "PRAGMAS" dict in the database settings; the
+busy timeout (seconds) comes from OPTIONS["timeout"] as usual.
+"""
+import os
+import threading
+import time
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+
+try:
+    import fcntl
+except ImportError:  # Windows: the in-process lock still serialises threads
+    fcntl = None
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,   # KiB when negative
+    "temp_store": "MEMORY",
+}
+DEFAULT_TIMEOUT = 20
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLAC")
+
+_writer_locks = {}
+_writer_locks_guard = threading.Lock()
+
+
+class WriterLock:
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        if not self._thread_lock.acquire(timeout=timeout):
+            return False
+        if self.path is None or fcntl is None:
+            return True
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        delay = 0.0005
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    self._thread_lock.release()
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 0.02)
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+def get_writer_lock(database):
+    # Keyed by pid as well: a forked child must not share the parent's lock state
+    key = (os.getpid(), database)
+    with _writer_locks_guard:
+        lock = _writer_locks.get(key)
+        if lock is None:
+            path = None if database is None else f"{database}.writer-lock"
+            lock = _writer_locks[key] = WriterLock(path)
+        return lock
+
+
+class TunedCursorWrapper(SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        if self.db.holds_writer_lock or not query.lstrip()[:6].upper().startswith(WRITE_PREFIXES):
+            return super().execute(query, params)
+        with self.db.writer_turn():
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        if self.db.holds_writer_lock:
+            return super().executemany(query, param_list)
+        with self.db.writer_turn():
+            return super().executemany(query, param_list)
+
+
+class _WriterTurn:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.acquire_writer_lock()
+
+    def __exit__(self, *exc_info):
+        self.db.release_writer_lock()
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    holds_writer_lock = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.setdefault("timeout", DEFAULT_TIMEOUT)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = {**DEFAULT_PRAGMAS, **self.settings_dict.get("PRAGMAS", {})}
+        pragmas.setdefault("busy_timeout", int(conn_params["timeout"] * 1000))
+        for name, value in pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=TunedCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    @property
+    def writer_lock(self):
+        database = None if self.is_in_memory_db() else str(self.settings_dict["NAME"])
+        return get_writer_lock(database)
+
+    def writer_turn(self):
+        return _WriterTurn(self)
+
+    def acquire_writer_lock(self):
+        timeout = self.settings_dict["OPTIONS"].get("timeout", DEFAULT_TIMEOUT)
+        if not self.writer_lock.acquire(timeout):
+            raise self.Database.OperationalError(
+                f"database is locked (waited {timeout}s for the writer lock)"
+            )
+        self.holds_writer_lock = True
+
+    def release_writer_lock(self):
+        if self.holds_writer_lock:
+            self.holds_writer_lock = False
+            self.writer_lock.release()
+
+    def _start_transaction_under_autocommit(self):
+        self.acquire_writer_lock()
+        try:
+            self.cursor().execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.release_writer_lock()
+            raise
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self.release_writer_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.release_writer_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self.release_writer_lock()
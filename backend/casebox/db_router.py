@@ -0,0 +1,138 @@
+"""
+Read-replica routing with read-your-writes consistency.
+
+ReplicaRoutingMiddleware marks each request as replica-eligible when it is a
+safe-method request from a caller who has not written recently. Within such a
+request ReplicaRouter spreads reads round-robin over the healthy aliases in
+DATABASE_REPLICAS; everything else — writes, reads inside a transaction, and
+every read for REPLICA_PIN_SECONDS after the same user's last successful
+write — goes to "default". Pins are kept in the cache, so they hold across
+gunicorn workers when REDIS_URL is configured.
+
+For a local stand-in, point SQLITE_REPLICAS at a copy of db.sqlite3: the
+replica only sees what was copied, which makes the routing easy to observe.
+"""
+import contextvars
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+_reads_on_replica = contextvars.ContextVar("casebox_reads_on_replica", default=False)
+_wrote_during_read = contextvars.ContextVar("casebox_wrote_during_read", default=False)
+
+HEALTH_CHECK_SECONDS = 5
+RETRY_DOWN_REPLICA_SECONDS = 30
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.replicas = list(settings.DATABASE_REPLICAS)
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+        self._down_until = {}
+        self._checked_at = {}
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db  # related lookups follow the object they start from
+        if not self.replicas or not _reads_on_replica.get():
+            return "default"
+        if connections["default"].in_atomic_block:
+            return "default"
+        return self._next_healthy_replica() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas hold the same data as the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+    def _next_healthy_replica(self):
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            alias = self.replicas[next(self._turn) % len(self.replicas)]
+            if self._down_until.get(alias, 0) > now:
+                continue
+            if self._healthy(alias, now):
+                return alias
+        return None
+
+    def _healthy(self, alias, now):
+        if now - self._checked_at.get(alias, 0) < HEALTH_CHECK_SECONDS:
+            return True
+        with self._lock:
+            self._checked_at[alias] = now
+        connection = connections[alias]
+        try:
+            # ensure_connection() alone is a no-op once open; a replica that died since must answer
+            connection.ensure_connection()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            try:
+                connection.close()
+            except Exception:
+                pass
+            with self._lock:
+                self._down_until[alias] = now + RETRY_DOWN_REPLICA_SECONDS
+            return False
+        return True
+
+
+def stick_to_primary():
+    """
+    For a safe-method request that wrote anyway (e.g. restoring an archived
+    case on first view): the rest of its reads, and the caller's reads for
+    REPLICA_PIN_SECONDS afterwards, go to the primary.
+    """
+    _reads_on_replica.set(False)
+    _wrote_during_read.set(True)
+
+
+def _pin_key(request):
+    """The user id from a valid bearer token, else the client address."""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from logs.utils import _get_client_ip
+
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw = auth.get_raw_token(header) if header else None
+    if raw:
+        try:
+            return f"user:{auth.get_validated_token(raw)['user_id']}"
+        except Exception:
+            pass
+    return f"ip:{_get_client_ip(request)}"
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = f"db-pin:{_pin_key(request)}"
+        safe = request.method in SAFE_METHODS
+        token = _reads_on_replica.set(safe and not cache.get(key))
+        wrote_token = _wrote_during_read.set(False)
+        try:
+            response = self.get_response(request)
+            wrote = _wrote_during_read.get()
+        finally:
+            _reads_on_replica.reset(token)
+            _wrote_during_read.reset(wrote_token)
+
+        if (not safe or wrote) and response.status_code < 400:
+            cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
@@ -0,0 +1,162 @@
+"""
+Per-request SQL and timing instrumentation.
+
+RequestInstrumentationMiddleware counts queries, total DB time and repeated
+statements (the N+1 signature) for each sampled request, times the view and
+render phases plus any named phase() blocks, and reports them in a
+Server-Timing header and one JSON log line on the "casebox.requests" logger.
+
+It is opt-in (REQUEST_INSTRUMENTATION=True) and removes itself from the
+middleware chain when off, so a disabled install pays nothing.
+"""
+import contextvars
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("casebox.requests")
+
+_current = contextvars.ContextVar("casebox_request_timer", default=None)
+
+
+class QueryStats:
+    """connection.execute_wrapper() hook: counts statements and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Executions of a statement beyond its first — N+1 loops show up here."""
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def most_repeated(self):
+        sql, n = self.statements.most_common(1)[0] if self.statements else ("", 0)
+        return (sql, n) if n > 1 else ("", 0)
+
+    @contextmanager
+    def capture(self):
+        """Attach to every configured database connection for the duration of the block."""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ended = None
+        self.phases = {}
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name):
+    """Time a block as a named Server-Timing phase. A no-op outside an instrumented request."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def current_timer():
+    return _current.get()
+
+
+class RequestInstrumentationMiddleware:
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            with QueryStats().capture() as stats:
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        ended = time.perf_counter()
+        timings = self._timings(timer, stats, ended)
+        response["Server-Timing"] = ", ".join(
+            f'{name};dur={ms:.1f}' + (f';desc="{desc}"' if desc else "")
+            for name, ms, desc in timings
+        )
+        self._log(request, response, timer, stats, ended)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = _current.get()
+        if timer is not None:
+            timer.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook, so it marks the view/render boundary
+        timer = _current.get()
+        if timer is not None:
+            timer.view_ended = time.perf_counter()
+        return response
+
+    def _timings(self, timer, stats, ended):
+        timings = [(
+            "db", stats.duration * 1000,
+            f"{stats.count} queries" + (f", {stats.duplicates} repeated" if stats.duplicates else ""),
+        )]
+        if timer.view_started is not None:
+            view_ended = timer.view_ended or ended
+            timings.append(("view", (view_ended - timer.view_started) * 1000, ""))
+            if timer.view_ended is not None:
+                timings.append(("render", (ended - timer.view_ended) * 1000, ""))
+        for name, seconds in timer.phases.items():
+            timings.append((name, seconds * 1000, ""))
+        timings.append(("total", (ended - timer.started) * 1000, ""))
+        return timings
+
+    def _log(self, request, response, timer, stats, ended):
+        repeated_sql, repeated_n = stats.most_repeated()
+        match = getattr(request, "resolver_match", None)
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round((ended - timer.started) * 1000, 2),
+            "db_ms": round(stats.duration * 1000, 2),
+            "queries": stats.count,
+            "repeated_queries": stats.duplicates,
+            "most_repeated": {"sql": repeated_sql[:300], "count": repeated_n} if repeated_n else None,
+            "phases_ms": {k: round(v * 1000, 2) for k, v in timer.phases.items()},
+        }))
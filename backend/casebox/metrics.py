@@ -0,0 +1,299 @@
+"""
+Self-contained Prometheus-style metrics.
+
+Counters and histograms are declared at import time below and recorded from
+MetricsMiddleware, the document upload view and log_action. Values live in a
+store chosen from settings:
+
+- METRICS_DIR set: each process appends to its own mmap-backed file in that
+  directory and /metrics sums every file, so numbers aggregate across gunicorn
+  workers (including ones that have exited). Empty the directory when the
+  master starts, e.g. in gunicorn's on_starting hook.
+- otherwise: a plain in-process dict, fine for runserver or a single worker.
+
+Nothing is recorded unless METRICS_ENABLED=True.
+"""
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import QueryStats
+
+_HEADER = struct.Struct("<Q")   # bytes in use
+_KEY_LEN = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+
+class MemoryStore:
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def read_all(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class MmapStore:
+    """
+    One append-only file per process: [used][len|key|pad|value]... where each
+    key is written once and its 8-byte value is then updated in place. Readers
+    only trust bytes up to `used`, which is bumped after an entry is complete.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._pid = os.getpid()
+        path = os.path.join(self.directory, f"metrics_{self._pid}.db")
+        self._file = open(path, "a+b")
+        if os.path.getsize(path) < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._offsets = {}
+        used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        for key, offset, _ in _entries(self._map, used):
+            self._offsets[key] = offset
+        self._used = used
+        _HEADER.pack_into(self._map, 0, used)
+
+    def inc(self, key, amount):
+        with self._lock:
+            if self._pid != os.getpid():  # first use, or we are a freshly forked worker
+                self._open()
+            offset = self._offsets.get(key)
+            if offset is None:
+                offset = self._append(key)
+            value = _VALUE.unpack_from(self._map, offset)[0]
+            _VALUE.pack_into(self._map, offset, value + amount)
+
+    def _append(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (-(_KEY_LEN.size + len(encoded)) % 8)
+        size = _KEY_LEN.size + padded + _VALUE.size
+        if self._used + size > len(self._map):
+            capacity = len(self._map)
+            while self._used + size > capacity:
+                capacity *= 2
+            self._map.close()
+            self._file.truncate(capacity)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        start = self._used
+        _KEY_LEN.pack_into(self._map, start, len(encoded))
+        self._map[start + _KEY_LEN.size:start + _KEY_LEN.size + len(encoded)] = encoded
+        offset = start + _KEY_LEN.size + padded
+        _VALUE.pack_into(self._map, offset, 0.0)
+        self._used += size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def read_all(self):
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory, "metrics_*.db")):
+            with open(path, "rb") as fh:
+                data = fh.read()
+            if len(data) < _HEADER.size:
+                continue
+            used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+            for key, _, value in _entries(data, used):
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+
+def _entries(buf, used):
+    pos = _HEADER.size
+    while pos + _KEY_LEN.size <= used:
+        length = _KEY_LEN.unpack_from(buf, pos)[0]
+        key = bytes(buf[pos + _KEY_LEN.size:pos + _KEY_LEN.size + length]).decode()
+        padded = length + (-(_KEY_LEN.size + length) % 8)
+        offset = pos + _KEY_LEN.size + padded
+        if offset + _VALUE.size > used:
+            break
+        yield key, offset, _VALUE.unpack_from(buf, offset)[0]
+        pos = offset + _VALUE.size
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    directory = settings.METRICS_DIR
+                    self._store = MmapStore(directory) if directory else MemoryStore()
+        return self._store
+
+    def inc(self, name, labels, amount):
+        if settings.METRICS_ENABLED:
+            self.store.inc(json.dumps([name, labels]), amount)
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        samples = {}
+        for key, value in self.store.read_all().items():
+            name, labels = json.loads(key)
+            samples.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.expose(samples))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        registry.register(self)
+
+    def inc(self, amount=1.0, **labels):
+        registry.inc(self.name, [[k, labels[k]] for k in self.labelnames], amount)
+
+    def expose(self, samples):
+        for labels, value in sorted(samples.get(self.name, ())):
+            yield f"{self.name}{_format_labels(labels)} {value:g}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets or (
+            0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+        ))
+        registry.register(self)
+
+    def observe(self, value, **labels):
+        if not settings.METRICS_ENABLED:
+            return
+        base = [[k, labels[k]] for k in self.labelnames]
+        # Only the first matching bucket is stored; exposition makes them cumulative
+        bound = next((b for b in self.buckets if value <= b), "+Inf")
+        registry.inc(f"{self.name}_bucket", base + [["le", bound]], 1.0)
+        registry.inc(f"{self.name}_sum", base, value)
+        registry.inc(f"{self.name}_count", base, 1.0)
+
+    def expose(self, samples):
+        series = {}
+        for labels, value in samples.get(f"{self.name}_bucket", ()):
+            base = tuple(tuple(pair) for pair in labels if pair[0] != "le")
+            le = dict(labels)["le"]
+            series.setdefault(base, {})[le] = series.get(base, {}).get(le, 0.0) + value
+        sums = {tuple(map(tuple, l)): v for l, v in samples.get(f"{self.name}_sum", ())}
+        counts = {tuple(map(tuple, l)): v for l, v in samples.get(f"{self.name}_count", ())}
+
+        for base in sorted(series):
+            cumulative = 0.0
+            for bound in (*self.buckets, "+Inf"):
+                cumulative += series[base].get(bound, 0.0)
+                labels = [*base, ("le", bound if bound == "+Inf" else f"{bound:g}")]
+                yield f"{self.name}_bucket{_format_labels(labels)} {cumulative:g}"
+            yield f"{self.name}_sum{_format_labels(base)} {sums.get(base, 0.0):g}"
+            yield f"{self.name}_count{_format_labels(base)} {counts.get(base, 0.0):g}"
+
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUESTS = Counter(
+    "casebox_requests_total", "HTTP requests by endpoint, method and status class.",
+    ("endpoint", "method", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "casebox_request_duration_seconds", "Time to produce a response, by endpoint.",
+    ("endpoint", "method"),
+)
+REQUEST_DB_TIME = Histogram(
+    "casebox_request_db_seconds", "Time spent in SQL per request, by endpoint.",
+    ("endpoint",),
+)
+REQUEST_QUERIES = Histogram(
+    "casebox_request_db_queries", "SQL statements executed per request, by endpoint.",
+    ("endpoint",), buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+RESPONSE_SIZE = Histogram(
+    "casebox_response_size_bytes", "Response body size, by endpoint.",
+    ("endpoint",), buckets=SIZE_BUCKETS,
+)
+UPLOAD_BYTES = Histogram(
+    "casebox_document_upload_bytes", "Size of uploaded document files.",
+    buckets=SIZE_BUCKETS,
+)
+AUDIT_WRITE_LATENCY = Histogram(
+    "casebox_audit_log_write_seconds", "Time taken by log_action to write an AccessLog row.",
+    ("action",), buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+SINGLE_FLIGHT = Counter(
+    "casebox_single_flight_total", "Coalesced view computations, by endpoint and outcome (led, shared, timed_out).",
+    ("endpoint", "outcome"),
+)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with QueryStats().capture() as stats:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        endpoint = (match.view_name or match.route) if match else "unmatched"
+        REQUESTS.inc(endpoint=endpoint, method=request.method,
+                     status=f"{response.status_code // 100}xx")
+        REQUEST_LATENCY.observe(elapsed, endpoint=endpoint, method=request.method)
+        REQUEST_DB_TIME.observe(stats.duration, endpoint=endpoint)
+        REQUEST_QUERIES.observe(stats.count, endpoint=endpoint)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), endpoint=endpoint)
+        return response
@@ -0,0 +1,203 @@
+"""
+On-demand and slow-request profiling.
+
+ProfilingMiddleware (PROFILING_ENABLED=True) captures a profile of a request
+in one of two ways:
+
+- an admin sends the X-CaseBox-Profile header: the request runs under
+  cProfile and is always stored;
+- PROFILE_SLOW_MS is set: every request is watched by a shared stack
+  sampler, and the collapsed stacks are kept only when the request turns out
+  slower than the threshold.
+
+Profiles are stored zlib-compressed in logs.RequestProfile with the route and
+the request's SQL log, and are listed/downloaded under /api/logs/profiles/.
+"""
+import cProfile
+import json
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import QueryStats
+
+logger = logging.getLogger("casebox.profiling")
+
+PROFILE_HEADER = "HTTP_X_CASEBOX_PROFILE"
+MAX_LOGGED_QUERIES = 500
+
+
+class QueryLog(QueryStats):
+    """QueryStats that also keeps each statement and its duration, up to a cap."""
+
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return super().__call__(execute, sql, params, many, context)
+        finally:
+            if len(self.entries) < MAX_LOGGED_QUERIES:
+                self.entries.append({
+                    "sql": sql,
+                    "ms": round((time.perf_counter() - start) * 1000, 3),
+                })
+
+
+class StackSampler:
+    """
+    One background thread samples the stacks of every registered request
+    thread each `interval` seconds. It sleeps while nothing is registered.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._watched = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, ident):
+        with self._lock:
+            self._watched[ident] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="casebox-stack-sampler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, ident):
+        with self._lock:
+            return self._watched.pop(ident, Counter())
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._watched
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._wake.wait()
+                continue
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, counts in self._watched.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        counts[_collapse(frame)] += 1
+
+
+def _collapse(frame):
+    """Render a stack root-first as 'file:function:line;...' (flamegraph collapsed format)."""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _requested_by_admin(request):
+    """Authenticate the bearer token here — DRF only does so later, inside the view."""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except Exception:
+        return None
+    if result and result[0].role == "admin":
+        return result[0]
+    return None
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = settings.PROFILE_SLOW_MS / 1000
+        self.sampler = StackSampler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+
+    def __call__(self, request):
+        admin = _requested_by_admin(request) if request.META.get(PROFILE_HEADER) else None
+        if admin is not None:
+            return self._profile(request, admin)
+        if self.slow_seconds:
+            return self._sample(request)
+        return self.get_response(request)
+
+    def _profile(self, request, user):
+        profiler = cProfile.Profile()
+        queries = QueryLog()
+        start = time.perf_counter()
+        with queries.capture():
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        stats = pstats.Stats(profiler)
+        record = self._store(request, response, elapsed, queries, "header", "pstats",
+                             marshal.dumps(stats.stats), user)
+        if record is not None:
+            response["X-CaseBox-Profile-Id"] = str(record.pk)
+        return response
+
+    def _sample(self, request):
+        ident = threading.get_ident()
+        queries = QueryLog()
+        start = time.perf_counter()
+        self.sampler.start(ident)
+        try:
+            with queries.capture():
+                response = self.get_response(request)
+        finally:
+            samples = self.sampler.stop(ident)
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= self.slow_seconds and samples:
+            collapsed = "\n".join(f"{stack} {n}" for stack, n in samples.most_common())
+            user = getattr(request, "user", None)
+            self._store(request, response, elapsed, queries, "slow", "collapsed",
+                        collapsed.encode(), user if user and user.is_authenticated else None)
+        return response
+
+    def _store(self, request, response, elapsed, queries, trigger, fmt, raw, user):
+        from logs.models import RequestProfile
+
+        match = getattr(request, "resolver_match", None)
+        data = zlib.compress(raw, 6)
+        query_log = zlib.compress(json.dumps(queries.entries).encode(), 6)
+        try:
+            return RequestProfile.objects.create(
+                method=request.method,
+                path=request.path[:500],
+                route=(match.view_name or "") if match else "",
+                status_code=response.status_code,
+                duration_ms=elapsed * 1000,
+                query_count=queries.count,
+                trigger=trigger,
+                format=fmt,
+                profile_data=data,
+                query_log=query_log,
+                size=len(data) + len(query_log),
+                user=user,
+                firm_id=user.firm_id if user else None,   # None: the request's firm, else the default
+            )
+        except Exception:
+            logger.exception("Could not store request profile for %s", request.path)
+            return None
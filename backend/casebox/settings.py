@@ -1,5 +1,6 @@
 from pathlib import Path
 from datetime import timedelta
+import importlib.util
 import os
 from dotenv import load_dotenv
 
@@ -31,6 +32,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "accounts.tenancy.TenantMiddleware",                         # per-request firm scope (see accounts/tenancy.py)
+    "casebox.metrics.MetricsMiddleware",                         # no-op unless enabled below
+    "casebox.instrumentation.RequestInstrumentationMiddleware",  # no-op unless enabled below
+    "casebox.profiling.ProfilingMiddleware",                     # no-op unless enabled below
+    "casebox.db_router.ReplicaRoutingMiddleware",                # no-op without replicas
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -70,6 +76,10 @@ if os.getenv("USE_SQLITE", "True") == "True":
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    if os.getenv("SQLITE_TUNING", "False") == "True":
+        # WAL, busy timeout and a single-writer lock so concurrent workers queue instead of failing
+        DATABASES["default"]["ENGINE"] = "casebox.db.sqlite_tuned"
+        DATABASES["default"]["OPTIONS"] = {"timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 20))}
 else:
     DATABASES = {
         "default": {
@@ -81,6 +91,65 @@ else:
             "PORT": os.getenv("DB_PORT", "5432"),
         }
     }
+    if os.getenv("DB_POOL", "False") == "True":
+        # Per-process pool; Django hands the connection back at the end of each request
+        DATABASES["default"]["ENGINE"] = "casebox.db.pooled_postgresql"
+        DATABASES["default"]["POOL"] = {
+            "MIN_SIZE": int(os.getenv("DB_POOL_MIN_SIZE", 0)),
+            "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "MAX_LIFETIME": float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+            "MAX_IDLE": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+            "CHECK_AFTER": float(os.getenv("DB_POOL_CHECK_AFTER", 30)),
+        }
+    else:
+        # One persistent connection per worker thread, re-checked after errors
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", 60))
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replicas: SQLITE_REPLICAS=/path/a.sqlite3,... or DB_REPLICA_HOSTS=host1,host2 (PostgreSQL).
+# Safe-method reads are spread over them; a user's reads stay on the primary for
+# REPLICA_PIN_SECONDS after they write.
+if os.getenv("USE_SQLITE", "True") == "True":
+    _replicas = [
+        {"ENGINE": "django.db.backends.sqlite3", "NAME": path}
+        for path in os.getenv("SQLITE_REPLICAS", "").split(",") if path
+    ]
+else:
+    _replicas = [
+        {**DATABASES["default"], "HOST": host}
+        for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host
+    ]
+DATABASE_REPLICAS = []
+for _i, _replica in enumerate(_replicas, start=1):
+    DATABASES[f"replica{_i}"] = {**_replica, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(f"replica{_i}")
+DATABASE_ROUTERS = ["casebox.db_router.ReplicaRouter"]
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+# ─── CACHE ────────────────────────────────────────────────────────────────────
+# Per-process memory cache by default; set REDIS_URL to share it across gunicorn workers
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# How long ?facets= counts on the case list are reused for the same scope + filters
+CASE_FACET_CACHE_SECONDS = int(os.getenv("CASE_FACET_CACHE_SECONDS", 30))
+
+# Identical concurrent requests to the dashboard, pending-clients and case detail share one
+# computation (see casebox/coalesce.py); across workers this needs the shared REDIS_URL cache
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "True") == "True"
+SINGLE_FLIGHT_WAIT_SECONDS = int(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", 10))   # then compute independently
 
 # ─── AUTH ─────────────────────────────────────────────────────────────────────
 AUTH_USER_MODEL = "accounts.User"
@@ -95,7 +164,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # ─── JWT ──────────────────────────────────────────────────────────────────────
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.TenantJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -105,7 +174,20 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    # orjson-backed JSON (stdlib fallback); MessagePack too when msgpack is installed
+    "DEFAULT_RENDERER_CLASSES": [
+        "casebox.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "casebox.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
+if importlib.util.find_spec("msgpack"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append("casebox.renderers.MessagePackRenderer")
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("casebox.renderers.MessagePackParser")
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=8),
@@ -130,9 +212,50 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Tiered media (documents.storage.TieredStorage): `manage.py tier_documents` gzips files
+# older than DOCUMENT_COLD_AFTER_DAYS and not downloaded for DOCUMENT_COLD_IDLE_DAYS into
+# DOCUMENT_COLD_ROOT. Reads inflate them into an LRU cache capped at DOCUMENT_CACHE_MAX_BYTES.
+DOCUMENT_TIERING = os.getenv("DOCUMENT_TIERING", "False") == "True"
+DOCUMENT_COLD_ROOT = os.getenv("DOCUMENT_COLD_ROOT", str(BASE_DIR / "media_cold"))
+DOCUMENT_CACHE_ROOT = os.getenv("DOCUMENT_CACHE_ROOT", str(BASE_DIR / "media_cache"))
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+DOCUMENT_COLD_AFTER_DAYS = int(os.getenv("DOCUMENT_COLD_AFTER_DAYS", 180))
+DOCUMENT_COLD_IDLE_DAYS = int(os.getenv("DOCUMENT_COLD_IDLE_DAYS", 30))
+# Lifetime of the signed file links documents/<id>/download/ hands out in this mode
+DOCUMENT_DOWNLOAD_EXPIRY_SECONDS = int(os.getenv("DOCUMENT_DOWNLOAD_EXPIRY_SECONDS", 60))
+
+# S3-compatible bucket for documents: browsers upload and download directly through presigned
+# URLs (see documents/s3.py). Credentials come from the usual AWS_* variables; set
+# DOCUMENT_S3_ENDPOINT_URL for MinIO or another local stand-in. Takes precedence over tiering.
+DOCUMENT_S3_BUCKET = os.getenv("DOCUMENT_S3_BUCKET", "")
+DOCUMENT_S3_ENDPOINT_URL = os.getenv("DOCUMENT_S3_ENDPOINT_URL", "")
+DOCUMENT_S3_REGION = os.getenv("DOCUMENT_S3_REGION", "")
+DOCUMENT_S3_MAX_UPLOAD_BYTES = int(os.getenv("DOCUMENT_S3_MAX_UPLOAD_BYTES", 200 * 1024 * 1024))
+DOCUMENT_S3_MULTIPART_THRESHOLD = int(os.getenv("DOCUMENT_S3_MULTIPART_THRESHOLD", 64 * 1024 * 1024))
+DOCUMENT_S3_PART_SIZE = int(os.getenv("DOCUMENT_S3_PART_SIZE", 16 * 1024 * 1024))   # S3 minimum is 5 MB
+DOCUMENT_S3_UPLOAD_EXPIRY_SECONDS = int(os.getenv("DOCUMENT_S3_UPLOAD_EXPIRY_SECONDS", 900))
+DOCUMENT_S3_DOWNLOAD_EXPIRY_SECONDS = int(os.getenv("DOCUMENT_S3_DOWNLOAD_EXPIRY_SECONDS", 60))
+
+if DOCUMENT_S3_BUCKET:
+    DEFAULT_STORAGE_BACKEND = "documents.s3.S3Storage"
+elif DOCUMENT_TIERING:
+    DEFAULT_STORAGE_BACKEND = "documents.storage.TieredStorage"
+else:
+    DEFAULT_STORAGE_BACKEND = "django.core.files.storage.FileSystemStorage"
+
+STORAGES = {
+    "default": {"BACKEND": DEFAULT_STORAGE_BACKEND},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 # ─── EMAIL ────────────────────────────────────────────────────────────────────
-EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"  # dev: prints to console
-# Switch to smtp in production by setting EMAIL_BACKEND in .env
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")  # dev: prints to console
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False") == "True"
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 30))   # seconds; a hung server must not stall a reminder run
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@casebox.law")
+# Switch to smtp in production by setting EMAIL_BACKEND in .env, or just EMAIL_HOST_USER for Gmail
 if os.getenv("EMAIL_HOST_USER"):
     EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
     EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
@@ -142,11 +265,75 @@ if os.getenv("EMAIL_HOST_USER"):
     EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
     DEFAULT_FROM_EMAIL = os.getenv("EMAIL_HOST_USER", "noreply@casebox.law")
 
+# `manage.py send_hearing_reminders` emails everyone on a case whose next hearing is
+# within this many days, once per hearing, over a pool of reused SMTP connections
+HEARING_REMINDER_DAYS_AHEAD = int(os.getenv("HEARING_REMINDER_DAYS_AHEAD", 2))
+HEARING_REMINDER_CONNECTIONS = int(os.getenv("HEARING_REMINDER_CONNECTIONS", 4))
+HEARING_REMINDER_BATCH_SIZE = int(os.getenv("HEARING_REMINDER_BATCH_SIZE", 200))   # messages per connection turn
+HEARING_REMINDER_RETRIES = int(os.getenv("HEARING_REMINDER_RETRIES", 3))
+
 # ─── FILE UPLOAD ──────────────────────────────────────────────────────────────
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024   # 10 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
 ALLOWED_DOCUMENT_EXTENSIONS = [".pdf", ".doc", ".docx", ".jpg", ".jpeg", ".png", ".txt"]
 
+# ─── OBSERVABILITY ────────────────────────────────────────────────────────────
+# Server-Timing header + one JSON log line per sampled request (query count, DB time, N+1 hints)
+REQUEST_INSTRUMENTATION = os.getenv("REQUEST_INSTRUMENTATION", "False") == "True"
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = float(os.getenv("REQUEST_INSTRUMENTATION_SAMPLE_RATE", 1.0))
+
+# Prometheus-style metrics at /metrics (admin only). Set METRICS_DIR to a directory
+# shared by all gunicorn workers of this host to aggregate across processes.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+
+# Request profiling: admins send X-CaseBox-Profile: 1 for a cProfile run; PROFILE_SLOW_MS > 0
+# also keeps stack samples of any request slower than that. Listed under /api/logs/profiles/.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", 0))
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", 5))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"plain": {"format": "%(message)s"}},
+    "handlers": {"console": {"class": "logging.StreamHandler", "formatter": "plain"}},
+    "loggers": {
+        "casebox": {"handlers": ["console"], "level": os.getenv("CASEBOX_LOG_LEVEL", "INFO")},
+    },
+}
+
+# ─── CASE DETAIL ──────────────────────────────────────────────────────────────
+# Case detail embeds only the newest hearing notes/comments plus their totals;
+# the rest are paged from /hearing-notes/ and /comments/ (?limit= up to the max)
+CASE_DETAIL_EMBED_LIMIT = int(os.getenv("CASE_DETAIL_EMBED_LIMIT", 10))
+CASE_CHILD_PAGE_SIZE = int(os.getenv("CASE_CHILD_PAGE_SIZE", 20))
+CASE_CHILD_MAX_PAGE_SIZE = int(os.getenv("CASE_CHILD_MAX_PAGE_SIZE", 100))
+
+# ─── REAL-TIME ────────────────────────────────────────────────────────────────
+# /api/cases/stream/ (SSE). With several workers use cases.events.PostgresNotifyBackend
+# so every worker sees every event; the default only delivers within one process.
+CASE_EVENTS_BACKEND = os.getenv("CASE_EVENTS_BACKEND", "cases.events.LocalBackend")
+CASE_EVENTS_BUFFER = int(os.getenv("CASE_EVENTS_BUFFER", 1000))   # events kept for Last-Event-ID resume
+CASE_STREAM_HEARTBEAT_SECONDS = int(os.getenv("CASE_STREAM_HEARTBEAT_SECONDS", 15))
+CASE_STREAM_MAX_SECONDS = int(os.getenv("CASE_STREAM_MAX_SECONDS", 300))
+
+# /api/cases/changes/: how far `next` trails the clock so slow transactions aren't missed,
+# and how long deletions are remembered (older sync tokens get 410 and must re-sync fully)
+CASE_CHANGES_SAFETY_LAG_SECONDS = int(os.getenv("CASE_CHANGES_SAFETY_LAG_SECONDS", 5))
+CASE_TOMBSTONE_RETENTION_DAYS = int(os.getenv("CASE_TOMBSTONE_RETENTION_DAYS", 90))
+
+# In-memory case indexes (hearing conflicts, conflicts of interest, see cases/indexing.py):
+# built as each worker boots, then caught up on other workers' writes at most this often
+CASE_INDEX_WARM_ON_BOOT = os.getenv("CASE_INDEX_WARM_ON_BOOT", "True") == "True"
+CASE_INDEX_CATCH_UP_SECONDS = float(os.getenv("CASE_INDEX_CATCH_UP_SECONDS", CASE_CHANGES_SAFETY_LAG_SECONDS))
+
+# ─── ARCHIVE ──────────────────────────────────────────────────────────────────
+# `manage.py archive_cases` moves closed/disposed cases untouched for this many days
+# out of the hot tables, and their files into CASE_ARCHIVE_ROOT. Opening one restores it.
+CASE_ARCHIVE_AFTER_DAYS = int(os.getenv("CASE_ARCHIVE_AFTER_DAYS", 365))
+CASE_ARCHIVE_ROOT = os.getenv("CASE_ARCHIVE_ROOT", str(BASE_DIR / "archive"))
+
 # ─── PRODUCTION SECURITY ──────────────────────────────────────────────────────
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
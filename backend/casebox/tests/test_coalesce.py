@@ -0,0 +1,149 @@
+"""single_flight() (casebox/coalesce.py): in-process and cross-worker coalescing."""
+import threading
+import time
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from casebox import coalesce
+from casebox.coalesce import request_key, single_flight
+
+
+def _user(pk, role="admin", firm_id=1):
+    return SimpleNamespace(pk=pk, role=role, firm_id=firm_id)
+
+
+def _request(user, path="/api/cases/dashboard/", **params):
+    request = RequestFactory().get(path, params)
+    request.user = user
+    return request
+
+
+class Compute:
+    """A slow computation that counts its calls."""
+
+    def __init__(self, result="computed", seconds=0.2, error=None):
+        self.calls = 0
+        self.result = result
+        self.seconds = seconds
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.seconds)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@override_settings(SINGLE_FLIGHT_ENABLED=True, SINGLE_FLIGHT_WAIT_SECONDS=5)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _concurrently(self, requests, compute):
+        """Run single_flight for each request at once; returns [(result or exception)]."""
+        start = threading.Barrier(len(requests))
+        outcomes = [None] * len(requests)
+
+        def run(i, request):
+            start.wait()
+            try:
+                outcomes[i] = single_flight(request, compute)
+            except Exception as exc:
+                outcomes[i] = exc
+
+        threads = [threading.Thread(target=run, args=(i, r)) for i, r in enumerate(requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_identical_concurrent_requests_compute_once(self):
+        compute = Compute()
+        admins = [_user(pk) for pk in range(1, 11)]   # same firm: one admin scope
+        outcomes = self._concurrently([_request(admin) for admin in admins], compute)
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(outcomes, ["computed"] * 10)
+        self.assertEqual(coalesce._flights, {})
+
+    def test_nothing_is_served_after_the_computation_ends(self):
+        compute = Compute(seconds=0)
+        single_flight(_request(_user(1)), compute)
+        single_flight(_request(_user(1)), compute)
+        self.assertEqual(compute.calls, 2)
+
+    def test_different_scopes_never_share(self):
+        for users in (
+            [_user(1, "advocate"), _user(2, "advocate")],    # each non-admin is their own scope
+            [_user(1, firm_id=1), _user(2, firm_id=2)],      # admins of different firms
+        ):
+            with self.subTest(users=users):
+                compute = Compute()
+                self._concurrently([_request(user) for user in users], compute)
+                self.assertEqual(compute.calls, 2)
+        self.assertNotEqual(request_key(_request(_user(1), q="a")), request_key(_request(_user(1), q="b")))
+
+    def test_leader_error_reaches_in_process_waiters(self):
+        error = ValueError("boom")
+        compute = Compute(error=error)
+        outcomes = self._concurrently([_request(_user(pk)) for pk in range(1, 6)], compute)
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(outcomes, [error] * 5)
+        self.assertEqual(coalesce._flights, {})
+
+    def test_result_published_by_another_worker_is_shared(self):
+        request = _request(_user(1))
+        key = request_key(request)
+        cache.add(f"{key}:lock", "other", 5)
+
+        def other_worker():
+            time.sleep(0.1)
+            cache.set(f"{key}:other", "theirs", 5)
+            cache.delete(f"{key}:lock")
+
+        threading.Thread(target=other_worker).start()
+        compute = Compute()
+        self.assertEqual(single_flight(request, compute), "theirs")
+        self.assertEqual(compute.calls, 0)
+
+    def test_waiter_takes_over_when_another_workers_leader_fails(self):
+        request = _request(_user(1))
+        key = request_key(request)
+        cache.add(f"{key}:lock", "other", 5)
+
+        def failing_worker():
+            time.sleep(0.1)
+            cache.delete(f"{key}:lock")   # released without publishing a result
+
+        threading.Thread(target=failing_worker).start()
+        compute = Compute(result="mine", seconds=0)
+        started = time.monotonic()
+        self.assertEqual(single_flight(request, compute), "mine")
+        self.assertEqual(compute.calls, 1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_SECONDS=0.2)
+    def test_stuck_leader_in_another_worker_times_out_to_local_compute(self):
+        request = _request(_user(1))
+        cache.add(f"{request_key(request)}:lock", "stuck", 5)
+        compute = Compute(result="mine", seconds=0)
+        self.assertEqual(single_flight(request, compute), "mine")
+        self.assertEqual(compute.calls, 1)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_SECONDS=0.1)
+    def test_slow_in_process_leader_times_out_to_local_compute(self):
+        compute = Compute(seconds=0.5)
+        outcomes = self._concurrently([_request(_user(1)), _request(_user(2))], compute)
+        self.assertEqual(compute.calls, 2)
+        self.assertEqual(outcomes, ["computed", "computed"])
+
+    @override_settings(SINGLE_FLIGHT_ENABLED=False)
+    def test_disabled_computes_every_request(self):
+        compute = Compute(seconds=0.1)
+        self._concurrently([_request(_user(1)), _request(_user(2))], compute)
+        self.assertEqual(compute.calls, 2)
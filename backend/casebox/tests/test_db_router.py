@@ -0,0 +1,168 @@
+"""
+ReplicaRouter / ReplicaRoutingMiddleware against two SQLite files.
+
+The primary is the test database; the replica is a file snapshot of it taken
+in setUp, so rows written afterwards exist only on the primary and show
+which database answered a request.
+"""
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import Firm, User
+from accounts.serializers import CaseBoxTokenObtainPairSerializer
+from cases.archive import archive_case
+from cases.models import Case
+from casebox.db_router import ReplicaRouter, _reads_on_replica
+
+REPLICA = "replica_test"
+BROKEN = "replica_broken"
+
+
+def _add_alias(alias, name):
+    databases = connections.configure_settings(
+        {**connections.settings, alias: {"ENGINE": "django.db.backends.sqlite3", "NAME": name}}
+    )
+    connections.settings[alias] = databases[alias]
+
+
+def _drop_alias(alias):
+    if hasattr(connections._connections, alias):
+        connections[alias].close()
+        delattr(connections._connections, alias)
+    connections.settings.pop(alias, None)
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    # TestCase's wrapping transaction would keep every read on the primary
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Added after setup so the runner neither creates test databases for them nor blocks their queries
+        cls._dir = tempfile.TemporaryDirectory()
+        cls.replica_path = Path(cls._dir.name) / "replica.sqlite3"
+        _add_alias(REPLICA, str(cls.replica_path))
+        _add_alias(BROKEN, str(Path(cls._dir.name) / "missing" / "replica.sqlite3"))
+
+    @classmethod
+    def tearDownClass(cls):
+        _drop_alias(REPLICA)
+        _drop_alias(BROKEN)
+        cls._dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        Firm._default_id = None   # the previous test's flush removed the default firm
+        self.admin = User.objects.create(username="admin", role="admin", is_approved=True)
+        self.client_user = User.objects.create(username="client", role="client", is_approved=True)
+        self._case("R/1")
+        self._snapshot()
+        self._case("P/1")   # only on the primary
+
+    def _case(self, case_no):
+        return Case.objects.create(case_no=case_no, case_title="t", court_name="c", client=self.client_user)
+
+    def _snapshot(self):
+        connections[REPLICA].close()
+        primary = connections["default"]
+        primary.ensure_connection()
+        with sqlite3.connect(self.replica_path) as target:
+            primary.connection.backup(target)
+        target.close()
+
+    def _api(self):
+        api = APIClient()
+        token = CaseBoxTokenObtainPairSerializer.get_token(self.admin)
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        return api
+
+    def _case_nos(self, api):
+        response = api.get("/api/cases/")
+        self.assertEqual(response.status_code, 200)
+        return sorted(case["case_no"] for case in response.data)
+
+    def _replicas(self, *aliases, pin_seconds=5):
+        # Changing DATABASE_ROUTERS makes Django rebuild its router, which reads DATABASE_REPLICAS
+        return override_settings(
+            DATABASE_REPLICAS=list(aliases), REPLICA_PIN_SECONDS=pin_seconds,
+            DATABASE_ROUTERS=["casebox.db_router.ReplicaRouter"],
+        )
+
+    def test_safe_reads_go_to_the_replica(self):
+        with self._replicas(REPLICA):
+            self.assertEqual(self._case_nos(self._api()), ["R/1"])
+
+    def test_reads_without_replicas_stay_on_primary(self):
+        with self._replicas():
+            self.assertEqual(self._case_nos(self._api()), ["P/1", "R/1"])
+
+    def test_writer_is_pinned_to_primary_for_the_pin_window(self):
+        with self._replicas(REPLICA, pin_seconds=1):
+            api = self._api()
+            response = api.post("/api/cases/", {
+                "case_no": "P/2", "case_title": "t", "court_name": "c", "client": self.client_user.pk,
+            }, format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(self._case_nos(api), ["P/1", "P/2", "R/1"])
+            time.sleep(1.1)
+            self.assertEqual(self._case_nos(api), ["R/1"])
+
+    def test_failed_write_does_not_pin(self):
+        with self._replicas(REPLICA):
+            api = self._api()
+            response = api.post("/api/cases/", {"case_no": "P/2"}, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(self._case_nos(api), ["R/1"])
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        with self._replicas(BROKEN):
+            router = ReplicaRouter()
+            token = _reads_on_replica.set(True)
+            try:
+                self.assertEqual(router.db_for_read(Case), "default")
+            finally:
+                _reads_on_replica.reset(token)
+            self.assertIn(BROKEN, router._down_until)
+            self.assertEqual(self._case_nos(self._api()), ["P/1", "R/1"])
+
+    def test_replica_that_dies_after_serving_reads_falls_back_to_primary(self):
+        with self._replicas(REPLICA), mock.patch("casebox.db_router.HEALTH_CHECK_SECONDS", 0):
+            api = self._api()
+            self.assertEqual(self._case_nos(api), ["R/1"])
+            # The open connection breaks and the database can't be reached again
+            replica = connections[REPLICA]
+            replica.connection.close()
+            name = replica.settings_dict["NAME"]
+            replica.settings_dict["NAME"] = connections.settings[BROKEN]["NAME"]
+            self.addCleanup(replica.settings_dict.__setitem__, "NAME", name)
+            self.assertEqual(self._case_nos(api), ["P/1", "R/1"])
+
+    def test_replica_marked_down_is_skipped(self):
+        with self._replicas(BROKEN, REPLICA):
+            router = ReplicaRouter()
+            token = _reads_on_replica.set(True)
+            try:
+                self.assertEqual({router.db_for_read(Case) for _ in range(4)}, {REPLICA})
+            finally:
+                _reads_on_replica.reset(token)
+
+    def test_archived_case_restored_through_a_replica(self):
+        case = Case.objects.get(case_no="R/1")
+        url = f"/api/cases/{case.pk}/"
+        archive_case(case)
+        self._snapshot()   # the replica also has it only in the archive
+        with self._replicas(REPLICA):
+            api = self._api()
+            self.assertEqual(api.get(url).status_code, 200)
+            # Restoring counts as a write: the caller keeps reading the primary
+            self.assertEqual(api.get(url).status_code, 200)
+            self.assertIn("R/1", self._case_nos(api))
@@ -1,8 +1,11 @@
 from django.contrib import admin
-from django.urls import path, include
+import re
+
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from .views import media, metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -16,4 +19,16 @@ urlpatterns = [
     path("api/cases/", include("cases.urls")),
     path("api/documents/", include("documents.urls")),
     path("api/logs/", include("logs.urls")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+    # Async variants of the read-heavy endpoints, for ASGI deployments
+    path("api/async/", include("casebox.async_urls")),
+
+    # Prometheus scrape target (admin only)
+    path("metrics", metrics, name="metrics"),
+]
+
+if settings.DOCUMENT_TIERING and settings.DEBUG:
+    # Cold files only exist compressed, so media goes through the storage rather than the disk
+    urlpatterns.append(re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$", media, name="media"))
+else:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,27 @@
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+
+from accounts.permissions import IsAdmin
+from .metrics import registry
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def metrics(request):
+    """Admin: Prometheus text exposition of the metrics registry."""
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def media(request, path):
+    """
+    DEBUG only, like static(): MEDIA_URL served through the default storage,
+    so cold (compressed) files read like hot ones. Deployments fetch files
+    through the role-checked documents/<id>/download/.
+    """
+    try:
+        handle = default_storage.open(path)
+    except (OSError, SuspiciousFileOperation):
+        raise Http404("File not found.")
+    return FileResponse(handle)
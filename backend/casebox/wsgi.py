@@ -2,3 +2,10 @@ import os
 from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'casebox.settings')
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402  (settings are configured by now)
+
+if settings.CASE_INDEX_WARM_ON_BOOT:
+    # With gunicorn --preload this runs once in the master and workers inherit the indexes
+    from cases.indexing import warm_indexes
+    warm_indexes()
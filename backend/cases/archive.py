@@ -0,0 +1,147 @@
+"""
+Hot/cold tiering for closed and disposed cases.
+
+archive_case() moves a case out of the hot tables. Its row and its hearing
+notes, comments, events and documents become one ArchivedCase row, and the
+document files move from the default storage to CASE_ARCHIVE_ROOT. Deleting
+the hot rows writes the usual tombstones, so delta-sync clients drop the case.
+
+restore_case() reverses this under the original ids, then bumps updated_at
+so the case comes back through /api/cases/changes/. CaseViewSet calls it when
+a case that isn't in the hot table is opened by someone who may see it.
+
+Files are copied before the rows move and the originals are deleted only once
+the transaction commits, so a failure part-way leaves the case where it was.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import serializers
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from documents.models import Document
+from .models import ArchivedCase, Case, CaseComment, HearingNote
+from .relationships import CLOSED_STATUSES
+from .serializers import CaseListSerializer
+
+logger = logging.getLogger("casebox.archive")
+
+archive_storage = FileSystemStorage(location=settings.CASE_ARCHIVE_ROOT)
+
+
+def archivable(days=None):
+    """Closed/disposed cases not modified for `days` (default CASE_ARCHIVE_AFTER_DAYS)."""
+    days = settings.CASE_ARCHIVE_AFTER_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    return Case.objects.filter(status__in=CLOSED_STATUSES, updated_at__lt=cutoff)
+
+
+def _move(names, source, target):
+    """Copy files between storages; returns {source name: target name} for those that exist."""
+    moved = {}
+    try:
+        for name in names:
+            if name and source.exists(name):
+                with source.open(name) as fh:
+                    moved[name] = target.save(name, fh)
+    except Exception:
+        for copy in moved.values():
+            target.delete(copy)
+        raise
+    return moved
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning("Could not delete %s after moving it", name)
+
+
+def archive_case(case):
+    """
+    Move one case into the archive. Expects documents prefetched and the
+    participants select_related, as archivable() callers load them.
+    """
+    documents = list(case.documents.all())
+    rows = [case, *case.hearing_notes.all(), *case.comments.all(), *case.events.all(), *documents]
+    files = _move([doc.file.name for doc in documents], default_storage, archive_storage)
+    try:
+        with transaction.atomic():
+            ArchivedCase.objects.create(
+                case_id=case.pk, firm_id=case.firm_id,
+                **{field: getattr(case, field) for field in (
+                    "case_no", "case_title", "case_type", "priority", "status", "tags",
+                    "court_name", "court_city", "client_id", "client_advocate_id",
+                    "opposition_advocate_id", "judge_id", "is_visible_to_client", "created_at",
+                )},
+                summary=CaseListSerializer(case).data,
+                payload={"rows": serializers.serialize("python", rows), "files": files},
+            )
+            case.delete()
+    except Exception:
+        _delete_files(archive_storage, files.values())
+        raise
+    transaction.on_commit(lambda: _delete_files(default_storage, files))
+
+
+def restore_case(archived):
+    """Put an archived case back in the hot tables. Returns the case, or None if it can't be."""
+    payload = archived.payload
+    objects = list(serializers.deserialize("python", payload["rows"]))
+    case = objects[0].object
+    users = set(User.objects.filter(pk__in={
+        getattr(obj.object, field.attname)
+        for obj in objects for field in obj.object._meta.concrete_fields
+        if field.is_relation and field.related_model is User
+    }).values_list("pk", flat=True))
+    if case.client_id not in users:
+        logger.warning("Not restoring archived case %s: its client no longer exists", archived.case_no)
+        return None
+    for obj in objects:
+        if hasattr(obj.object, "firm_id") and obj.object.firm_id is None:
+            obj.object.firm_id = archived.firm_id   # archived before firms existed
+        # Judges, advocates and authors deleted since archiving: SET_NULL, as if they'd been hot
+        for field in obj.object._meta.concrete_fields:
+            if field.is_relation and field.related_model is User and getattr(obj.object, field.attname) not in users:
+                setattr(obj.object, field.attname, None)
+
+    # Cold name -> hot name; Document rows point at wherever the file landed
+    files = _move(payload["files"].values(), archive_storage, default_storage)
+    hot_names = {hot: files[cold] for hot, cold in payload["files"].items() if cold in files}
+    for obj in objects:
+        if isinstance(obj.object, Document):
+            obj.object.file.name = hot_names.get(obj.object.file.name, obj.object.file.name)
+    try:
+        with transaction.atomic():
+            if not ArchivedCase.objects.select_for_update().filter(pk=archived.pk).exists():
+                raise IntegrityError("already restored")
+            for obj in objects:
+                obj.save()
+            case.sync_tags()
+            now = timezone.now()
+            Case.objects.filter(pk=case.pk).update(updated_at=now)
+            for model in (HearingNote, CaseComment, Document):
+                model.objects.filter(case_id=case.pk).update(updated_at=now)
+            archived.delete()
+    except Exception as exc:
+        _delete_files(default_storage, files.values())
+        if not isinstance(exc, IntegrityError):
+            raise
+        # Restored concurrently, or its case_no has been reused by a live case
+        return Case.objects.filter(pk=case.pk).first()
+    transaction.on_commit(lambda: _delete_files(archive_storage, files))
+    logger.info("Restored archived case %s", archived.case_no)
+    return case
+
+
+def restore_visible(user, case_id):
+    """Restore the archived case `case_id` if `user` may see it. Returns whether one was restored."""
+    archived = ArchivedCase.objects.visible_to(user).filter(case_id=case_id).first()
+    return archived is not None and restore_case(archived) is not None
+
@@ -0,0 +1,58 @@
+# cases/async_views.py
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+
+from casebox.async_api import async_api_view, json_response
+from casebox.db_router import stick_to_primary
+from logs.utils import alog_action
+from .archive import restore_visible
+from .models import Case
+from .serializers import CaseListSerializer, CaseDetailSerializer
+from .views import CaseViewSet, archived_matches, filter_cases
+
+
+def _ordering(params):
+    fields = [
+        f for f in params.get("ordering", "").split(",")
+        if f.lstrip("-") in CaseViewSet.ordering_fields
+    ]
+    return fields or None
+
+
+@async_api_view()
+async def case_list(request):
+    qs = filter_cases(Case.objects.visible_to(request.user), request.GET).select_related(
+        "client", "judge", "client_advocate", "opposition_advocate"
+    ).prefetch_related("documents")
+    ordering = _ordering(request.GET)
+    if ordering:
+        qs = qs.order_by(*ordering)
+
+    # Prefetching isn't supported by async iteration in Django 4.2, so the
+    # query and serialisation run together in a worker thread
+    data = await sync_to_async(lambda: CaseListSerializer(qs, many=True).data)()
+    if request.GET.get("include_archived") == "1":
+        data = [*data, *await sync_to_async(archived_matches)(request.user, request.GET)]
+    return json_response(data)
+
+
+@async_api_view()
+async def case_detail(request, pk):
+    qs = Case.objects.visible_to(request.user).with_child_counts().select_related(
+        "client", "judge", "client_advocate", "opposition_advocate"
+    )
+    try:
+        case_id = int(pk)
+        case = await qs.aget(pk=case_id)
+    except ValueError:
+        return JsonResponse({"detail": "Not found."}, status=404)
+    except Case.DoesNotExist:
+        # Same as CaseViewSet.get_object: restore it if it was archived and the caller may see it
+        if not await sync_to_async(restore_visible)(request.user, case_id):
+            return JsonResponse({"detail": "Not found."}, status=404)
+        stick_to_primary()   # a replica won't have the restored row yet
+        case = await qs.aget(pk=case_id)
+
+    await alog_action(request, "view_case", f"Viewed case {case.case_no}")
+    data = await sync_to_async(lambda: CaseDetailSerializer(case, context={"request": request}).data)()
+    return json_response(data)
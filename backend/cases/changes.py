@@ -0,0 +1,159 @@
+"""
+Delta sync for /api/cases/changes/?since=<token>.
+
+A token is an opaque, URL-safe set of (updated_at, id) cursors, one per
+section. Each response lists the cases, hearing notes, comments and
+documents in the caller's scope past their cursor, plus the ids of rows
+deleted since then (or which the caller has lost access to), and a `next`
+token to send back. A section cut off at `limit` resumes after its last row,
+so any number of rows sharing one updated_at (bulk updates, seeded data)
+are paged through rather than returned again.
+
+Once a section has caught up, its cursor trails the server clock by
+CASE_CHANGES_SAFETY_LAG_SECONDS, so rows saved by transactions that were
+still open when this one read are picked up on the next call. The price is
+that a few rows may arrive twice; clients treat updates as upserts and
+apply deletions first.
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from documents.serializers import DocumentSerializer
+from documents.views import visible_documents
+from .models import Case, HearingNote, CaseComment, Tombstone
+from .serializers import CaseListSerializer, HearingNoteSerializer, CaseCommentSerializer
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+SECTIONS = ("cases", "hearing_notes", "comments", "documents", "deleted")
+COMMENT_ROLES = ("admin", "advocate")
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def encode_token(cursors):
+    raw = json.dumps({
+        "v": 2, "c": {name: [moment.isoformat(), pk] for name, (moment, pk) in cursors.items()},
+    }).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token):
+    """
+    {section: (updated_at, id)} cursors a token stands for; no token means
+    "from the beginning". Version 1 tokens held a single watermark.
+    """
+    if not token:
+        return dict.fromkeys(SECTIONS, (EPOCH, 0))
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if raw.get("v") == 1:
+            cursors = dict.fromkeys(SECTIONS, (datetime.fromisoformat(raw["t"]), 0))
+        else:
+            cursors = {name: (datetime.fromisoformat(raw["c"][name][0]), int(raw["c"][name][1]))
+                       for name in SECTIONS}
+    except (ValueError, KeyError, TypeError, AttributeError, IndexError):
+        raise InvalidToken("Malformed sync token.")
+    if any(timezone.is_naive(moment) for moment, _ in cursors.values()):
+        raise InvalidToken("Malformed sync token.")
+    return cursors
+
+
+def _after(cursor, field):
+    moment, pk = cursor
+    return Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": pk})
+
+
+class ChangeNoteSerializer(HearingNoteSerializer):
+    class Meta(HearingNoteSerializer.Meta):
+        fields = [*HearingNoteSerializer.Meta.fields, "case", "updated_at"]
+
+
+class ChangeCommentSerializer(CaseCommentSerializer):
+    class Meta(CaseCommentSerializer.Meta):
+        fields = [*CaseCommentSerializer.Meta.fields, "case", "updated_at"]
+
+
+class ChangeDocumentSerializer(DocumentSerializer):
+    class Meta(DocumentSerializer.Meta):
+        fields = [*DocumentSerializer.Meta.fields, "updated_at"]
+
+
+def _tombstone_scope(user):
+    if user.role == "admin":
+        return Q(firm_id=user.firm_id, revoked=False)
+    if user.role == "client":
+        return Q(client_id=user.pk, client_visible=True, internal=False)
+    if user.role == "advocate":
+        return Q(client_advocate_id=user.pk) | Q(opposition_advocate_id=user.pk)
+    if user.role == "judge":
+        return Q(judge_id=user.pk, internal=False)
+    return Q(pk__in=[])
+
+
+def collect_changes(request, since, limit):
+    user = request.user
+    caught_up = (timezone.now() - timedelta(seconds=settings.CASE_CHANGES_SAFETY_LAG_SECONDS), 0)
+    cases = Case.objects.visible_to(user)
+
+    sources = {
+        "cases": (
+            cases.select_related("client", "judge", "client_advocate").prefetch_related("documents"),
+            CaseListSerializer, "created_at",
+        ),
+        "hearing_notes": (
+            HearingNote.objects.filter(case__in=cases).select_related("added_by"),
+            ChangeNoteSerializer, "created_at",
+        ),
+        "comments": (
+            CaseComment.objects.filter(case__in=cases).select_related("author")
+            if user.role in COMMENT_ROLES else CaseComment.objects.none(),
+            ChangeCommentSerializer, "created_at",
+        ),
+        "documents": (
+            visible_documents(user).filter(case__in=cases).select_related("uploaded_by"),
+            ChangeDocumentSerializer, "upload_date",
+        ),
+    }
+
+    result = {}
+    cursors = {}
+    for name, (queryset, serializer_class, created_field) in sources.items():
+        rows = list(queryset.filter(_after(since[name], "updated_at")).order_by("updated_at", "pk")[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            cursors[name] = (rows[-1].updated_at, rows[-1].pk)
+        else:
+            cursors[name] = caught_up
+        data = serializer_class(rows, many=True, context={"request": request}).data
+        moment = since[name][0]
+        result[name] = {
+            "created": [item for row, item in zip(rows, data) if getattr(row, created_field) > moment],
+            "updated": [item for row, item in zip(rows, data) if getattr(row, created_field) <= moment],
+            "deleted": [],
+        }
+
+    tombstones = list(
+        Tombstone.objects.filter(_tombstone_scope(user), _after(since["deleted"], "deleted_at"))
+        .order_by("deleted_at", "pk").values_list("kind", "object_id", "deleted_at", "pk")[:limit + 1]
+    )
+    if len(tombstones) > limit:
+        tombstones = tombstones[:limit]
+        cursors["deleted"] = tombstones[-1][2:]
+    else:
+        cursors["deleted"] = caught_up
+    section = {"case": "cases", "hearing_note": "hearing_notes", "comment": "comments", "document": "documents"}
+    for kind, object_id, _, _ in tombstones:
+        deleted = result[section[kind]]["deleted"]
+        if object_id not in deleted:
+            deleted.append(object_id)
+
+    result["next"] = encode_token(cursors)
+    result["has_more"] = any(cursor is not caught_up for cursor in cursors.values())
+    return result
@@ -0,0 +1,214 @@
+"""
+Case change events for the /api/cases/stream/ SSE endpoint.
+
+Model signals (cases/signals.py) build a compact event per change and hand it
+to the configured backend once the transaction commits. The backend gets the
+event to every worker's EventHub, and the hub fans it out to the streams open
+in that process. Each hub keeps the last CASE_EVENTS_BUFFER events in memory,
+so a reconnecting EventSource resumes from its Last-Event-ID. A client whose
+ID is older than the buffer gets a "reset" event and should re-fetch.
+
+Backends (CASE_EVENTS_BACKEND):
+- LocalBackend: delivers in-process only; fine for runserver or one worker.
+- PostgresNotifyBackend: NOTIFY on publish, plus one LISTEN thread per
+  worker process, so every worker sees every event.
+"""
+import asyncio
+import collections
+import json
+import logging
+import os
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("casebox.events")
+
+NOTIFY_CHANNEL = "casebox_case_events"
+
+
+def _id_sequence():
+    # Microsecond timestamps, bumped on collision: ordered across workers to
+    # within clock skew, so Last-Event-ID comparisons work on any worker
+    last = 0
+    while True:
+        last = max(last + 1, time.time_ns() // 1000)
+        yield last
+
+
+_next_id = _id_sequence()
+_next_id_lock = threading.Lock()
+
+
+def new_event_id():
+    with _next_id_lock:
+        return next(_next_id)
+
+
+class EventHub:
+    def __init__(self, size):
+        self._events = collections.deque(maxlen=size)
+        self._evicted_through = 0
+        self._cond = threading.Condition()
+        self._async_waiters = set()
+
+    @property
+    def latest_id(self):
+        with self._cond:
+            return self._events[-1]["id"] if self._events else 0
+
+    def dispatch(self, event):
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self._evicted_through = self._events[0]["id"]
+            self._events.append(event)
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        for loop, flag in waiters:
+            loop.call_soon_threadsafe(flag.set)
+
+    def since(self, last_id):
+        """Events newer than last_id, or None when some of them have already been evicted."""
+        with self._cond:
+            if last_id < self._evicted_through:
+                return None
+            return [event for event in self._events if event["id"] > last_id]
+
+    def wait(self, last_id, timeout):
+        with self._cond:
+            if not self._events or self._events[-1]["id"] <= last_id:
+                self._cond.wait(timeout)
+
+    async def await_new(self, last_id, timeout):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            if self._events and self._events[-1]["id"] > last_id:
+                return
+            self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+
+class LocalBackend:
+    def __init__(self, hub):
+        self.hub = hub
+
+    def publish(self, event):
+        self.hub.dispatch(event)
+
+    def start(self):
+        pass
+
+
+class PostgresNotifyBackend:
+    """
+    Publishes with pg_notify on the "default" connection, inside the same
+    on-commit hook as LocalBackend. Each worker process runs one daemon thread
+    that LISTENs on its own connection and feeds the hub.
+    """
+
+    def __init__(self, hub):
+        self.hub = hub
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        self.start()
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(event, cls=DjangoJSONEncoder)])
+
+    def start(self):
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, name="case-events-listener", daemon=True).start()
+
+    def _listen(self):
+        import psycopg2
+
+        conn_params = connections["default"].get_connection_params()
+        conn_params.pop("cursor_factory", None)
+        while True:
+            try:
+                conn = psycopg2.connect(**conn_params)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.hub.dispatch(json.loads(conn.notifies.pop(0).payload))
+            except Exception:
+                logger.exception("Case event listener lost its connection; reconnecting")
+                time.sleep(1)
+
+
+hub = EventHub(settings.CASE_EVENTS_BUFFER)
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.CASE_EVENTS_BACKEND)(hub)
+    return _backend
+
+
+def publish(event_type, case_id, data, audience):
+    """Queue an event for delivery once the current transaction commits."""
+    # Round-trip through JSON now so every backend hands subscribers the same plain values
+    data = json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+    event = {"type": event_type, "case": case_id, "data": data, "audience": audience}
+
+    def send():
+        event["id"] = new_event_id()
+        try:
+            get_backend().publish(event)
+        except Exception:
+            logger.exception("Could not publish %s event for case %s", event_type, case_id)
+
+    transaction.on_commit(send)
+
+
+def audience_for_case(case, client_visible=True, roles=None):
+    """Who may receive an event about `case`; mirrors CaseQuerySet.visible_to."""
+    return {
+        "client": case.client_id if client_visible and case.is_visible_to_client else None,
+        "advocates": [pk for pk in (case.client_advocate_id, case.opposition_advocate_id) if pk],
+        "judge": case.judge_id,
+        "roles": roles,
+        "firm": case.firm_id,
+    }
+
+
+def can_receive(user, event):
+    audience = event["audience"]
+    if audience.get("firm", user.firm_id) != user.firm_id:
+        return False
+    if audience["roles"] and user.role not in audience["roles"]:
+        return False
+    if user.role == "admin":
+        return True
+    if user.role == "client":
+        return audience["client"] == user.pk
+    if user.role == "advocate":
+        return user.pk in audience["advocates"]
+    if user.role == "judge":
+        return audience["judge"] == user.pk
+    return False
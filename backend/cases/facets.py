@@ -0,0 +1,80 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from casebox.coalesce import scope_for
+
+FACET_FIELDS = ("status", "case_type", "priority", "court_city")
+
+# Query params that don't change which rows are counted
+_IGNORED_PARAMS = ("facets", "ordering", "page", "cursor")
+
+
+def parse_facets(raw):
+    """Return the requested facet fields, keeping only the supported ones."""
+    requested = [f.strip() for f in (raw or "").split(",")]
+    return [f for f in FACET_FIELDS if f in requested]
+
+
+def cached_facet_counts(request, queryset, fields):
+    """facet_counts() cached briefly per firm and role scope + filter signature."""
+    scope = scope_for(request.user)
+    params = sorted(
+        (k, v) for k, values in request.query_params.lists()
+        if k not in _IGNORED_PARAMS for v in values
+    )
+    signature = repr((scope, fields, params)).encode()
+    key = "case-facets:" + hashlib.sha1(signature).hexdigest()
+
+    counts = cache.get(key)
+    if counts is None:
+        counts = facet_counts(queryset, fields)
+        cache.set(key, counts, settings.CASE_FACET_CACHE_SECONDS)
+    return counts
+
+
+def facet_counts(queryset, fields):
+    """
+    Count rows of `queryset` per value of each field in one round trip.
+
+    PostgreSQL groups once with GROUPING SETS; other backends UNION ALL one
+    GROUP BY per field over the same CTE.
+    """
+    counts = {field: {} for field in fields}
+    if not fields:
+        return counts
+
+    inner_sql, params = queryset.order_by().values(*fields).query.sql_with_params()
+    connection = connections[queryset.db]
+    qn = connection.ops.quote_name
+
+    if connection.vendor == "postgresql":
+        cols = ", ".join(qn(f) for f in fields)
+        sets = ", ".join(f"({qn(f)})" for f in fields)
+        sql = (
+            f"SELECT {cols}, GROUPING({cols}), COUNT(*) FROM ({inner_sql}) AS facet "
+            f"GROUP BY GROUPING SETS ({sets})"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        # GROUPING() sets one bit per column, 0 for the column the row is grouped by
+        all_bits = (1 << len(fields)) - 1
+        for row in rows:
+            *values, grouping, count = row
+            for i, field in enumerate(fields):
+                if all_bits ^ grouping == 1 << (len(fields) - 1 - i):
+                    counts[field][values[i]] = count
+    else:
+        selects = " UNION ALL ".join(
+            f"SELECT %s, {qn(f)}, COUNT(*) FROM facet GROUP BY {qn(f)}" for f in fields
+        )
+        sql = f"WITH facet AS ({inner_sql}) {selects}"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (*params, *fields))
+            for field, value, count in cursor.fetchall():
+                counts[field][value] = count
+
+    return counts
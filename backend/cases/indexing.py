@@ -0,0 +1,118 @@
+"""
+Base class for per-process, in-memory indexes derived from case rows.
+
+Subclasses say which cases to load at build time and how to (re)index a
+batch of cases. Everything else is shared:
+
+- Every index is built when a worker boots (warm_indexes(), called from
+  wsgi.py and asgi.py unless CASE_INDEX_WARM_ON_BOOT=False), or else on
+  first use.
+- Saves in this process apply through signal hooks once they commit.
+- At most once every CASE_INDEX_CATCH_UP_SECONDS, a query first catches up
+  on rows other processes changed: the `updated_at` indexes find changed
+  cases, and Tombstone rows (kept for delta sync) find deleted ones. Other
+  queries are answered from memory alone, so another worker's write can take
+  up to that long to show up here.
+
+The catch-up trails the clock by CASE_CHANGES_SAFETY_LAG_SECONDS, so a few
+cases may be reloaded twice. Reindexing is idempotent, so that is harmless.
+"""
+import logging
+import os
+import threading
+import time
+import weakref
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Case, Tombstone
+
+logger = logging.getLogger("casebox.indexing")
+_indexes = weakref.WeakSet()
+
+
+class CaseIndex:
+    tombstone_kinds = ("case",)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._caught_up_at = 0.0
+        _indexes.add(self)
+
+    # ── Subclass hooks ───────────────────────────────────────────────────────
+
+    def _reset(self):
+        """Empty the in-memory structures."""
+        raise NotImplementedError
+
+    def _initial_case_ids(self):
+        raise NotImplementedError
+
+    def _load(self, case_ids):
+        """(Re)index these cases from the database; ids that no longer exist are dropped."""
+        raise NotImplementedError
+
+    def _stale(self):
+        return not self._built
+
+    def _changed_since(self, since):
+        return set(Case.all_firms.filter(updated_at__gt=since).values_list("id", flat=True))
+
+    # ── Shared machinery ─────────────────────────────────────────────────────
+
+    def _now(self):
+        # Trail the clock so rows from transactions still open now aren't missed
+        return timezone.now() - timedelta(seconds=settings.CASE_CHANGES_SAFETY_LAG_SECONDS)
+
+    def warm(self):
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        """
+        Build if not built yet, otherwise catch up on other processes' writes
+        unless that was done in the last CASE_INDEX_CATCH_UP_SECONDS. Call under the lock.
+        """
+        if self._stale():
+            self._reset()
+            self._watermark = self._now()
+            self._load(self._initial_case_ids())
+            self._built = True
+            self._caught_up_at = time.monotonic()
+            return
+        if time.monotonic() - self._caught_up_at < settings.CASE_INDEX_CATCH_UP_SECONDS:
+            return
+        self._caught_up_at = time.monotonic()
+        since, self._watermark = self._watermark, self._now()
+        deleted = Tombstone.objects.filter(
+            kind__in=self.tombstone_kinds, revoked=False, deleted_at__gt=since,
+        ).values_list("case_id", flat=True)
+        self._load(self._changed_since(since) | set(deleted))
+
+
+def warm_indexes():
+    """Build every case index now, so no request pays for it. Failures are logged, not raised."""
+    from .relationships import relationship_graph
+    from .scheduling import hearing_index
+
+    for index in (hearing_index, relationship_graph):
+        start = time.perf_counter()
+        try:
+            index.warm()
+        except Exception:
+            logger.exception("Could not build %s at startup; it will be built on first use", type(index).__name__)
+            continue
+        logger.info("Built %s in %.2fs", type(index).__name__, time.perf_counter() - start)
+
+
+def _after_fork():
+    # A lock held by another thread at fork time would never be released in the child
+    for index in list(_indexes):
+        index._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
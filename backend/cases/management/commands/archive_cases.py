@@ -0,0 +1,47 @@
+"""
+Management command: python manage.py archive_cases
+
+Moves closed and disposed cases that haven't been modified for
+CASE_ARCHIVE_AFTER_DAYS (or --days) into ArchivedCase, and their document
+files into CASE_ARCHIVE_ROOT. Opening an archived case through the API
+restores it. Run it nightly from cron.
+"""
+from django.core.management.base import BaseCommand
+
+from cases.archive import archivable, archive_case
+
+BATCH = 100
+
+
+class Command(BaseCommand):
+    help = "Move old closed/disposed cases and their files out of the hot tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Archive cases untouched this long (default: CASE_ARCHIVE_AFTER_DAYS).")
+        parser.add_argument("--limit", type=int, default=0, help="Stop after this many cases (0 = no limit).")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, **opts):
+        ids = list(archivable(opts["days"]).order_by("updated_at").values_list("id", flat=True))
+        if opts["limit"]:
+            ids = ids[:opts["limit"]]
+        if opts["dry_run"]:
+            self.stdout.write(f"{len(ids)} cases would be archived.")
+            return
+
+        archived = failed = 0
+        for start in range(0, len(ids), BATCH):
+            cases = archivable(opts["days"]).filter(id__in=ids[start:start + BATCH]).select_related(
+                "client", "judge", "client_advocate", "opposition_advocate",
+            ).prefetch_related("documents", "hearing_notes", "comments", "events")
+            for case in cases:
+                try:
+                    archive_case(case)
+                    archived += 1
+                except Exception as exc:   # leave it hot and carry on with the rest
+                    failed += 1
+                    self.stderr.write(self.style.ERROR(f"  ✗ {case.case_no}: {exc}"))
+        self.stdout.write(self.style.SUCCESS(f"✅ Archived {archived} cases."))
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} cases could not be archived and stay hot."))
@@ -0,0 +1,246 @@
+"""
+Management command: python manage.py bench_api
+
+Drives every API endpoint through the DRF test client, as each role, against
+whatever data is in the database (seed it first with seed_casebox). For each
+role/endpoint pair it records p50/p95/p99 latency, SQL query count, rows
+fetched and peak Python memory, writes the results as JSON and fails when a
+budget in bench_budgets.json (or a previous --baseline run) regresses.
+
+Writes made by the endpoints (e.g. audit log rows) are rolled back.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.db.models import Count
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from cases.models import Case
+
+DEFAULT_BUDGETS = Path(settings.BASE_DIR) / "bench_budgets.json"
+
+# (name, url template, roles allowed to call it)
+ENDPOINTS = (
+    ("case-list", "/api/cases/", ("admin", "advocate", "judge", "client")),
+    ("case-detail", "/api/cases/{case}/", ("admin", "advocate", "judge", "client")),
+    ("case-dashboard", "/api/cases/dashboard/", ("admin",)),
+    ("case-hearing-notes", "/api/cases/{case}/hearing-notes/", ("admin", "advocate", "judge", "client")),
+    ("case-comments", "/api/cases/{case}/comments/", ("admin", "advocate")),
+    ("case-timeline", "/api/cases/{case}/timeline/", ("admin", "advocate", "judge", "client")),
+    ("document-list", "/api/documents/", ("admin", "advocate", "judge", "client")),
+    ("log-list", "/api/logs/", ("admin",)),
+    ("user-by-role", "/api/accounts/users/by-role/?role=advocate", ("admin",)),
+    ("user-pending-clients", "/api/accounts/users/pending-clients/", ("admin",)),
+)
+
+# Which Case FK makes a user the "busiest" of their role
+ROLE_FIELDS = {"advocate": "client_advocate", "judge": "judge", "client": "client"}
+
+
+class _QueryCounter:
+    """Counts statements executed and rows handed back by cursor fetches while active."""
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        counter = self
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+
+        def fetchone(cursor):
+            row = cursor.cursor.fetchone()
+            counter.rows += row is not None
+            return row
+
+        def fetchmany(cursor, *args, **kwargs):
+            rows = cursor.cursor.fetchmany(*args, **kwargs)
+            counter.rows += len(rows)
+            return rows
+
+        def fetchall(cursor):
+            rows = cursor.cursor.fetchall()
+            counter.rows += len(rows)
+            return rows
+
+        # CursorWrapper proxies fetch* through __getattr__, so class attributes take precedence
+        CursorWrapper.fetchone = fetchone
+        CursorWrapper.fetchmany = fetchmany
+        CursorWrapper.fetchall = fetchall
+        return self
+
+    def __exit__(self, *exc):
+        self._wrapper.__exit__(*exc)
+        del CursorWrapper.fetchone
+        del CursorWrapper.fetchmany
+        del CursorWrapper.fetchall
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API endpoint per role and enforce query/latency budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--output", default="bench_results.json")
+        parser.add_argument("--budgets", default=str(DEFAULT_BUDGETS))
+        parser.add_argument("--baseline", help="Previous --output file to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed p95 slowdown against --baseline (0.25 = 25%%)")
+
+    def handle(self, *args, **options):
+        # The test client sends Host: testserver
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            self._run(options)
+
+    def _run(self, options):
+        users = self._pick_users()
+        if not users:
+            raise CommandError("No cases found — seed the database first (seed_casebox).")
+
+        results = {}
+        for role, (user, case_id) in users.items():
+            client = APIClient()
+            client.force_authenticate(user)
+            results[role] = {}
+            with transaction.atomic():
+                for name, url, roles in ENDPOINTS:
+                    if role not in roles:
+                        continue
+                    results[role][name] = self._bench(
+                        client, url.format(case=case_id), options["iterations"]
+                    )
+                    self._report(role, name, results[role][name])
+                transaction.set_rollback(True)
+
+        output = {
+            "meta": {
+                "vendor": connection.vendor,
+                "iterations": options["iterations"],
+                "cases": Case.objects.count(),
+                "users": User.objects.count(),
+            },
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(output, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        failures = self._check_budgets(results, options)
+        if failures:
+            for failure in failures:
+                self.stderr.write(self.style.ERROR(f"  ✗ {failure}"))
+            raise CommandError(f"{len(failures)} benchmark budget(s) regressed.")
+        self.stdout.write(self.style.SUCCESS("All budgets met."))
+
+    def _pick_users(self):
+        """The admin plus the busiest user of each other role, each with their busiest case."""
+        if not Case.objects.exists():
+            return {}
+        picked = {}
+        admin = User.objects.filter(role="admin").order_by("id").first()
+        if admin:
+            case = Case.objects.annotate(n=Count("hearing_notes")).order_by("-n").first()
+            picked["admin"] = (admin, case.pk)
+        for role, field in ROLE_FIELDS.items():
+            row = (
+                Case.objects.filter(**{f"{field}__is_approved": True})
+                .values(field).annotate(n=Count("id")).order_by("-n").first()
+            )
+            if not row:
+                continue
+            user = User.objects.get(pk=row[field])
+            case = (
+                Case.objects.visible_to(user)
+                .annotate(n=Count("hearing_notes")).order_by("-n").first()
+            )
+            if case:
+                picked[role] = (user, case.pk)
+        return picked
+
+    def _bench(self, client, url, iterations):
+        client.get(url)  # warm-up: imports, caches, first-connection costs
+
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        # Query/row counts and memory come from one extra, separately instrumented run
+        with _QueryCounter() as counter:
+            client.get(url)
+        tracemalloc.start()
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "status": response.status_code,
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "queries": counter.queries,
+            "rows": counter.rows,
+            "peak_kb": round(peak / 1024, 1),
+            "bytes": len(response.content),
+        }
+
+    def _report(self, role, name, r):
+        self.stdout.write(
+            f"  {role:<9}{name:<22} {r['status']}  p50 {r['p50_ms']:>8.2f} ms  "
+            f"p95 {r['p95_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms  "
+            f"{r['queries']:>4} queries  {r['rows']:>6} rows  {r['peak_kb']:>8.1f} KiB"
+        )
+
+    def _check_budgets(self, results, options):
+        failures = []
+        budgets = {}
+        if options["budgets"] and Path(options["budgets"]).exists():
+            budgets = json.loads(Path(options["budgets"]).read_text())
+        defaults = budgets.get("default", {})
+        baseline = {}
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())["results"]
+
+        for role, endpoints in results.items():
+            for name, r in endpoints.items():
+                label = f"{role} {name}"
+                if r["status"] >= 400:
+                    failures.append(f"{label}: HTTP {r['status']}")
+                limits = {**defaults, **budgets.get("endpoints", {}).get(name, {})}
+                for metric, limit in limits.items():
+                    if metric in r and r[metric] > limit:
+                        failures.append(f"{label}: {metric} {r[metric]} > budget {limit}")
+
+                previous = baseline.get(role, {}).get(name)
+                if previous:
+                    if r["queries"] > previous["queries"]:
+                        failures.append(
+                            f"{label}: queries {r['queries']} > baseline {previous['queries']}"
+                        )
+                    allowed = previous["p95_ms"] * (1 + options["tolerance"])
+                    if r["p95_ms"] > allowed:
+                        failures.append(
+                            f"{label}: p95 {r['p95_ms']} ms > baseline {previous['p95_ms']} ms "
+                            f"+{options['tolerance']:.0%}"
+                        )
+        return failures
@@ -0,0 +1,140 @@
+"""
+Management command: python manage.py bench_renderers
+
+Times DRF's stock JSONRenderer/JSONParser against casebox.renderers
+(orjson JSON, plus MessagePack when msgpack is installed) on large
+case-detail payloads, and reports encode/decode time and output size.
+
+Payloads are synthetic by default: case-detail shaped dicts with long
+summaries/verdicts and --notes nested hearing notes, carrying raw date,
+datetime, Decimal and UUID values. Use --from-db to serialise the real
+cases with the longest summaries through CaseDetailSerializer instead.
+"""
+import io
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from casebox import renderers
+from cases.models import Case
+from cases.serializers import CaseDetailSerializer
+
+WORDS = ("court", "hearing", "adjourned", "petitioner", "respondent", "evidence", "order",
+         "appeal", "witness", "counsel", "judgement", "matter", "notice", "affidavit")
+
+
+class Command(BaseCommand):
+    help = "Compare JSON/MessagePack renderer and parser speed on large case payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cases", type=int, default=50, help="Payloads per run.")
+        parser.add_argument("--notes", type=int, default=100, help="Hearing notes per synthetic case.")
+        parser.add_argument("--text-kb", type=int, default=20, help="Size of each long text field.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--from-db", action="store_true")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        payloads = self._db_payloads(opts["cases"]) if opts["from_db"] else self._synthetic(opts)
+        if not payloads:
+            raise CommandError("No payloads to render.")
+
+        pairs = [
+            ("stdlib json", JSONRenderer(), JSONParser(), "application/json"),
+            ("fast json" + ("" if renderers.orjson else " (orjson missing: stdlib)"),
+             renderers.FastJSONRenderer(), renderers.FastJSONParser(), "application/json"),
+        ]
+        if renderers.msgpack is not None:
+            pairs.append(("msgpack", renderers.MessagePackRenderer(), renderers.MessagePackParser(),
+                          "application/msgpack"))
+        else:
+            self.stdout.write("msgpack not installed; skipping MessagePack.")
+
+        self.stdout.write(f"{len(payloads)} payloads, {opts['iterations']} iterations")
+        self.stdout.write(f"{'format':<14} {'encode ms':>10} {'decode ms':>10} {'bytes':>12} {'vs stdlib':>10}")
+        baseline = None
+        for name, renderer, parser, media_type in pairs:
+            encode, decode, size = self._measure(renderer, parser, media_type, payloads, opts["iterations"])
+            baseline = baseline or (encode + decode)
+            self.stdout.write(
+                f"{name:<14} {encode * 1000:>10.2f} {decode * 1000:>10.2f} {size:>12,} "
+                f"{baseline / (encode + decode):>9.1f}x"
+            )
+
+    def _measure(self, renderer, parser, media_type, payloads, iterations):
+        encode_times, decode_times = [], []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            blobs = [renderer.render(payload, media_type) for payload in payloads]
+            encode_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for blob in blobs:
+                parser.parse(io.BytesIO(blob), media_type, {"encoding": "utf-8"})
+            decode_times.append(time.perf_counter() - start)
+        return statistics.median(encode_times), statistics.median(decode_times), sum(map(len, blobs))
+
+    def _synthetic(self, opts):
+        rng = random.Random(opts["seed"])
+        now = timezone.now()
+
+        def text(kb):
+            words = []
+            while sum(map(len, words)) + len(words) < kb * 1024:
+                words.append(rng.choice(WORDS))
+            return " ".join(words)
+
+        payloads = []
+        for i in range(opts["cases"]):
+            payloads.append({
+                "id": i,
+                "uuid": uuid.UUID(int=rng.getrandbits(128)),
+                "case_no": f"CIV/2026/{i:05d}",
+                "case_title": f"Matter {i} — petitioner vs. respondent",
+                "case_summary": text(opts["text_kb"]),
+                "last_verdict": text(opts["text_kb"] // 2),
+                "final_verdict": text(opts["text_kb"] // 2),
+                "filing_date": date(2024, 1, 1) + timedelta(days=i),
+                "next_hearing_date": date(2026, 11, 1) + timedelta(days=i % 60),
+                "created_at": now - timedelta(days=i),
+                "updated_at": now,
+                "court_fee": Decimal("1250.50"),
+                "progress": rng.randint(0, 100),
+                "hearing_notes": [
+                    {
+                        "id": i * 1000 + n,
+                        "hearing_date": date(2025, 1, 1) + timedelta(days=n * 7),
+                        "next_date": date(2025, 1, 8) + timedelta(days=n * 7),
+                        "note": text(1),
+                        "added_by_name": "Advocate Name",
+                        "created_at": now - timedelta(days=n),
+                    }
+                    for n in range(opts["notes"])
+                ],
+            })
+        return payloads
+
+    def _db_payloads(self, count):
+        admin = User.objects.filter(role="admin").first()
+        if admin is None:
+            raise CommandError("--from-db needs an admin user to serialise as.")
+        request = Request(APIRequestFactory().get("/api/cases/", HTTP_HOST=settings.ALLOWED_HOSTS[0]))
+        request.user = admin
+        cases = (
+            Case.objects.select_related("client", "judge", "client_advocate", "opposition_advocate")
+            .prefetch_related("documents", "hearing_notes", "comments")
+            .order_by("-case_summary")[:count]
+        )
+        # Serialise once up front: only rendering and parsing are being measured
+        return [dict(CaseDetailSerializer(case, context={"request": request}).data) for case in cases]
@@ -0,0 +1,129 @@
+"""
+Management command: python manage.py bench_sqlite_concurrency
+
+Runs a mixed read/write workload from many threads against the configured
+database for a fixed time and reports throughput, latency percentiles and
+errors per operation. Run it once with SQLITE_TUNING=False and once with
+SQLITE_TUNING=True to compare; the plain backend typically reports
+"database is locked" errors for the edit-case operation under load.
+
+Operations, picked at random per iteration:
+- read:      a page of the case list with its related users
+- audit:     an autocommit AccessLog insert, as log_action does
+- edit-case: read a case then save it inside atomic(), as the update views do
+
+Audit rows written by the run are deleted at the end; edited cases are saved
+with unchanged values.
+"""
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from cases.models import Case
+from logs.models import AccessLog
+
+BENCH_MARKER = "bench_sqlite_concurrency"
+
+
+class Command(BaseCommand):
+    help = "Measure mixed read/write throughput from concurrent threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--seconds", type=float, default=10.0)
+        parser.add_argument("--write-ratio", type=float, default=0.3,
+                            help="Share of iterations that write (split evenly between audit and edit-case).")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        case_ids = list(Case.objects.values_list("pk", flat=True)[:5_000])
+        if not case_ids:
+            raise CommandError("No cases found; run seed_casebox first.")
+
+        latencies = defaultdict(list)
+        errors = defaultdict(lambda: defaultdict(int))
+        lock = threading.Lock()
+        deadline = time.monotonic() + opts["seconds"]
+
+        def worker(n):
+            rng = random.Random(opts["seed"] * 1000 + n)
+            local_latency = defaultdict(list)
+            local_errors = defaultdict(lambda: defaultdict(int))
+            try:
+                while time.monotonic() < deadline:
+                    roll = rng.random()
+                    if roll >= opts["write_ratio"]:
+                        op, fn = "read", self._read
+                    elif roll < opts["write_ratio"] / 2:
+                        op, fn = "audit", self._audit
+                    else:
+                        op, fn = "edit-case", self._edit_case
+                    start = time.perf_counter()
+                    try:
+                        fn(rng.choice(case_ids))
+                    except Exception as exc:
+                        local_errors[op][str(exc).split("\n")[0][:80]] += 1
+                    else:
+                        local_latency[op].append(time.perf_counter() - start)
+            finally:
+                connection.close()
+                with lock:
+                    for op, values in local_latency.items():
+                        latencies[op].extend(values)
+                    for op, messages in local_errors.items():
+                        for message, count in messages.items():
+                            errors[op][message] += count
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(opts["threads"])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        AccessLog.objects.filter(description=BENCH_MARKER).delete()
+
+        self.stdout.write(
+            f"engine={connection.settings_dict['ENGINE']} threads={opts['threads']} "
+            f"seconds={elapsed:.1f}"
+        )
+        total = 0
+        for op in ("read", "audit", "edit-case"):
+            values = sorted(latencies.get(op, ()))
+            failed = sum(errors[op].values()) if op in errors else 0
+            total += len(values)
+            if values:
+                p50 = statistics.median(values) * 1000
+                p99 = values[min(len(values) - 1, int(len(values) * 0.99))] * 1000
+                timing = f"p50={p50:.1f}ms p99={p99:.1f}ms"
+            else:
+                timing = "no successful operations"
+            self.stdout.write(f"  {op:<10} ok={len(values):>7} ({len(values) / elapsed:,.0f}/s) "
+                              f"errors={failed:>5}  {timing}")
+            for message, count in errors.get(op, {}).items():
+                self.stdout.write(self.style.WARNING(f"      {count} × {message}"))
+        self.stdout.write(f"  total      {total / elapsed:,.0f} successful ops/s")
+
+    @staticmethod
+    def _read(case_id):
+        list(
+            Case.objects.filter(pk__gte=case_id)
+            .select_related("client", "judge", "client_advocate", "opposition_advocate")
+            .order_by("pk")[:20]
+        )
+
+    @staticmethod
+    def _audit(case_id):
+        AccessLog.objects.create(action="view_case", description=BENCH_MARKER)
+
+    @staticmethod
+    def _edit_case(case_id):
+        with transaction.atomic():
+            case = Case.objects.get(pk=case_id)
+            case.save(update_fields=["progress"])
@@ -0,0 +1,171 @@
+"""
+Management command: python manage.py explain_hot_paths
+
+Prints the query plan and median run time of every hot list/filter path the
+API serves (one per role branch of CaseViewSet.get_queryset, the dashboard,
+documents, logs and the pending-clients queue). Queries are scoped to the
+firm named by --firm, as they would be for a signed-in user of that firm.
+
+With --compare the same queries are first run with the index suite removed
+and the original single-column FK indexes restored — inside a transaction
+that is rolled back — so the before/after plans come from the same data.
+Seed a large dataset first; on a handful of rows every plan is a table scan.
+Don't run --compare against a live database: the DROP INDEX takes table locks.
+"""
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from accounts.models import Firm, User
+from accounts.tenancy import use_firm
+from cases.models import Case, HearingNote, CaseComment, CaseTag
+from documents.models import Document
+from logs.models import AccessLog
+
+INDEXED_MODELS = (User, Case, HearingNote, CaseComment, Document, AccessLog)
+
+# Created outside Meta.indexes by cases/migrations/0004_indexes.py
+POSTGRES_ONLY_INDEXES = ("case_facet_cov_idx",)
+
+# Single-column FK indexes from the 0001 migrations that the suite replaced
+BASELINE_INDEXES = (
+    ("cases_case", "client_advocate_id"),
+    ("cases_case", "opposition_advocate_id"),
+    ("cases_case", "judge_id"),
+    ("cases_hearingnote", "case_id"),
+    ("cases_casecomment", "case_id"),
+    ("documents_document", "case_id"),
+    ("logs_accesslog", "user_id"),
+)
+
+
+class Command(BaseCommand):
+    help = "Explain and time the hot query paths, optionally against the pre-index schema"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--compare", action="store_true",
+                            help="Also run every query without the index suite (rolled back)")
+        parser.add_argument("--runs", type=int, default=5, help="Timed runs per query")
+        parser.add_argument("--limit", type=int, default=50, help="Rows per list page")
+        parser.add_argument("--analyze", action="store_true",
+                            help="Use EXPLAIN ANALYZE where the database supports it")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+        parser.add_argument("--firm", default=Firm.DEFAULT_SLUG, help="Slug of the firm to query as")
+
+    def handle(self, *args, **options):
+        firm = Firm.objects.filter(slug=options["firm"]).first()
+        if firm is None:
+            raise CommandError(f"No firm with slug '{options['firm']}'.")
+        with use_firm(firm.pk):
+            paths = self._hot_paths(options["limit"])
+        if not paths:
+            self.stderr.write(self.style.WARNING("No cases found — seed the database first."))
+            return
+
+        results = {name: {} for name, _ in paths}
+        if options["compare"]:
+            with transaction.atomic():
+                self._drop_index_suite()
+                self._measure(paths, results, "before", options)
+                transaction.set_rollback(True)
+        self._measure(paths, results, "after", options)
+
+        for name, phases in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n── {name}"))
+            for phase, data in phases.items():
+                self.stdout.write(f"  [{phase}] median {data['median_ms']:.2f} ms")
+                for line in data["plan"].splitlines():
+                    self.stdout.write(f"      {line}")
+
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['json_path']}"))
+
+    def _measure(self, paths, results, phase, options):
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+        for name, qs in paths:
+            plan = qs.explain(**explain_options)
+            timings = []
+            for _ in range(options["runs"]):
+                start = time.perf_counter()
+                list(qs.all())  # fresh clone, never the result cache
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name][phase] = {"plan": plan, "median_ms": statistics.median(timings)}
+
+    def _drop_index_suite(self):
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    cursor.execute(f"DROP INDEX IF EXISTS {qn(index.name)}")
+            if connection.vendor == "postgresql":
+                for name in POSTGRES_ONLY_INDEXES:
+                    cursor.execute(f"DROP INDEX IF EXISTS {qn(name)}")
+            for table, column in BASELINE_INDEXES:
+                cursor.execute(
+                    f"CREATE INDEX {qn(f'baseline_{table}_{column}')} ON {qn(table)} ({qn(column)})"
+                )
+
+    def _hot_paths(self, limit):
+        """Querysets mirroring each hot endpoint, bound to the busiest user of each role."""
+        if not Case.objects.exists():
+            return []
+
+        def busiest(field):
+            row = (
+                Case.objects.exclude(**{f"{field}__isnull": True})
+                .values(field).annotate(n=Count("id")).order_by("-n").first()
+            )
+            return User.objects.get(pk=row[field]) if row else None
+
+        admin = User.objects.filter(role="admin").first() or User(role="admin")
+        today = timezone.now().date()
+        paths = [
+            ("case list · admin", Case.objects.visible_to(admin)[:limit]),
+            ("case list · status filter", Case.objects.filter(status="adjourned")[:limit]),
+            ("case list · case_type filter", Case.objects.filter(case_type="criminal")[:limit]),
+            ("case list · priority filter", Case.objects.filter(priority="urgent")[:limit]),
+            ("dashboard · by status", Case.objects.values("status").annotate(n=Count("id")).order_by()),
+            ("dashboard · upcoming hearings", Case.objects.filter(
+                next_hearing_date__gte=today,
+                next_hearing_date__lte=today + timedelta(days=30),
+            ).order_by("next_hearing_date")[:8]),
+            ("documents · admin", Document.objects.all()[:limit]),
+            ("logs · latest", AccessLog.objects.all()[:200]),
+            ("logs · by action", AccessLog.objects.filter(action="view_case")[:200]),
+            ("users · pending clients", User.objects.filter(
+                role="client", is_approved=False).order_by("-created_at")),
+            ("users · by role", User.objects.filter(role="advocate", is_approved=True)),
+        ]
+
+        for label, field in (("client", "client"), ("advocate", "client_advocate"), ("judge", "judge")):
+            user = busiest(field)
+            if user:
+                paths.append((f"case list · {label}", Case.objects.visible_to(user)[:limit]))
+
+        client = busiest("client")
+        if client:
+            paths.append(("documents · client", Document.objects.filter(
+                case__client=client, is_visible_to_client=True)[:limit]))
+
+        case = Case.objects.annotate(n=Count("hearing_notes")).order_by("-n").first()
+        paths += [
+            ("case detail · hearing notes", HearingNote.objects.filter(case=case)),
+            ("case detail · comments", CaseComment.objects.filter(case=case)),
+            ("case detail · documents", Document.objects.filter(case=case)),
+        ]
+
+        tag = CaseTag.objects.values("tag__name").annotate(n=Count("id")).order_by("-n").first()
+        if tag:
+            paths.append(("case list · tag filter", Case.objects.filter(
+                case_tags__tag__name=tag["tag__name"])[:limit]))
+        return paths
@@ -0,0 +1,77 @@
+"""
+Management command: python manage.py hearing_conflicts
+
+Lists judges and advocates booked into more than one case on the same day
+between --start and --end (default: the next 30 days), from the same
+HearingIndex that guards case create/update. Pass --bench to also time
+the build and single-case checks against a scan of the case table.
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from cases.models import Case
+from cases.scheduling import HearingIndex, PARTICIPANT_FIELDS, describe
+
+
+class Command(BaseCommand):
+    help = "Report hearing double-bookings for judges and advocates in a date range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date.fromisoformat)
+        parser.add_argument("--end", type=date.fromisoformat)
+        parser.add_argument("--bench", action="store_true")
+        parser.add_argument("--checks", type=int, default=10000, help="Checks to time with --bench.")
+
+    def handle(self, *args, **opts):
+        start = opts["start"] or timezone.localdate()
+        end = opts["end"] or start + timedelta(days=30)
+        if end < start:
+            raise CommandError("--end must not be before --start.")
+
+        index = HearingIndex()
+        built = time.perf_counter()
+        rows = index.conflicts_in_range(start, end)
+        built = time.perf_counter() - built
+
+        for row in describe(rows):
+            cases = ", ".join(case["case_no"] for case in row["cases"])
+            self.stdout.write(f"{row['date']}  {row['role'] or '?':<9} {row['participant_name']}: {cases}")
+        self.stdout.write(f"{len(rows)} double-booking(s) between {start} and {end}.")
+
+        if opts["bench"]:
+            self._bench(index, built, opts["checks"])
+
+    def _bench(self, index, built, checks):
+        cases = list(
+            Case.objects.filter(next_hearing_date__gte=timezone.localdate())
+            .values_list("id", "next_hearing_date", *(f"{f}_id" for f in PARTICIPANT_FIELDS))[:1000]
+        )
+        if not cases:
+            self.stdout.write("No upcoming hearings to check against.")
+            return
+        rng = random.Random(1)
+        sample = [rng.choice(cases) for _ in range(checks)]
+
+        start = time.perf_counter()
+        for case_id, day, *participants in sample:
+            index._conflicts(participants, day, case_id)
+        per_check = (time.perf_counter() - start) / checks
+
+        scans = sample[:50]
+        start = time.perf_counter()
+        for case_id, day, *participants in scans:
+            ids = [p for p in participants if p is not None]
+            list(Case.objects.filter(next_hearing_date=day).exclude(pk=case_id).filter(
+                Q(judge__in=ids) | Q(client_advocate__in=ids) | Q(opposition_advocate__in=ids)
+            ).values_list("id", flat=True))
+        per_scan = (time.perf_counter() - start) / len(scans)
+
+        self.stdout.write(
+            f"build + report {built * 1000:.1f} ms; check {per_check * 1e6:.1f} µs "
+            f"(in memory) vs {per_scan * 1e6:.1f} µs (SQL on next_hearing_date only, no note dates)"
+        )
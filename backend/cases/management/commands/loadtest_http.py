@@ -0,0 +1,126 @@
+"""
+Management command: python manage.py loadtest_http --url http://127.0.0.1:8000
+
+Drives a running server over real HTTP at increasing concurrency levels and
+reports throughput, p50/p99 latency and errors at each level, so the point
+where a deployment stops scaling (its concurrency ceiling) is easy to see.
+Each client thread keeps one persistent connection.
+
+Compare the two deployment paths against the same database, e.g.:
+
+    gunicorn casebox.wsgi -w 4 --threads 4 -b :8000
+    python manage.py loadtest_http --url http://127.0.0.1:8000 --paths /api/cases/ /api/documents/
+
+    uvicorn casebox.asgi:application --workers 4 --port 8001
+    python manage.py loadtest_http --url http://127.0.0.1:8001 --paths /api/async/cases/ /api/async/documents/
+"""
+import http.client
+import itertools
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Measure throughput and latency of a running server at several concurrency levels."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", required=True, help="Base URL of the running server.")
+        parser.add_argument("--paths", nargs="+", default=["/api/cases/"],
+                            help="Paths requested round-robin by every client.")
+        parser.add_argument("--concurrency", default="1,4,16,64",
+                            help="Comma-separated client counts to step through.")
+        parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each level.")
+        parser.add_argument("--username", help="Log in via /api/token/ and send the access token.")
+        parser.add_argument("--password")
+        parser.add_argument("--token", help="Access token to send instead of logging in.")
+        parser.add_argument("--timeout", type=float, default=30.0)
+
+    def handle(self, *args, **opts):
+        target = urlsplit(opts["url"])
+        if target.scheme not in ("http", "https") or not target.hostname:
+            raise CommandError("--url must look like http://host:port")
+        self.target = target
+        self.timeout = opts["timeout"]
+
+        token = opts["token"]
+        if opts["username"]:
+            token = self._login(opts["username"], opts["password"] or "")
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+        try:
+            levels = [int(level) for level in opts["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be a comma-separated list of integers.")
+
+        self.stdout.write(f"{opts['url']}  paths={' '.join(opts['paths'])}  {opts['seconds']:g}s per level")
+        self.stdout.write(f"{'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for clients in levels:
+            latencies, errors, elapsed = self._run_level(clients, opts["paths"], opts["seconds"])
+            latencies.sort()
+            if latencies:
+                p50 = statistics.median(latencies) * 1000
+                p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            else:
+                p50 = p99 = float("nan")
+            self.stdout.write(
+                f"{clients:>8} {len(latencies) / elapsed:>9.1f} {p50:>9.1f} {p99:>9.1f} {errors:>7}"
+            )
+
+    def _connection(self):
+        cls = http.client.HTTPSConnection if self.target.scheme == "https" else http.client.HTTPConnection
+        return cls(self.target.hostname, self.target.port, timeout=self.timeout)
+
+    def _login(self, username, password):
+        conn = self._connection()
+        body = json.dumps({"username": username, "password": password})
+        conn.request("POST", "/api/token/", body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        payload = response.read()
+        conn.close()
+        if response.status != 200:
+            raise CommandError(f"Login failed ({response.status}): {payload[:200]!r}")
+        return json.loads(payload)["access"]
+
+    def _run_level(self, clients, paths, seconds):
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+
+        def client(n):
+            nonlocal errors
+            conn = self._connection()
+            local_latencies, local_errors = [], 0
+            for path in itertools.islice(itertools.cycle(paths), n, None):
+                if time.monotonic() >= deadline:
+                    break
+                start = time.perf_counter()
+                try:
+                    conn.request("GET", path, headers=self.headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        local_errors += 1
+                        continue
+                    local_latencies.append(time.perf_counter() - start)
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    conn.close()
+                    conn = self._connection()
+            conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors += local_errors
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors, time.monotonic() - started
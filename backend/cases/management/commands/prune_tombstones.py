@@ -0,0 +1,23 @@
+"""
+Management command: python manage.py prune_tombstones
+
+Deletes Tombstone rows older than CASE_TOMBSTONE_RETENTION_DAYS. Sync tokens
+older than that are already refused by /api/cases/changes/, so nothing can
+still need them. Run it daily from cron.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cases.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete tombstones older than the delta-sync retention window."
+
+    def handle(self, *args, **opts):
+        cutoff = timezone.now() - timedelta(days=settings.CASE_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"✅ Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d}."))
@@ -0,0 +1,332 @@
+"""
+Management command: python manage.py seed_casebox --cases N --users M --docs-per-case K --logs L [--firm SLUG]
+
+Generates a synthetic, deterministic dataset for load and benchmark testing.
+Distributions are skewed the way a real docket is: a few advocates, judges and
+corporate clients carry most of the matters, hearing histories have a long
+tail, and verdicts are sparse. Rows are written with bulk_create in chunks, so
+a 1M-case fixture is practical on both SQLite and PostgreSQL.
+
+Re-running with the same --seed against an empty database reproduces the same
+data; use a different --seed to add a second batch alongside the first.
+Everything lands in the firm named by --firm (created if missing), so seeding
+several firms with different seeds gives a multi-tenant fixture.
+"""
+import itertools
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Firm
+from cases.models import Case, HearingNote, CaseComment, Tag, CaseTag
+from documents.models import Document
+from logs.models import AccessLog
+
+User = get_user_model()
+
+SEED_PASSWORD = "casebox-seed"
+
+# (value, weight) — the weights shape the generated docket
+ROLE_MIX = (("admin", 0.01), ("advocate", 0.15), ("judge", 0.05), ("client", 0.79))
+STATUS_MIX = (
+    ("ongoing", 45), ("adjourned", 20), ("judgement_reserved", 8),
+    ("closed", 17), ("disposed", 10),
+)
+TYPE_MIX = (
+    ("civil", 30), ("criminal", 22), ("family", 14), ("property", 12),
+    ("labour", 6), ("commercial", 10), ("constitutional", 2), ("other", 4),
+)
+PRIORITY_MIX = (("low", 20), ("medium", 50), ("high", 22), ("urgent", 8))
+ACTION_MIX = (
+    ("view_case", 60), ("view_document", 20), ("edit_case", 10),
+    ("upload_document", 6), ("login", 3), ("approve_client", 1),
+)
+SIDE_MIX = (("client", 50), ("opposition", 25), ("court", 20), ("other", 5))
+
+COURTS = (
+    ("Supreme Court of India", "Delhi"), ("Delhi High Court", "Delhi"),
+    ("Bombay High Court", "Mumbai"), ("Madras High Court", "Chennai"),
+    ("Calcutta High Court", "Kolkata"), ("Karnataka High Court", "Bengaluru"),
+    ("District Court Saket", "Delhi"), ("City Civil Court", "Mumbai"),
+    ("Family Court Bandra", "Mumbai"), ("NCLT Bench", "Ahmedabad"),
+    ("District Court Pune", "Pune"), ("Sessions Court", "Lucknow"),
+)
+TAGS = (
+    "property", "deed", "tax", "gst", "bail", "appeal", "writ", "injunction",
+    "divorce", "custody", "maintenance", "tenancy", "eviction", "arbitration",
+    "contract", "recovery", "cheque-bounce", "insolvency", "trademark", "labour-dispute",
+    "land-acquisition", "consumer", "motor-accident", "pil", "service-matter",
+)
+FIRST_NAMES = (
+    "Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera",
+    "Rohan", "Saanvi", "Arjun", "Priya", "Rahul", "Neha", "Vikram", "Sneha",
+)
+LAST_NAMES = (
+    "Sharma", "Verma", "Iyer", "Reddy", "Nair", "Gupta", "Mehta", "Kapoor",
+    "Singh", "Das", "Joshi", "Bose", "Menon", "Rao", "Patel", "Khan",
+)
+NOTE_TEXT = (
+    "Arguments heard in part. Matter adjourned at the request of counsel.",
+    "Evidence of PW-{n} recorded. Cross-examination deferred.",
+    "Court directed the respondent to file a reply within four weeks.",
+    "Interim order extended till the next date of hearing.",
+    "Written submissions filed. Matter reserved for orders.",
+    "Counsel for the petitioner sought time to place additional documents on record.",
+)
+
+
+def _cum_weights(weights):
+    return list(itertools.accumulate(weights))
+
+
+def _zipf_weights(n, s):
+    """Weights for ranks 1..n following a Zipf law — rank 1 gets the lion's share."""
+    return _cum_weights(1.0 / (rank ** s) for rank in range(1, n + 1))
+
+
+class Command(BaseCommand):
+    help = "Generate a large, skewed, deterministic CaseBox dataset for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cases", type=int, default=10_000)
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--docs-per-case", type=float, default=2.0,
+                            help="Mean documents per case")
+        parser.add_argument("--logs", type=int, default=50_000)
+        parser.add_argument("--max-notes", type=int, default=250,
+                            help="Cap on the hearing history of a single case")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--firm", default=Firm.DEFAULT_SLUG, help="Slug of the firm to seed into")
+        parser.add_argument("--chunk-size", type=int, default=2_000)
+        parser.add_argument("--with-files", action="store_true",
+                            help="Write a small placeholder file to storage for every document")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.prefix = f"seed{options['seed']}"
+        self.today = timezone.now().date()
+        self.chunk_size = options["chunk_size"]
+        # bulk_create skips save(), so every row is given its firm explicitly
+        self.firm_id = Firm.objects.get_or_create(
+            slug=options["firm"], defaults={"name": options["firm"].replace("-", " ").title()},
+        )[0].pk
+
+        if Case.objects.filter(case_no__startswith=f"{self.prefix.upper()}/").exists():
+            raise CommandError(
+                f"Data for --seed {options['seed']} already exists; pick another seed."
+            )
+        if options["users"] < 10:
+            raise CommandError("--users must be at least 10 so every role is represented.")
+
+        users = self._create_users(options["users"])
+        tags = self._create_tags()
+        self._create_cases(options, users, tags)
+        self._create_logs(options["logs"], users)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Seeded {options['cases']} cases, {options['users']} users and "
+            f"{options['logs']} log entries (seed {options['seed']}). "
+            f"Every seeded user's password is '{SEED_PASSWORD}'."
+        ))
+
+    # ── Users ────────────────────────────────────────────────────────────────
+    def _create_users(self, count):
+        password = make_password(SEED_PASSWORD)
+        roles = [role for role, _ in ROLE_MIX]
+        role_weights = _cum_weights(w for _, w in ROLE_MIX)
+
+        # Guarantee one user of every role, then draw the rest from the mix
+        drawn = roles + self.rng.choices(roles, cum_weights=role_weights, k=count - len(roles))
+        users = []
+        for i, role in enumerate(drawn):
+            users.append(User(
+                firm_id=self.firm_id,
+                username=f"{self.prefix}_{role}{i}",
+                email=f"{self.prefix}_{role}{i}@example.com",
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                password=password,
+                role=role,
+                # Roughly one client in ten is still waiting for approval
+                is_approved=role != "client" or self.rng.random() > 0.1,
+            ))
+        User.objects.bulk_create(users, batch_size=self.chunk_size)
+
+        by_role = {role: [] for role in roles}
+        for pk, role in User.objects.filter(
+            username__startswith=f"{self.prefix}_"
+        ).values_list("id", "role").order_by("id"):
+            by_role[role].append(pk)
+        self.stdout.write("  users: " + ", ".join(f"{len(v)} {k}" for k, v in by_role.items()))
+        return by_role
+
+    def _create_tags(self):
+        Tag.objects.bulk_create([Tag(name=name) for name in TAGS], ignore_conflicts=True)
+        return dict(Tag.objects.filter(name__in=TAGS).values_list("name", "id"))
+
+    # ── Cases and their children ─────────────────────────────────────────────
+    def _create_cases(self, options, users, tags):
+        rng = self.rng
+        # Hot advocates / judges / corporate clients carry most of the docket
+        advocate_weights = _zipf_weights(len(users["advocate"]), 1.1)
+        judge_weights = _zipf_weights(len(users["judge"]), 0.8)
+        client_weights = _zipf_weights(len(users["client"]), 0.6)
+        status_weights = _cum_weights(w for _, w in STATUS_MIX)
+        type_weights = _cum_weights(w for _, w in TYPE_MIX)
+        priority_weights = _cum_weights(w for _, w in PRIORITY_MIX)
+        side_weights = _cum_weights(w for _, w in SIDE_MIX)
+        staff = users["admin"] + users["advocate"]
+
+        total = options["cases"]
+        written = 0
+        for start in range(0, total, self.chunk_size):
+            size = min(self.chunk_size, total - start)
+            advocates = rng.choices(users["advocate"], cum_weights=advocate_weights, k=size * 2)
+            judges = rng.choices(users["judge"], cum_weights=judge_weights, k=size)
+            clients = rng.choices(users["client"], cum_weights=client_weights, k=size)
+            statuses = rng.choices([s for s, _ in STATUS_MIX], cum_weights=status_weights, k=size)
+            types = rng.choices([t for t, _ in TYPE_MIX], cum_weights=type_weights, k=size)
+            priorities = rng.choices([p for p, _ in PRIORITY_MIX], cum_weights=priority_weights, k=size)
+
+            cases, histories, case_tags = [], [], []
+            for i in range(size):
+                number = start + i
+                status = statuses[i]
+                is_open = status not in ("closed", "disposed")
+                court, city = rng.choice(COURTS)
+                filing = self.today - timedelta(days=int(rng.expovariate(1 / 900)) + 1)
+                hearings = self._hearing_dates(filing, options["max_notes"])
+                next_hearing = (
+                    self.today + timedelta(days=rng.randint(1, 120)) if is_open else None
+                )
+                names = rng.sample(TAGS, rng.choice((0, 1, 1, 2, 2, 3, 4)))
+                opposition = advocates[size + i] if rng.random() < 0.6 else None
+                if opposition == advocates[i]:
+                    opposition = None
+
+                cases.append(Case(
+                    firm_id=self.firm_id,
+                    case_no=f"{self.prefix.upper()}/{filing.year}/{number:07d}",
+                    case_title=f"{rng.choice(LAST_NAMES)} vs. {rng.choice(LAST_NAMES)}",
+                    case_type=types[i],
+                    priority=priorities[i],
+                    tags=", ".join(names),
+                    court_name=court,
+                    court_city=city,
+                    client_id=clients[i],
+                    judge_id=judges[i] if rng.random() < 0.9 else None,
+                    client_advocate_id=advocates[i],
+                    opposition_advocate_id=opposition,
+                    filing_date=filing,
+                    next_hearing_date=next_hearing,
+                    last_hearing_date=hearings[-1] if hearings else None,
+                    # Verdicts are sparse: interim ones occasionally, final ones only once decided
+                    last_verdict=("Interim relief granted." if rng.random() < 0.08 else ""),
+                    final_verdict=(
+                        "Suit decreed in favour of the plaintiff with costs."
+                        if not is_open and rng.random() < 0.6 else ""
+                    ),
+                    case_summary=f"{types[i].title()} matter before the {court}, {city}.",
+                    status=status,
+                    progress=100 if not is_open else rng.randint(0, 95),
+                    is_visible_to_client=rng.random() < 0.85,
+                ))
+                histories.append((hearings, next_hearing))
+                case_tags.append(names)
+
+            with transaction.atomic():
+                Case.objects.bulk_create(cases, batch_size=self.chunk_size)
+                self._create_children(cases, histories, case_tags, tags, staff,
+                                      options, side_weights)
+            written += size
+            self.stdout.write(f"  cases: {written}/{total}")
+
+    def _hearing_dates(self, filing, cap):
+        """A hearing history with a long tail — most cases have a few, some have hundreds."""
+        count = min(int(self.rng.paretovariate(1.3)) - 1, cap)
+        if count <= 0:
+            return []
+        span = max((self.today - filing).days, 1)
+        return sorted(
+            filing + timedelta(days=self.rng.randint(0, span)) for _ in range(count)
+        )
+
+    def _create_children(self, cases, histories, case_tags, tags, staff, options, side_weights):
+        rng = self.rng
+        notes, comments, documents, links = [], [], [], []
+        sides = [s for s, _ in SIDE_MIX]
+        mean_docs = options["docs_per_case"]
+
+        for case, (hearings, next_hearing), names in zip(cases, histories, case_tags):
+            links.extend(CaseTag(case_id=case.id, tag_id=tags[name]) for name in names)
+
+            for n, hearing in enumerate(hearings):
+                following = hearings[n + 1] if n + 1 < len(hearings) else next_hearing
+                notes.append(HearingNote(
+                    case_id=case.id,
+                    hearing_date=hearing,
+                    next_date=following,
+                    note=rng.choice(NOTE_TEXT).format(n=n + 1),
+                    added_by_id=rng.choice((case.client_advocate_id, rng.choice(staff))),
+                ))
+
+            for _ in range(int(rng.expovariate(1.0))):
+                comments.append(CaseComment(
+                    case_id=case.id,
+                    author_id=rng.choice((case.client_advocate_id, rng.choice(staff))),
+                    text="Follow up with the client before the next date.",
+                ))
+
+            doc_count = int(rng.expovariate(1 / mean_docs)) if mean_docs > 0 else 0
+            for d in range(doc_count):
+                name = f"case_documents/{self.prefix}/{case.id}/{d}.txt"
+                if options["with_files"]:
+                    name = default_storage.save(
+                        name, ContentFile(f"CaseBox placeholder for {case.case_no} #{d}\n".encode())
+                    )
+                documents.append(Document(
+                    firm_id=self.firm_id,
+                    case_id=case.id,
+                    title=f"Annexure {d + 1}",
+                    file=name,
+                    uploaded_by_id=case.client_advocate_id,
+                    side=rng.choices(sides, cum_weights=side_weights)[0],
+                    is_visible_to_client=rng.random() < 0.8,
+                ))
+
+        CaseTag.objects.bulk_create(links, batch_size=self.chunk_size)
+        HearingNote.objects.bulk_create(notes, batch_size=self.chunk_size)
+        CaseComment.objects.bulk_create(comments, batch_size=self.chunk_size)
+        Document.objects.bulk_create(documents, batch_size=self.chunk_size)
+
+    # ── Audit log ────────────────────────────────────────────────────────────
+    def _create_logs(self, total, users):
+        rng = self.rng
+        everyone = [pk for pks in users.values() for pk in pks]
+        actions = [a for a, _ in ACTION_MIX]
+        action_weights = _cum_weights(w for _, w in ACTION_MIX)
+        user_weights = _zipf_weights(len(everyone), 0.9)
+
+        for start in range(0, total, self.chunk_size):
+            size = min(self.chunk_size, total - start)
+            picked_users = rng.choices(everyone, cum_weights=user_weights, k=size)
+            picked_actions = rng.choices(actions, cum_weights=action_weights, k=size)
+            AccessLog.objects.bulk_create([
+                AccessLog(
+                    firm_id=self.firm_id,
+                    user_id=picked_users[i],
+                    action=picked_actions[i],
+                    description=f"Seeded {picked_actions[i].replace('_', ' ')}",
+                    ip_address=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                )
+                for i in range(size)
+            ], batch_size=self.chunk_size)
+        if total:
+            self.stdout.write(f"  logs: {total}")
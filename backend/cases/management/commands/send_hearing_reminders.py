@@ -0,0 +1,73 @@
+"""
+Management command: python manage.py send_hearing_reminders
+
+Emails clients, advocates and judges about hearings in the next
+HEARING_REMINDER_DAYS_AHEAD days (or --days), one message per person listing
+all of theirs. Every reminder sent is written to the HearingReminder ledger,
+so re-running the same day sends nothing twice, and a hearing that moves
+gets a fresh reminder. Sending goes through EMAIL_BACKEND over
+HEARING_REMINDER_CONNECTIONS reused connections (see cases/reminders.py).
+Run it daily from cron.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import Firm
+from cases.models import HearingReminder
+from cases.reminders import due_reminders, send_reminders
+
+
+class Command(BaseCommand):
+    help = "Email upcoming hearing reminders to everyone on each case, once per hearing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.HEARING_REMINDER_DAYS_AHEAD,
+                            help="Remind about hearings from today up to this many days ahead.")
+        parser.add_argument("--date", help="Treat this YYYY-MM-DD as today (for catching up a missed run).")
+        parser.add_argument("--firm", help="Only this firm's hearings (slug).")
+        parser.add_argument("--connections", type=int, default=settings.HEARING_REMINDER_CONNECTIONS,
+                            help="SMTP connections to send over in parallel.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be sent.")
+
+    def handle(self, *args, **opts):
+        try:
+            today = date.fromisoformat(opts["date"]) if opts["date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be YYYY-MM-DD.")
+        end = today + timedelta(days=max(opts["days"], 0))
+        firms = Firm.objects.order_by("pk")
+        if opts["firm"]:
+            firms = firms.filter(slug=opts["firm"])
+            if not firms.exists():
+                raise CommandError(f"No firm with slug '{opts['firm']}'.")
+
+        sent = failed = hearings = 0
+        for firm in firms:
+            reminders = due_reminders(firm.pk, today, end)
+            if not reminders:
+                continue
+            hearings += sum(len(reminder.hearings) for reminder in reminders)
+            if opts["dry_run"]:
+                sent += len(reminders)
+                continue
+            firm_sent, firm_failed = send_reminders(reminders, connections=max(opts["connections"], 1))
+            sent += firm_sent
+            failed += firm_failed
+            self.stdout.write(f"  {firm.slug}: {firm_sent} sent, {firm_failed} failed")
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{sent} reminders covering {hearings} hearing notices would be sent "
+                              f"for {today} – {end}.")
+            return
+        # Hearings before today can't be reminded about again; their ledger rows are done with
+        pruned, _ = HearingReminder.objects.filter(hearing_date__lt=today).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Sent {sent} reminders for hearings {today} – {end} (pruned {pruned} old ledger rows)."
+        ))
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f"{failed} reminders could not be delivered; the next run will retry them."
+            ))
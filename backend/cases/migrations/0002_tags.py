@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_tags', to='cases.case')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_tags', to='cases.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='cases', through='cases.CaseTag', to='cases.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='casetag',
+            index=models.Index(fields=['tag', 'case'], name='casetag_tag_case_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='casetag',
+            constraint=models.UniqueConstraint(fields=('case', 'tag'), name='unique_case_tag'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def split_tags(apps, schema_editor):
+    """Split each Case.tags string into normalised Tag / CaseTag rows."""
+    Case = apps.get_model("cases", "Case")
+    Tag = apps.get_model("cases", "Tag")
+    CaseTag = apps.get_model("cases", "CaseTag")
+
+    tag_ids = {}
+    links = []
+    for case_id, raw in Case.objects.exclude(tags="").values_list("id", "tags").iterator():
+        seen = set()
+        for part in raw.split(","):
+            name = part.strip().lower()[:100]
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            if name not in tag_ids:
+                tag_ids[name] = Tag.objects.get_or_create(name=name)[0].id
+            links.append(CaseTag(case_id=case_id, tag_id=tag_ids[name]))
+        if len(links) >= 1000:
+            CaseTag.objects.bulk_create(links, ignore_conflicts=True)
+            links = []
+    CaseTag.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0002_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(split_tags, migrations.RunPython.noop),
+    ]
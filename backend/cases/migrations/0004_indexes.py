@@ -0,0 +1,112 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# PostgreSQL-only covering index: lets the ?facets= GROUP BYs over status,
+# case_type, priority and court_city run as index-only scans
+COVERING_INDEXES = {
+    "case_facet_cov_idx": (
+        'CREATE INDEX IF NOT EXISTS "case_facet_cov_idx" ON "cases_case" ("status") '
+        'INCLUDE ("case_type", "priority", "court_city")'
+    ),
+}
+
+
+def create_covering_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for sql in COVERING_INDEXES.values():
+        schema_editor.execute(sql)
+
+
+def drop_covering_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in COVERING_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cases', '0003_populate_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['-created_at'], name='case_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_visible_to_client', True)), fields=['client', '-created_at'], name='case_client_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['client_advocate', '-created_at'], name='case_cadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['opposition_advocate', '-created_at'], name='case_oadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['judge', '-created_at'], name='case_judge_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['status', '-created_at'], name='case_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['case_type', '-created_at'], name='case_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['priority', '-created_at'], name='case_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('next_hearing_date__isnull', False)), fields=['next_hearing_date'], name='case_next_hearing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casecomment',
+            index=models.Index(fields=['case', 'created_at'], name='comment_case_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hearingnote',
+            index=models.Index(fields=['case', '-hearing_date'], name='note_case_date_idx'),
+        ),
+        migrations.RunPython(create_covering_indexes, drop_covering_indexes),
+        # Drop the single-column FK indexes only once the composites that lead
+        # with the same column exist
+        migrations.AlterField(
+            model_name='case',
+            name='client_advocate',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='advocate_cases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='judge',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='judge_cases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='opposition_advocate',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='opposition_cases', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='casecomment',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='cases.case'),
+        ),
+        migrations.AlterField(
+            model_name='hearingnote',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hearing_notes', to='cases.case'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:56
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing notes and comments were last changed when they were created."""
+    for model in ("HearingNote", "CaseComment"):
+        apps.get_model("cases", model).objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('case', 'Case'), ('hearing_note', 'Hearing Note'), ('comment', 'Comment'), ('document', 'Document')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('case_id', models.BigIntegerField()),
+                ('client_id', models.BigIntegerField(null=True)),
+                ('client_advocate_id', models.BigIntegerField(null=True)),
+                ('opposition_advocate_id', models.BigIntegerField(null=True)),
+                ('judge_id', models.BigIntegerField(null=True)),
+                ('client_visible', models.BooleanField(default=True)),
+                ('internal', models.BooleanField(default=False)),
+                ('revoked', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='casecomment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='hearingnote',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['updated_at'], name='case_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casecomment',
+            index=models.Index(fields=['updated_at'], name='comment_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hearingnote',
+            index=models.Index(fields=['updated_at'], name='note_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ),
+    ]
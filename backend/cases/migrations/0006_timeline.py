@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_created_events(apps, schema_editor):
+    """Give every existing case an "opened" event so its timeline has a start."""
+    Case = apps.get_model("cases", "Case")
+    CaseEvent = apps.get_model("cases", "CaseEvent")
+    ids = Case.objects.values_list("id", flat=True).iterator(chunk_size=2000)
+    batch = []
+    for case_id in ids:
+        batch.append(CaseEvent(case_id=case_id, kind="created"))
+        if len(batch) == 2000:
+            CaseEvent.objects.bulk_create(batch)
+            batch = []
+    CaseEvent.objects.bulk_create(batch)
+    # auto_now_add stamped them with the migration time
+    CaseEvent.objects.update(
+        created_at=Subquery(Case.objects.filter(pk=OuterRef("case_id")).values("created_at")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cases', '0005_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('created', 'Case Opened'), ('status', 'Status Changed'), ('progress', 'Progress Updated')], max_length=20)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hearingnote',
+            index=models.Index(fields=['case', '-created_at'], name='note_case_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='caseevent',
+            name='actor',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='caseevent',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='cases.case'),
+        ),
+        migrations.RunPython(backfill_created_events, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='caseevent',
+            index=models.Index(fields=['case', '-created_at'], name='event_case_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:17
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case_id', models.BigIntegerField(unique=True)),
+                ('case_no', models.CharField(db_index=True, max_length=100)),
+                ('case_title', models.CharField(max_length=255)),
+                ('case_type', models.CharField(choices=[('civil', 'Civil'), ('criminal', 'Criminal'), ('family', 'Family'), ('property', 'Property'), ('labour', 'Labour'), ('commercial', 'Commercial'), ('constitutional', 'Constitutional'), ('other', 'Other')], max_length=30)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+                ('status', models.CharField(choices=[('ongoing', 'Ongoing'), ('adjourned', 'Adjourned'), ('judgement_reserved', 'Judgement Reserved'), ('closed', 'Closed'), ('disposed', 'Disposed')], max_length=30)),
+                ('tags', models.CharField(blank=True, max_length=300)),
+                ('court_name', models.CharField(max_length=255)),
+                ('court_city', models.CharField(blank=True, max_length=100)),
+                ('client_id', models.BigIntegerField()),
+                ('client_advocate_id', models.BigIntegerField(null=True)),
+                ('opposition_advocate_id', models.BigIntegerField(null=True)),
+                ('judge_id', models.BigIntegerField(null=True)),
+                ('is_visible_to_client', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('summary', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['client_id', '-created_at'], name='archive_client_created_idx'), models.Index(fields=['client_advocate_id', '-created_at'], name='archive_cadv_created_idx'), models.Index(fields=['opposition_advocate_id', '-created_at'], name='archive_oadv_created_idx'), models.Index(fields=['judge_id', '-created_at'], name='archive_judge_created_idx')],
+            },
+        ),
+    ]
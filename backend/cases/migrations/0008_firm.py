@@ -0,0 +1,37 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_default_firm(apps, schema_editor):
+    Firm = apps.get_model("accounts", "Firm")
+    firm = Firm.objects.get(slug="default")
+    for name in ("Case", "ArchivedCase"):
+        apps.get_model("cases", name).objects.filter(firm__isnull=True).update(firm=firm)
+    apps.get_model("cases", "Tombstone").objects.filter(firm_id__isnull=True).update(firm_id=firm.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_firm'),
+        ('cases', '0007_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AddField(
+            model_name='archivedcase',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='firm_id',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(assign_default_firm, migrations.RunPython.noop),
+    ]
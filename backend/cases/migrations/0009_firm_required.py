@@ -0,0 +1,180 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# PostgreSQL-only: the ?facets= GROUP BYs now filter on firm first (see 0004_indexes)
+COVERING_INDEX_BY_FIRM = (
+    'CREATE INDEX IF NOT EXISTS "case_facet_cov_idx" ON "cases_case" ("firm_id", "status") '
+    'INCLUDE ("case_type", "priority", "court_city")'
+)
+COVERING_INDEX = (
+    'CREATE INDEX IF NOT EXISTS "case_facet_cov_idx" ON "cases_case" ("status") '
+    'INCLUDE ("case_type", "priority", "court_city")'
+)
+
+
+def lead_covering_index_with_firm(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "case_facet_cov_idx"')
+    schema_editor.execute(COVERING_INDEX_BY_FIRM)
+
+
+def restore_covering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "case_facet_cov_idx"')
+    schema_editor.execute(COVERING_INDEX)
+
+
+# Separate from 0008 so the backfill's UPDATE has committed before the
+# ALTER TABLE (PostgreSQL refuses both in one transaction with deferred FKs)
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0008_firm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='case',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AlterField(
+            model_name='archivedcase',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AlterField(
+            model_name='case',
+            name='case_no',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='case',
+            constraint=models.UniqueConstraint(fields=('firm', 'case_no'), name='case_firm_case_no_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='archivedcase',
+            name='case_no',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_client_visible_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_cadv_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_oadv_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_judge_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_type_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_priority_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='case',
+            name='case_next_hearing_idx',
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', '-created_at'], name='case_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_visible_to_client', True)), fields=['firm', 'client', '-created_at'], name='case_client_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'client_advocate', '-created_at'], name='case_cadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'opposition_advocate', '-created_at'], name='case_oadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'judge', '-created_at'], name='case_judge_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'status', '-created_at'], name='case_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'case_type', '-created_at'], name='case_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['firm', 'priority', '-created_at'], name='case_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('next_hearing_date__isnull', False)), fields=['firm', 'next_hearing_date'], name='case_next_hearing_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedcase',
+            name='archive_client_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedcase',
+            name='archive_cadv_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedcase',
+            name='archive_oadv_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='archivedcase',
+            name='archive_judge_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', '-created_at'], name='archive_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', 'case_no'], name='archive_case_no_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', 'client_id', '-created_at'], name='archive_client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', 'client_advocate_id', '-created_at'], name='archive_cadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', 'opposition_advocate_id', '-created_at'], name='archive_oadv_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcase',
+            index=models.Index(fields=['firm', 'judge_id', '-created_at'], name='archive_judge_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['firm_id', 'deleted_at'], name='tombstone_firm_deleted_idx'),
+        ),
+        migrations.RunPython(lead_covering_index_with_firm, restore_covering_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cases', '0009_firm_required'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HearingReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hearing_date', models.DateField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('case', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='cases.case')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hearing_date'], name='reminder_hearing_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='hearingreminder',
+            constraint=models.UniqueConstraint(fields=('case', 'recipient', 'hearing_date'), name='reminder_once_uniq'),
+        ),
+    ]
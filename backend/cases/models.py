@@ -1,8 +1,42 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
+from accounts.models import TenantModel
+from accounts.tenancy import TenantManager
 
-class Case(models.Model):
+
+class ParticipantScopedQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Scope cases to what `user` may see — the role rules used by every case endpoint."""
+        # Written against the *_id columns so ArchivedCase (plain integers) shares the rules
+        if user.role == "admin":
+            return self.all()
+        if user.role == "client":
+            return self.filter(client_id=user.pk, is_visible_to_client=True)
+        if user.role == "advocate":
+            return self.filter(Q(client_advocate_id=user.pk) | Q(opposition_advocate_id=user.pk))
+        if user.role == "judge":
+            return self.filter(judge_id=user.pk)
+        return self.none()
+
+
+class CaseQuerySet(ParticipantScopedQuerySet):
+
+    def with_child_counts(self):
+        """Annotate hearing_note_count and comment_count, one indexed subquery each."""
+        def count(model):
+            rows = (
+                model.objects.filter(case=OuterRef("pk")).order_by()
+                .values("case").annotate(n=Count("id")).values("n")
+            )
+            return Coalesce(Subquery(rows), 0)
+        return self.annotate(hearing_note_count=count(HearingNote), comment_count=count(CaseComment))
+
+
+class Case(TenantModel):
     STATUS_CHOICES = (
         ("ongoing", "Ongoing"),
         ("adjourned", "Adjourned"),
@@ -27,11 +61,14 @@ class Case(models.Model):
         ("urgent", "Urgent"),
     )
 
-    case_no = models.CharField(max_length=100, unique=True)
+    case_no = models.CharField(max_length=100)   # unique within the firm
     case_title = models.CharField(max_length=255)
     case_type = models.CharField(max_length=30, choices=CASE_TYPE_CHOICES, default="civil")
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default="medium")
     tags = models.CharField(max_length=300, blank=True, help_text="Comma-separated tags")
+    tag_set = models.ManyToManyField(
+        "Tag", through="CaseTag", related_name="cases", blank=True,
+    )
 
     court_name = models.CharField(max_length=255)
     court_city = models.CharField(max_length=100, blank=True)
@@ -46,18 +83,21 @@ class Case(models.Model):
         related_name="judge_cases",
         on_delete=models.SET_NULL,
         null=True, blank=True,
+        db_index=False,  # covered by case_judge_created_idx
     )
     client_advocate = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="advocate_cases",
         on_delete=models.SET_NULL,
         null=True, blank=True,
+        db_index=False,  # covered by case_cadv_created_idx
     )
     opposition_advocate = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         related_name="opposition_cases",
         on_delete=models.SET_NULL,
         null=True, blank=True,
+        db_index=False,  # covered by case_oadv_created_idx
     )
 
     filing_date = models.DateField(null=True, blank=True)
@@ -76,16 +116,105 @@ class Case(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager.from_queryset(CaseQuerySet)()
+    all_firms = CaseQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["firm", "case_no"], name="case_firm_case_no_uniq"),
+        ]
+        # One composite per role branch of CaseViewSet.get_queryset, each
+        # ending in the default ordering so the page comes straight off the index
+        indexes = [
+            models.Index(fields=["firm", "-created_at"], name="case_created_idx"),
+            models.Index(
+                fields=["firm", "client", "-created_at"], name="case_client_visible_idx",
+                condition=Q(is_visible_to_client=True),
+            ),
+            models.Index(fields=["firm", "client_advocate", "-created_at"], name="case_cadv_created_idx"),
+            models.Index(fields=["firm", "opposition_advocate", "-created_at"], name="case_oadv_created_idx"),
+            models.Index(fields=["firm", "judge", "-created_at"], name="case_judge_created_idx"),
+            models.Index(fields=["firm", "status", "-created_at"], name="case_status_created_idx"),
+            models.Index(fields=["firm", "case_type", "-created_at"], name="case_type_created_idx"),
+            models.Index(fields=["firm", "priority", "-created_at"], name="case_priority_created_idx"),
+            models.Index(
+                fields=["firm", "next_hearing_date"], name="case_next_hearing_idx",
+                condition=Q(next_hearing_date__isnull=False),
+            ),
+            # Delta sync (/api/cases/changes/) walks rows by modification time.
+            # The in-memory indexes catch up across every firm, so no firm prefix.
+            models.Index(fields=["updated_at"], name="case_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.case_no} – {self.case_title}"
 
+    def sync_tags(self):
+        """Mirror the comma-separated `tags` string into indexed CaseTag rows."""
+        names = Tag.parse(self.tags)
+        existing = dict(
+            CaseTag.objects.filter(case=self).values_list("tag__name", "id")
+        )
+        stale = [pk for name, pk in existing.items() if name not in names]
+        if stale:
+            CaseTag.objects.filter(id__in=stale).delete()
+        missing = [name for name in names if name not in existing]
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(name=name) for name in missing], ignore_conflicts=True,
+            )
+            tags = Tag.objects.filter(name__in=missing)
+            CaseTag.objects.bulk_create(
+                [CaseTag(case=self, tag=tag) for tag in tags],
+                ignore_conflicts=True,
+            )
+
+
+class Tag(models.Model):
+    """A normalised case tag. Names are stored lower-cased and trimmed."""
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def parse(raw):
+        """Split a comma-separated tag string into unique normalised names."""
+        names = []
+        for part in (raw or "").split(","):
+            name = part.strip().lower()[:100]
+            if name and name not in names:
+                names.append(name)
+        return names
+
+
+class CaseTag(models.Model):
+    """Through table between Case and Tag — indexed on (tag, case) for filtering."""
+    case = models.ForeignKey(Case, related_name="case_tags", on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, related_name="case_tags", on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["case", "tag"], name="unique_case_tag"),
+        ]
+        indexes = [
+            models.Index(fields=["tag", "case"], name="casetag_tag_case_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.case_id} – {self.tag_id}"
+
 
 class HearingNote(models.Model):
     """Notes from each hearing session."""
-    case = models.ForeignKey(Case, related_name="hearing_notes", on_delete=models.CASCADE)
+    case = models.ForeignKey(
+        Case, related_name="hearing_notes", on_delete=models.CASCADE,
+        db_index=False,  # covered by note_case_date_idx
+    )
     hearing_date = models.DateField()
     next_date = models.DateField(null=True, blank=True)
     note = models.TextField()
@@ -93,9 +222,15 @@ class HearingNote(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-hearing_date"]
+        indexes = [
+            models.Index(fields=["case", "-hearing_date"], name="note_case_date_idx"),
+            models.Index(fields=["case", "-created_at"], name="note_case_created_idx"),  # timeline
+            models.Index(fields=["updated_at"], name="note_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.case.case_no} – {self.hearing_date}"
@@ -106,15 +241,179 @@ class CaseComment(models.Model):
     Internal comments visible only to admin and advocates.
     Clients never see these.
     """
-    case = models.ForeignKey(Case, related_name="comments", on_delete=models.CASCADE)
+    case = models.ForeignKey(
+        Case, related_name="comments", on_delete=models.CASCADE,
+        db_index=False,  # covered by comment_case_created_idx
+    )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True
     )
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["case", "created_at"], name="comment_case_created_idx"),
+            models.Index(fields=["updated_at"], name="comment_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.case.case_no} – comment by {self.author}"
+
+
+class CaseEvent(models.Model):
+    """
+    A structured record of a change to a case (opened, status, progress),
+    written by CaseViewSet alongside the free-text AccessLog entry. `data`
+    holds the old and new values, e.g. {"from": "ongoing", "to": "closed"}.
+    """
+    KIND_CHOICES = (
+        ("created", "Case Opened"),
+        ("status", "Status Changed"),
+        ("progress", "Progress Updated"),
+    )
+
+    case = models.ForeignKey(
+        Case, related_name="events", on_delete=models.CASCADE,
+        db_index=False,  # covered by event_case_created_idx
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+    )
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["case", "-created_at"], name="event_case_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.case_id} – {self.kind} at {self.created_at}"
+
+    @classmethod
+    def record_changes(cls, case, before, actor):
+        """Write one event per tracked field that differs from the `before` snapshot."""
+        events = [
+            cls(case=case, kind=field, actor=actor, data={"from": old, "to": getattr(case, field)})
+            for field, old in before.items()
+            if getattr(case, field) != old
+        ]
+        cls.objects.bulk_create(events)
+        return events
+
+
+class Tombstone(models.Model):
+    """
+    A row that was deleted, or that some participants can no longer see, kept
+    so /api/cases/changes/ can tell clients to drop it. The participant
+    columns record who could see the row at the time; `revoked` marks
+    tombstones written only for participants who lost access, which admins
+    (who still see the row) skip.
+    """
+    KIND_CHOICES = (
+        ("case", "Case"),
+        ("hearing_note", "Hearing Note"),
+        ("comment", "Comment"),
+        ("document", "Document"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    case_id = models.BigIntegerField()
+    client_id = models.BigIntegerField(null=True)
+    client_advocate_id = models.BigIntegerField(null=True)
+    opposition_advocate_id = models.BigIntegerField(null=True)
+    judge_id = models.BigIntegerField(null=True)
+    firm_id = models.BigIntegerField(null=True)
+    client_visible = models.BooleanField(default=True)
+    internal = models.BooleanField(default=False)  # comments: admin and advocates only
+    revoked = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["deleted_at"]
+        indexes = [
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+            models.Index(fields=["firm_id", "deleted_at"], name="tombstone_firm_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+
+class ArchivedCase(TenantModel):
+    """
+    A closed or disposed case moved out of the hot tables by archive_cases
+    (see cases/archive.py). The columns the case list searches and scopes on
+    are kept as plain values, `summary` is the case's list row, and `payload`
+    holds the case and its children as serialized rows for restoring them
+    under their original ids. Document files sit in CASE_ARCHIVE_ROOT.
+    """
+    case_id = models.BigIntegerField(unique=True)
+    case_no = models.CharField(max_length=100)
+    case_title = models.CharField(max_length=255)
+    case_type = models.CharField(max_length=30, choices=Case.CASE_TYPE_CHOICES)
+    priority = models.CharField(max_length=10, choices=Case.PRIORITY_CHOICES)
+    status = models.CharField(max_length=30, choices=Case.STATUS_CHOICES)
+    tags = models.CharField(max_length=300, blank=True)
+    court_name = models.CharField(max_length=255)
+    court_city = models.CharField(max_length=100, blank=True)
+
+    client_id = models.BigIntegerField()
+    client_advocate_id = models.BigIntegerField(null=True)
+    opposition_advocate_id = models.BigIntegerField(null=True)
+    judge_id = models.BigIntegerField(null=True)
+    is_visible_to_client = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField()   # when the case was opened
+    archived_at = models.DateTimeField(auto_now_add=True)
+    summary = models.JSONField(encoder=DjangoJSONEncoder)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+
+    objects = TenantManager.from_queryset(ParticipantScopedQuerySet)()
+    all_firms = ParticipantScopedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["firm", "-created_at"], name="archive_created_idx"),
+            models.Index(fields=["firm", "case_no"], name="archive_case_no_idx"),
+            models.Index(fields=["firm", "client_id", "-created_at"], name="archive_client_created_idx"),
+            models.Index(fields=["firm", "client_advocate_id", "-created_at"], name="archive_cadv_created_idx"),
+            models.Index(fields=["firm", "opposition_advocate_id", "-created_at"], name="archive_oadv_created_idx"),
+            models.Index(fields=["firm", "judge_id", "-created_at"], name="archive_judge_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.case_no} – archived {self.archived_at:%Y-%m-%d}"
+
+
+class HearingReminder(models.Model):
+    """
+    The ledger send_hearing_reminders keeps: one row per person reminded of
+    a case's hearing on a given date, so re-runs never send twice and a
+    moved hearing gets a fresh reminder.
+    """
+    case = models.ForeignKey(
+        Case, related_name="+", on_delete=models.CASCADE,
+        db_index=False,  # covered by reminder_once_uniq
+    )
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, related_name="+", on_delete=models.CASCADE)
+    hearing_date = models.DateField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["case", "recipient", "hearing_date"], name="reminder_once_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["hearing_date"], name="reminder_hearing_date_idx"),   # pruning
+        ]
+
+    def __str__(self):
+        return f"Reminder to {self.recipient_id} for case {self.case_id} on {self.hearing_date}"
@@ -0,0 +1,22 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ChildCursorPagination(CursorPagination):
+    """
+    Newest-first cursor pages for a case's hearing notes and comments. Pages
+    seek on the (case, date) indexes, so deep pages cost the same as the first.
+    """
+    page_size_query_param = "limit"
+
+    def __init__(self):
+        self.page_size = settings.CASE_CHILD_PAGE_SIZE
+        self.max_page_size = settings.CASE_CHILD_MAX_PAGE_SIZE
+
+
+class HearingNotePagination(ChildCursorPagination):
+    ordering = ("-hearing_date", "-id")
+
+
+class CommentPagination(ChildCursorPagination):
+    ordering = ("-created_at", "-id")
@@ -0,0 +1,213 @@
+"""
+Conflict-of-interest checks from the docket's party/advocate relationships.
+
+RelationshipGraph keeps two edge sets from every case, live or closed.
+"represented" links a client_advocate to the client. "opposed" links an
+opposition_advocate to the client. Each advocate's edges are stored as a
+pair of parallel array("q") columns: client ids kept sorted, and the case
+each edge came from. Asking "has X ever acted for/against client C?" is then
+a bisect into X's arrays, so checking one case costs a handful of bisects and
+scanning the whole docket is a single pass over the cases.
+
+A case raises a conflict when:
+
+- its client_advocate has acted against the same client in another case;
+- its opposition_advocate has represented the client in another case;
+- its judge has appeared as an advocate for or against the client;
+- one person fills two roles on the case (e.g. both advocates).
+
+Archived cases (see cases/archive.py) stay in the graph as closed cases, so
+moving old matters out of the hot tables doesn't forget who acted for whom.
+
+Like every CaseIndex (see cases/indexing.py), each process keeps its own
+copy, current through signals and a catch-up before each query.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from accounts.models import User
+from .indexing import CaseIndex
+from .models import ArchivedCase, Case
+
+REPRESENTED, OPPOSED = 0, 1
+CLOSED_STATUSES = ("closed", "disposed")
+KIND_LABELS = {
+    "advocate_opposed_client": "The client's advocate has acted against this client before.",
+    "opposition_represented_client": "The opposition advocate has represented this client before.",
+    "judge_acted_for_client": "The judge has appeared as an advocate for or against this client.",
+    "same_person_two_roles": "One person holds two roles on this case.",
+}
+
+
+class ConflictOfInterest(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This case has a conflict of interest."
+    default_code = "conflict_of_interest"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.detail = {"detail": self.default_detail, "conflicts_of_interest": conflicts}
+
+
+class _Edges:
+    """One advocate's edges of one kind: sorted client ids with the matching case ids."""
+    __slots__ = ("clients", "cases")
+
+    def __init__(self):
+        self.clients = array("q")
+        self.cases = array("q")
+
+    def add(self, client_id, case_id):
+        i = bisect_right(self.clients, client_id)
+        self.clients.insert(i, client_id)
+        self.cases.insert(i, case_id)
+
+    def remove(self, client_id, case_id):
+        lo, hi = bisect_left(self.clients, client_id), bisect_right(self.clients, client_id)
+        for i in range(lo, hi):
+            if self.cases[i] == case_id:
+                del self.clients[i], self.cases[i]
+                return
+
+    def cases_with(self, client_id, exclude_case=None):
+        lo, hi = bisect_left(self.clients, client_id), bisect_right(self.clients, client_id)
+        return [case_id for case_id in self.cases[lo:hi] if case_id != exclude_case]
+
+
+class RelationshipGraph(CaseIndex):
+    def _reset(self):
+        self._cases = {}    # case id -> (client, client_advocate, opposition_advocate, judge, closed)
+        self._edges = {}    # (REPRESENTED | OPPOSED, advocate id) -> _Edges
+
+    def _initial_case_ids(self):
+        return (set(Case.all_firms.values_list("id", flat=True))
+                | set(ArchivedCase.all_firms.values_list("case_id", flat=True)))
+
+    def _load(self, case_ids):
+        case_ids = list(case_ids)
+        for start in range(0, len(case_ids), 2000):
+            chunk = case_ids[start:start + 2000]
+            rows = {
+                row[0]: row[1:]
+                for row in Case.all_firms.filter(id__in=chunk).values_list(
+                    "id", "client", "client_advocate", "opposition_advocate", "judge", "status",
+                )
+            }
+            missing = [case_id for case_id in chunk if case_id not in rows]
+            if missing:
+                rows.update(
+                    (row[0], row[1:])
+                    for row in ArchivedCase.all_firms.filter(case_id__in=missing).values_list(
+                        "case_id", "client_id", "client_advocate_id", "opposition_advocate_id", "judge_id", "status",
+                    )
+                )
+            for case_id in chunk:
+                row = rows.get(case_id)
+                self._replace(case_id, (*row[:4], row[4] in CLOSED_STATUSES) if row else None)
+
+    def _replace(self, case_id, record):
+        old = self._cases.pop(case_id, None)
+        if old is not None:
+            for kind, advocate in ((REPRESENTED, old[1]), (OPPOSED, old[2])):
+                if advocate is not None:
+                    self._edges[kind, advocate].remove(old[0], case_id)
+        if record is not None:
+            self._cases[case_id] = record
+            for kind, advocate in ((REPRESENTED, record[1]), (OPPOSED, record[2])):
+                if advocate is not None:
+                    self._edges.setdefault((kind, advocate), _Edges()).add(record[0], case_id)
+
+    # ── Signal hooks ─────────────────────────────────────────────────────────
+
+    def case_saved(self, case):
+        with self._lock:
+            if self._built:
+                self._replace(case.pk, (case.client_id, case.client_advocate_id, case.opposition_advocate_id,
+                                        case.judge_id, case.status in CLOSED_STATUSES))
+
+    def case_deleted(self, case_id):
+        with self._lock:
+            if self._built:
+                self._replace(case_id, None)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def _edges_for(self, kind, advocate, client, exclude_case):
+        edges = self._edges.get((kind, advocate))
+        return edges.cases_with(client, exclude_case) if edges else []
+
+    def _conflicts(self, client, client_advocate, opposition_advocate, judge, exclude_case=None):
+        """[(kind, participant id, [other case ids])] for one case's parties."""
+        found = []
+        if client_advocate is not None:
+            cases = self._edges_for(OPPOSED, client_advocate, client, exclude_case)
+            if cases:
+                found.append(("advocate_opposed_client", client_advocate, cases))
+        if opposition_advocate is not None:
+            cases = self._edges_for(REPRESENTED, opposition_advocate, client, exclude_case)
+            if cases:
+                found.append(("opposition_represented_client", opposition_advocate, cases))
+        if judge is not None:
+            cases = (self._edges_for(REPRESENTED, judge, client, exclude_case)
+                     + self._edges_for(OPPOSED, judge, client, exclude_case))
+            if cases:
+                found.append(("judge_acted_for_client", judge, sorted(cases)))
+        people = [p for p in (client, client_advocate, opposition_advocate, judge) if p is not None]
+        for person in {p for p in people if people.count(p) > 1}:
+            found.append(("same_person_two_roles", person, []))
+        return found
+
+    def conflicts(self, client, client_advocate, opposition_advocate, judge, exclude_case=None):
+        with self._lock:
+            self._refresh()
+            return self._conflicts(client, client_advocate, opposition_advocate, judge, exclude_case)
+
+    def scan(self, include_closed=False):
+        """{case id: conflicts} for every open case (all cases with include_closed) in one pass."""
+        with self._lock:
+            self._refresh()
+            report = {}
+            for case_id, (client, cadv, oadv, judge, closed) in self._cases.items():
+                if closed and not include_closed:
+                    continue
+                found = self._conflicts(client, cadv, oadv, judge, exclude_case=case_id)
+                if found:
+                    report[case_id] = found
+            return report
+
+    def check(self, client, client_advocate, opposition_advocate, judge, exclude_case=None):
+        """Raise ConflictOfInterest if the proposed parties conflict with the rest of the docket."""
+        found = self.conflicts(client, client_advocate, opposition_advocate, judge, exclude_case)
+        if found:
+            raise ConflictOfInterest(describe(found))
+
+
+def describe(found):
+    """Expand (kind, participant id, [case ids]) tuples with names, messages and case numbers."""
+    users = User.objects.in_bulk({participant for _, participant, _ in found})
+    case_ids = {case_id for *_, ids in found for case_id in ids}
+    cases = Case.objects.in_bulk(case_ids)
+    cases.update(
+        (archived.case_id, archived)
+        for archived in ArchivedCase.objects.filter(case_id__in=case_ids - set(cases))
+    )
+    return [
+        {
+            "kind": kind,
+            "message": KIND_LABELS[kind],
+            "participant": participant,
+            "participant_name": (users[participant].get_full_name() or users[participant].username)
+            if participant in users else None,
+            "cases": [
+                {"id": pk, "case_no": cases[pk].case_no, "case_title": cases[pk].case_title}
+                for pk in ids if pk in cases
+            ],
+        }
+        for kind, participant, ids in found
+    ]
+
+
+relationship_graph = RelationshipGraph()
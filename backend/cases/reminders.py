@@ -0,0 +1,199 @@
+"""
+Hearing reminder emails (see `manage.py send_hearing_reminders`).
+
+For each firm, one range query on case_next_hearing_idx finds the cases
+with a hearing in the window. Their participants are loaded in bulk, and
+each person's hearings not yet in the HearingReminder ledger are grouped
+into a single message. Messages are rendered from one compiled template
+and sent in batches by a few threads. Each thread holds its own SMTP
+connection open for the whole run, and a failed send reopens the
+connection and tries the message again. Only the calling thread touches
+the database: it writes a batch's ledger rows once that batch has gone out.
+"""
+import logging
+import queue
+import smtplib
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template import Context, Engine
+
+from accounts.models import User
+from .models import Case, HearingReminder
+
+logger = logging.getLogger("casebox.reminders")
+
+CASE_FIELDS = (
+    "id", "case_no", "case_title", "court_name", "court_city", "next_hearing_date",
+    "client_id", "is_visible_to_client", "client_advocate_id", "opposition_advocate_id", "judge_id",
+)
+RECIPIENT_FIELDS = ("client_id", "client_advocate_id", "opposition_advocate_id", "judge_id")
+
+# Compiled once; rendering is then a cheap walk of the node list per message
+_engine = Engine(autoescape=False)
+SUBJECT = _engine.from_string(
+    "{% if hearings|length == 1 %}Hearing reminder: {{ hearings.0.case_no }} on {{ hearings.0.date|date:'j M Y' }}"
+    "{% else %}Reminder: {{ hearings|length }} upcoming hearings{% endif %}"
+)
+BODY = _engine.from_string(
+    "Dear {{ name }},\n\n"
+    "This is a reminder of your upcoming hearing{{ hearings|pluralize }}:\n"
+    "{% for h in hearings %}\n"
+    "  {{ h.date|date:'l, j F Y' }} — {{ h.case_no }}: {{ h.case_title }}\n"
+    "  {{ h.court }}\n"
+    "{% endfor %}\n"
+    "Sign in to CaseBox for the case details and latest hearing notes.\n\n"
+    "— CaseBox\n"
+)
+
+
+class Reminder:
+    __slots__ = ("recipient", "hearings")
+
+    def __init__(self, recipient, hearings):
+        self.recipient = recipient
+        self.hearings = hearings   # dicts: case_id, case_no, case_title, court, date
+
+    def ledger_rows(self):
+        return [
+            HearingReminder(case_id=h["case_id"], recipient_id=self.recipient.pk, hearing_date=h["date"])
+            for h in self.hearings
+        ]
+
+
+def _may_receive(user, role_field, case):
+    # Same audience as the case itself: clients only when the case is visible and they're approved
+    if not user.is_active or not user.email:
+        return False
+    if role_field == "client_id":
+        return case["is_visible_to_client"] and user.is_approved
+    return True
+
+
+def due_reminders(firm_id, start, end):
+    """Reminders owed for hearings in [start, end] in one firm, one per recipient."""
+    cases = [
+        dict(zip(CASE_FIELDS, row))
+        for row in Case.all_firms.filter(firm_id=firm_id, next_hearing_date__range=(start, end))
+        .order_by("next_hearing_date", "id").values_list(*CASE_FIELDS)
+    ]
+    if not cases:
+        return []
+    case_ids = [case["id"] for case in cases]
+    user_ids = {case[f] for case in cases for f in RECIPIENT_FIELDS if case[f]}
+    users = User.all_firms.only(
+        "first_name", "last_name", "username", "email", "role", "is_active", "is_approved",
+    ).in_bulk(user_ids)
+    sent = set()
+    for chunk in range(0, len(case_ids), 2000):
+        sent.update(HearingReminder.objects.filter(
+            case_id__in=case_ids[chunk:chunk + 2000], hearing_date__range=(start, end),
+        ).values_list("case_id", "recipient_id", "hearing_date"))
+
+    owed = defaultdict(dict)   # recipient id -> {case id: hearing}; one person in two roles is told once
+    for case in cases:
+        hearing = {
+            "case_id": case["id"], "case_no": case["case_no"], "case_title": case["case_title"],
+            "court": ", ".join(filter(None, (case["court_name"], case["court_city"]))),
+            "date": case["next_hearing_date"],
+        }
+        for role_field in RECIPIENT_FIELDS:
+            user = users.get(case[role_field])
+            if user is None or not _may_receive(user, role_field, case):
+                continue
+            if (case["id"], user.pk, hearing["date"]) not in sent:
+                owed[user.pk][case["id"]] = hearing
+    return [Reminder(users[pk], list(hearings.values())) for pk, hearings in owed.items()]
+
+
+def render(reminders):
+    """EmailMessages for a batch of reminders, in the same order."""
+    messages = []
+    for reminder in reminders:
+        user = reminder.recipient
+        context = Context({"name": user.get_full_name() or user.username, "hearings": reminder.hearings})
+        messages.append(EmailMessage(
+            subject=SUBJECT.render(context).strip(),
+            body=BODY.render(context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        ))
+    return messages
+
+
+class ConnectionPool:
+    """A fixed set of mail backend connections, each opened once and reused for many messages."""
+
+    def __init__(self, size):
+        self._idle = queue.Queue()
+        self._all = [get_connection(fail_silently=False) for _ in range(size)]
+        for connection in self._all:
+            self._idle.put(connection)
+
+    def send(self, messages, retries):
+        """Send each message, reconnecting and retrying on failure. Returns a sent flag per message."""
+        connection = self._idle.get()
+        try:
+            delivered = []
+            for message in messages:
+                ok = self._send_one(connection, message, retries)
+                if ok is None:   # the server stayed unreachable; don't spend retries on the rest
+                    return delivered + [False] * (len(messages) - len(delivered))
+                delivered.append(ok)
+            return delivered
+        finally:
+            self._idle.put(connection)
+
+    @staticmethod
+    def _send_one(connection, message, retries):
+        """True if sent, False if this message was rejected, None if every attempt failed."""
+        for attempt in range(retries + 1):
+            try:
+                connection.open()   # no-op while already open
+                return connection.send_messages([message]) == 1
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as exc:
+                logger.warning("Reminder to %s rejected: %s", message.to, exc)
+                return False   # the server answered; retrying this message won't help
+            except (smtplib.SMTPException, OSError) as exc:
+                logger.warning("Reminder to %s failed (attempt %d): %s", message.to, attempt + 1, exc)
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+                if attempt < retries:
+                    time.sleep(min(2 ** attempt, 10))
+        return None
+
+    def close(self):
+        for connection in self._all:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+def send_reminders(reminders, connections=None, batch_size=None, retries=None):
+    """Send reminders over a connection pool and record each delivered one in the ledger. Returns (sent, failed)."""
+    connections = connections or settings.HEARING_REMINDER_CONNECTIONS
+    batch_size = batch_size or settings.HEARING_REMINDER_BATCH_SIZE
+    retries = settings.HEARING_REMINDER_RETRIES if retries is None else retries
+    batches = [reminders[i:i + batch_size] for i in range(0, len(reminders), batch_size)]
+    sent = failed = 0
+    pool = ConnectionPool(min(connections, len(batches)) or 1)
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = {executor.submit(pool.send, render(batch), retries): batch for batch in batches}
+            for future in as_completed(futures):
+                batch, delivered = futures[future], future.result()
+                HearingReminder.objects.bulk_create(
+                    [row for reminder, ok in zip(batch, delivered) if ok for row in reminder.ledger_rows()],
+                    ignore_conflicts=True,
+                )
+                sent += sum(delivered)
+                failed += len(delivered) - sum(delivered)
+    finally:
+        pool.close()
+    return sent, failed
@@ -0,0 +1,227 @@
+"""
+Hearing double-booking detection for judges and advocates.
+
+HearingIndex keeps, per participant, a sorted list of (date, case_id) for
+every upcoming hearing they are on: the case's next_hearing_date and the
+next_date of its hearing notes. "Does anyone on this case already have
+another case that day?" is then a bisect per participant rather than a scan
+of the case table, and a date-range report is one slice per participant.
+
+Like every CaseIndex (see cases/indexing.py), each process keeps its own
+copy, built when the worker boots. Signals keep it current (see
+cases/signals.py), and at most every CASE_INDEX_CATCH_UP_SECONDS a check
+first catches up on other processes' writes; otherwise a check is pure
+in-memory bisects. Hearing notes are followed as well as cases.
+
+Dates before today are not indexed.
+"""
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from accounts.models import User
+from .indexing import CaseIndex
+from .models import Case, HearingNote
+
+PARTICIPANT_FIELDS = ("judge", "client_advocate", "opposition_advocate")
+
+
+class _CaseEntry:
+    __slots__ = ("participants", "hearing", "notes")
+
+    def __init__(self, participants=(), hearing=None):
+        self.participants = participants
+        self.hearing = hearing
+        self.notes = {}   # note id -> next_date
+
+    def bookings(self, horizon):
+        dates = {d for d in (self.hearing, *self.notes.values()) if d is not None and d >= horizon}
+        return {(user_id, d) for user_id in self.participants for d in dates}
+
+
+class HearingIndex(CaseIndex):
+    tombstone_kinds = ("case", "hearing_note")
+
+    def _reset(self):
+        self._cases = {}                         # case id -> _CaseEntry
+        self._by_user = defaultdict(list)        # participant id -> sorted [(date, case id)]
+        self._horizon = timezone.localdate()
+
+    # ── Loading ──────────────────────────────────────────────────────────────
+
+    def _stale(self):
+        # Rebuilt once a day too, so the horizon moves forward
+        return not self._built or self._horizon != timezone.localdate()
+
+    def _initial_case_ids(self):
+        return set(
+            Case.all_firms.filter(next_hearing_date__gte=self._horizon).values_list("id", flat=True)
+        ) | set(
+            HearingNote.objects.filter(next_date__gte=self._horizon).values_list("case_id", flat=True)
+        )
+
+    def _changed_since(self, since):
+        changed = super()._changed_since(since)
+        return changed | set(HearingNote.objects.filter(updated_at__gt=since).values_list("case_id", flat=True))
+
+    def _load(self, case_ids):
+        case_ids = list(case_ids)
+        entries = {}
+        for start in range(0, len(case_ids), 500):
+            chunk = case_ids[start:start + 500]
+            for row in Case.all_firms.filter(id__in=chunk).values_list("id", "next_hearing_date", *PARTICIPANT_FIELDS):
+                entries[row[0]] = _CaseEntry(_participants(row[2:]), row[1])
+            notes = HearingNote.objects.filter(case_id__in=chunk, next_date__gte=self._horizon)
+            for note_id, case_id, next_date in notes.values_list("id", "case_id", "next_date"):
+                if case_id in entries:
+                    entries[case_id].notes[note_id] = next_date
+        for case_id in case_ids:
+            self._replace(case_id, entries.get(case_id))
+
+    def _replace(self, case_id, entry):
+        old = self._cases.pop(case_id, None)
+        before = old.bookings(self._horizon) if old else set()
+        after = entry.bookings(self._horizon) if entry else set()
+        for user_id, day in before - after:
+            bookings = self._by_user[user_id]
+            i = bisect_left(bookings, (day, case_id))
+            if i < len(bookings) and bookings[i] == (day, case_id):
+                del bookings[i]
+            if not bookings:
+                del self._by_user[user_id]
+        for user_id, day in after - before:
+            insort(self._by_user[user_id], (day, case_id))
+        if entry is not None and (entry.hearing is not None or entry.notes):
+            self._cases[case_id] = entry
+
+    # ── Signal hooks ─────────────────────────────────────────────────────────
+
+    def case_saved(self, case):
+        with self._lock:
+            if self._built:
+                entry = _CaseEntry(_participants(getattr(case, f"{f}_id") for f in PARTICIPANT_FIELDS),
+                                   _as_date(case.next_hearing_date))
+                old = self._cases.get(case.pk)
+                if old is not None:
+                    entry.notes = dict(old.notes)
+                self._replace(case.pk, entry)
+
+    def case_deleted(self, case_id):
+        with self._lock:
+            if self._built:
+                self._replace(case_id, None)
+
+    def note_saved(self, note):
+        self._note_changed(note.case_id, note.pk, _as_date(note.next_date))
+
+    def note_deleted(self, note):
+        self._note_changed(note.case_id, note.pk, None)
+
+    def _note_changed(self, case_id, note_id, next_date):
+        with self._lock:
+            if not self._built:
+                return
+            old = self._cases.get(case_id)
+            if old is None:
+                if next_date is None or next_date < self._horizon:
+                    return
+                self._load([case_id])   # first upcoming date for this case: need its participants
+                return
+            entry = _CaseEntry(old.participants, old.hearing)
+            entry.notes = {k: v for k, v in old.notes.items() if k != note_id}
+            if next_date is not None and next_date >= self._horizon:
+                entry.notes[note_id] = next_date
+            self._replace(case_id, entry)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+
+    def conflicts(self, participant_ids, day, exclude_case=None):
+        """[(participant id, other case id)] already booked on `day`."""
+        with self._lock:
+            self._refresh()
+            return self._conflicts(participant_ids, day, exclude_case)
+
+    def _conflicts(self, participant_ids, day, exclude_case):
+        found = []
+        for user_id in set(participant_ids):
+            if user_id is None:
+                continue
+            bookings = self._by_user.get(user_id, ())
+            lo = bisect_left(bookings, (day,))
+            hi = bisect_right(bookings, (day, float("inf")))
+            found.extend((user_id, case_id) for _, case_id in bookings[lo:hi] if case_id != exclude_case)
+        return found
+
+    def conflicts_in_range(self, start, end):
+        """[(participant id, date, [case ids])] for every day in [start, end] with 2+ cases."""
+        with self._lock:
+            self._refresh()
+            report = []
+            for user_id, bookings in self._by_user.items():
+                lo = bisect_left(bookings, (start,))
+                hi = bisect_right(bookings, (end, float("inf")))
+                by_day = defaultdict(list)
+                for day, case_id in bookings[lo:hi]:
+                    by_day[day].append(case_id)
+                report.extend((user_id, day, ids) for day, ids in by_day.items() if len(ids) > 1)
+            return sorted(report, key=lambda row: (row[1], row[0]))
+
+    def check(self, participant_ids, day, exclude_case=None):
+        """Raise HearingConflict if any participant is already booked elsewhere on `day`."""
+        if day is None:
+            return
+        found = self.conflicts(participant_ids, day, exclude_case)
+        if found:
+            by_user = defaultdict(list)
+            for user_id, case_id in found:
+                by_user[user_id].append(case_id)
+            raise HearingConflict(describe([(user_id, day, ids) for user_id, ids in by_user.items()]))
+
+
+class HearingConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A participant already has a hearing in another case that day."
+    default_code = "hearing_conflict"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        # Kept as plain data (APIException would stringify the ids and dates)
+        self.detail = {"detail": self.default_detail, "conflicts": conflicts}
+
+
+def describe(rows):
+    """Expand (participant id, date, [case ids]) rows with names and case numbers."""
+    user_ids = {row[0] for row in rows}
+    case_ids = {case_id for row in rows for case_id in row[2]}
+    users = {u.pk: u for u in User.objects.filter(pk__in=user_ids)}
+    cases = Case.objects.in_bulk(case_ids)
+    return [
+        {
+            "participant": user_id,
+            "participant_name": (users[user_id].get_full_name() or users[user_id].username)
+            if user_id in users else None,
+            "role": users[user_id].role if user_id in users else None,
+            "date": day,
+            "cases": [
+                {"id": pk, "case_no": cases[pk].case_no, "case_title": cases[pk].case_title}
+                for pk in ids if pk in cases
+            ],
+        }
+        for user_id, day, ids in rows
+    ]
+
+
+def _participants(ids):
+    return tuple(sorted({i for i in ids if i is not None}))
+
+
+def _as_date(value):
+    # Saves through the ORM may still hold the raw "YYYY-MM-DD" string
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+hearing_index = HearingIndex()
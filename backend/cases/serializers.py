@@ -1,5 +1,6 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Case, HearingNote, CaseComment
+from .models import Case, CaseEvent, HearingNote, CaseComment
 from accounts.serializers import UserSerializer
 
 
@@ -44,6 +45,19 @@ class CaseCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class CaseEventSerializer(serializers.ModelSerializer):
+    actor_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CaseEvent
+        fields = ["id", "kind", "data", "actor", "actor_name", "created_at"]
+
+    def get_actor_name(self, obj):
+        if obj.actor:
+            return obj.actor.get_full_name() or obj.actor.username
+        return None
+
+
 class CaseListSerializer(serializers.ModelSerializer):
     client_name = serializers.SerializerMethodField()
     advocate_name = serializers.SerializerMethodField()
@@ -82,13 +96,25 @@ class CaseDetailSerializer(serializers.ModelSerializer):
     advocate_name = serializers.SerializerMethodField()
     judge_name = serializers.SerializerMethodField()
     opposition_advocate_name = serializers.SerializerMethodField()
-    hearing_notes = HearingNoteSerializer(many=True, read_only=True)
-    comments = CaseCommentSerializer(many=True, read_only=True)
+    # Only the newest CASE_DETAIL_EMBED_LIMIT of each; page the rest from the child endpoints
+    hearing_notes = serializers.SerializerMethodField()
+    hearing_note_count = serializers.SerializerMethodField()
+    comments = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
     documents = serializers.SerializerMethodField()
 
     class Meta:
         model = Case
-        fields = "__all__"
+        exclude = ["tag_set", "firm"]   # firm comes from the request, see accounts/tenancy.py
+
+    def validate_case_no(self, value):
+        # Unique per firm (case_firm_case_no_uniq); the manager already scopes to this firm
+        others = Case.objects.filter(case_no=value)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        if others.exists():
+            raise serializers.ValidationError("case with this case no already exists.")
+        return value
 
     def get_client_name(self, obj):
         return obj.client.get_full_name() or obj.client.username if obj.client else "—"
@@ -108,11 +134,35 @@ class CaseDetailSerializer(serializers.ModelSerializer):
             return obj.opposition_advocate.get_full_name() or obj.opposition_advocate.username
         return None
 
+    def get_hearing_notes(self, obj):
+        notes = obj.hearing_notes.select_related("added_by").order_by("-hearing_date", "-id")
+        return HearingNoteSerializer(notes[:settings.CASE_DETAIL_EMBED_LIMIT], many=True).data
+
+    def get_hearing_note_count(self, obj):
+        count = getattr(obj, "hearing_note_count", None)
+        return obj.hearing_notes.count() if count is None else count
+
+    def get_comments(self, obj):
+        comments = obj.comments.select_related("author").order_by("-created_at", "-id")
+        return CaseCommentSerializer(comments[:settings.CASE_DETAIL_EMBED_LIMIT], many=True).data
+
+    def get_comment_count(self, obj):
+        count = getattr(obj, "comment_count", None)
+        return obj.comments.count() if count is None else count
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if not request or request.user.role not in ("admin", "advocate"):
+            # Internal comments: same rule as CaseViewSet.comments
+            del fields["comments"], fields["comment_count"]
+        return fields
+
     def get_documents(self, obj):
         from documents.serializers import DocumentSerializer
         request = self.context.get("request")
         user = request.user if request else None
         docs = obj.documents.all()
         if user and user.role == "client":
-            docs = docs.filter(is_visible_to_client=True)
+            docs = [doc for doc in docs if doc.is_visible_to_client]  # keeps the prefetch
         return DocumentSerializer(docs, many=True, context=self.context).data
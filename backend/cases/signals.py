@@ -0,0 +1,161 @@
+# cases/signals.py
+"""
+Turn case-related saves into events for the case stream (see cases/events.py),
+deletions or lost access into Tombstone rows for /api/cases/changes/, and
+updates to the in-memory hearing and relationship indexes (see
+cases/scheduling.py and cases/relationships.py).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from documents.models import Document
+from .events import audience_for_case, publish
+from .models import Case, HearingNote, CaseComment, Tombstone
+from .relationships import relationship_graph
+from .scheduling import hearing_index
+
+CASE_EVENT_FIELDS = ("status", "progress", "next_hearing_date", "is_visible_to_client")
+STAFF_ROLES = ["admin", "advocate"]
+
+
+PARTICIPANT_FIELDS = ("firm", "client", "judge", "client_advocate", "opposition_advocate", "is_visible_to_client")
+
+
+def _case_for(instance):
+    # Only the columns the audience needs; avoids loading the whole case per child save
+    return Case.all_firms.only(*PARTICIPANT_FIELDS).get(pk=instance.case_id)
+
+
+def _tombstone(kind, object_id, case, **extra):
+    fields = dict(
+        kind=kind, object_id=object_id, case_id=case.pk,
+        client_id=case.client_id, client_visible=case.is_visible_to_client,
+        client_advocate_id=case.client_advocate_id,
+        opposition_advocate_id=case.opposition_advocate_id,
+        judge_id=case.judge_id, firm_id=case.firm_id,
+    )
+    return Tombstone(**{**fields, **extra})
+
+
+@receiver(post_save, sender=Case)
+def case_saved(sender, instance, created, **kwargs):
+    data = {field: getattr(instance, field) for field in (*CASE_EVENT_FIELDS, "updated_at")}
+    publish("case.created" if created else "case.updated", instance.pk, data,
+            audience_for_case(instance))
+
+
+@receiver(post_save, sender=HearingNote)
+def hearing_note_saved(sender, instance, created, **kwargs):
+    publish("note.created" if created else "note.updated", instance.case_id, {
+        "id": instance.pk,
+        "hearing_date": instance.hearing_date,
+        "next_date": instance.next_date,
+    }, audience_for_case(_case_for(instance)))
+
+
+@receiver(post_save, sender=CaseComment)
+def comment_saved(sender, instance, created, **kwargs):
+    # Internal comments: never sent to clients or judges, matching the comments endpoint
+    publish("comment.created" if created else "comment.updated", instance.case_id,
+            {"id": instance.pk, "author": instance.author_id},
+            audience_for_case(_case_for(instance), client_visible=False, roles=STAFF_ROLES))
+
+
+@receiver(post_save, sender=Document)
+def document_saved(sender, instance, created, **kwargs):
+    publish("document.created" if created else "document.updated", instance.case_id,
+            {"id": instance.pk, "title": instance.title, "side": instance.side},
+            audience_for_case(_case_for(instance), client_visible=instance.is_visible_to_client))
+
+
+# ── Tombstones ───────────────────────────────────────────────────────────────
+
+@receiver(pre_save, sender=Case)
+def case_access_revoked(sender, instance, raw=False, **kwargs):
+    """Participants dropped from a case (or a client losing visibility) see it as deleted."""
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    old = Case.all_firms.filter(pk=instance.pk).only(*PARTICIPANT_FIELDS).first()
+    if old is None:
+        return
+    lost = {
+        "client_id": old.client_id if old.is_visible_to_client and (
+            not instance.is_visible_to_client or instance.client_id != old.client_id
+        ) else None,
+        "judge_id": old.judge_id if old.judge_id != instance.judge_id else None,
+        "client_advocate_id": old.client_advocate_id
+        if old.client_advocate_id not in (instance.client_advocate_id, instance.opposition_advocate_id) else None,
+        "opposition_advocate_id": old.opposition_advocate_id
+        if old.opposition_advocate_id not in (instance.client_advocate_id, instance.opposition_advocate_id) else None,
+    }
+    if any(lost.values()):
+        Tombstone.objects.create(kind="case", object_id=instance.pk, case_id=instance.pk,
+                                 firm_id=instance.firm_id, revoked=True, **lost)
+
+
+@receiver(pre_save, sender=Document)
+def document_hidden_from_client(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.pk is None or instance.is_visible_to_client:
+        return
+    if Document.all_firms.filter(pk=instance.pk, is_visible_to_client=True).exists():
+        case = _case_for(instance)
+        Tombstone.objects.create(kind="document", object_id=instance.pk, case_id=case.pk,
+                                 client_id=case.client_id, firm_id=case.firm_id, revoked=True)
+
+
+@receiver(post_delete, sender=Case)
+def case_deleted(sender, instance, **kwargs):
+    _tombstone("case", instance.pk, instance).save()
+
+
+@receiver(post_delete, sender=HearingNote)
+def hearing_note_deleted(sender, instance, **kwargs):
+    case = Case.all_firms.only(*PARTICIPANT_FIELDS).filter(pk=instance.case_id).first()
+    if case is not None:  # already gone only after a raw delete; nothing left to scope by
+        _tombstone("hearing_note", instance.pk, case).save()
+
+
+@receiver(post_delete, sender=CaseComment)
+def comment_deleted(sender, instance, **kwargs):
+    case = Case.all_firms.only(*PARTICIPANT_FIELDS).filter(pk=instance.case_id).first()
+    if case is not None:
+        _tombstone("comment", instance.pk, case, internal=True).save()
+
+
+@receiver(post_delete, sender=Document)
+def document_deleted(sender, instance, **kwargs):
+    case = Case.all_firms.only(*PARTICIPANT_FIELDS).filter(pk=instance.case_id).first()
+    if case is not None:
+        _tombstone("document", instance.pk, case,
+                   client_visible=case.is_visible_to_client and instance.is_visible_to_client).save()
+
+
+# ── In-memory indexes ────────────────────────────────────────────────────────
+
+@receiver(post_save, sender=Case)
+def index_case(sender, instance, **kwargs):
+    def apply():
+        hearing_index.case_saved(instance)
+        relationship_graph.case_saved(instance)
+    transaction.on_commit(apply)
+
+
+@receiver(post_delete, sender=Case)
+def unindex_case(sender, instance, **kwargs):
+    case_id = instance.pk
+
+    def apply():
+        hearing_index.case_deleted(case_id)
+        relationship_graph.case_deleted(case_id)
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=HearingNote)
+def index_note_hearing(sender, instance, **kwargs):
+    transaction.on_commit(lambda: hearing_index.note_saved(instance))
+
+
+@receiver(post_delete, sender=HearingNote)
+def unindex_note_hearing(sender, instance, **kwargs):
+    transaction.on_commit(lambda: hearing_index.note_deleted(instance))
@@ -0,0 +1,110 @@
+# cases/stream.py
+"""
+GET /api/cases/stream/ — Server-Sent Events for cases in the caller's scope.
+
+EventSource can't send an Authorization header, so the access token may also
+be passed as ?token=. Each stream sends a heartbeat comment every
+CASE_STREAM_HEARTBEAT_SECONDS and closes after CASE_STREAM_MAX_SECONDS; the
+browser then reconnects with Last-Event-ID and picks up where it left off.
+
+Under WSGI every open stream occupies a worker thread; serve through
+casebox.asgi for many concurrent listeners.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import resolve_firm
+from accounts.permissions import IsApprovedClient
+from .events import can_receive, get_backend, hub
+
+RETRY_MS = 3000
+
+
+def _authenticate(request):
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw = auth.get_raw_token(header) if header else request.GET.get("token", "").encode() or None
+    if raw is None:
+        return None
+    token = auth.get_validated_token(raw)
+    user = auth.get_user(token)
+    resolve_firm(user, token)
+    return user
+
+
+def _format(event):
+    payload = {"type": event["type"], "case": event["case"], "data": event["data"]}
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _chunks(user, last_id):
+    """(text, last_id) pairs for whatever is waiting in the hub right now."""
+    events = hub.since(last_id)
+    if events is None:
+        last_id = hub.latest_id
+        return [f"id: {last_id}\nevent: reset\ndata: {{}}\n\n"], last_id
+    chunks = []
+    for event in events:
+        last_id = max(last_id, event["id"])
+        if can_receive(user, event):
+            chunks.append(_format(event))
+    return chunks, last_id
+
+
+def _stream(user, last_id):
+    deadline = time.monotonic() + settings.CASE_STREAM_MAX_SECONDS
+    yield f"retry: {RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        chunks, last_id = _chunks(user, last_id)
+        if chunks:
+            yield "".join(chunks)
+            continue
+        hub.wait(last_id, settings.CASE_STREAM_HEARTBEAT_SECONDS)
+        if hub.latest_id <= last_id:
+            yield ": ping\n\n"
+
+
+async def _astream(user, last_id):
+    deadline = time.monotonic() + settings.CASE_STREAM_MAX_SECONDS
+    yield f"retry: {RETRY_MS}\n\n"
+    while time.monotonic() < deadline:
+        chunks, last_id = _chunks(user, last_id)
+        if chunks:
+            yield "".join(chunks)
+            continue
+        await hub.await_new(last_id, settings.CASE_STREAM_HEARTBEAT_SECONDS)
+        if hub.latest_id <= last_id:
+            yield ": ping\n\n"
+
+
+def case_stream(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    try:
+        user = _authenticate(request)
+    except AuthenticationFailed as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=401)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if not user.can_access:
+        return JsonResponse({"detail": IsApprovedClient.message}, status=403)
+
+    get_backend().start()
+    raw_last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        last_id = int(raw_last_id) if raw_last_id else hub.latest_id
+    except ValueError:
+        last_id = hub.latest_id
+
+    # A sync iterator would be buffered to completion under ASGI (and vice versa)
+    stream = _astream if isinstance(request, ASGIRequest) else _stream
+    response = StreamingHttpResponse(stream(user, last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,43 @@
+"""HearingIndex warm-up and the rate-limited catch-up on other processes' writes."""
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from cases.models import Case
+from cases.scheduling import HearingIndex
+
+
+class HearingIndexTests(TestCase):
+    def setUp(self):
+        self.day = timezone.localdate() + timedelta(days=3)
+        self.judge = User.objects.create(username="judge", role="judge", is_approved=True)
+        self.client_user = User.objects.create(username="client", role="client", is_approved=True)
+        self.case = self._case("I/1")
+        self.index = HearingIndex()   # stands in for another worker's copy
+
+    def _case(self, case_no):
+        return Case.objects.create(case_no=case_no, case_title="t", court_name="c", client=self.client_user,
+                                   judge=self.judge, next_hearing_date=self.day)
+
+    def test_checks_after_warm_up_are_answered_from_memory(self):
+        self.index.warm()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(100):
+                found = self.index.conflicts([self.judge.pk], self.day)
+        self.assertEqual(found, [(self.judge.pk, self.case.pk)])
+        self.assertEqual(len(queries), 0)
+
+    def test_other_processes_writes_arrive_at_the_next_catch_up(self):
+        with override_settings(CASE_INDEX_CATCH_UP_SECONDS=3600):
+            self.index.warm()
+            other = self._case("I/2")   # this index isn't the one the signals update
+            self.assertEqual(len(self.index.conflicts([self.judge.pk], self.day)), 1)
+        # Past the catch-up interval (and the safety lag): the next check reloads changed cases
+        self.index._watermark -= timedelta(minutes=1)
+        with override_settings(CASE_INDEX_CATCH_UP_SECONDS=0):
+            found = self.index.conflicts([self.judge.pk], self.day)
+        self.assertEqual(sorted(found), [(self.judge.pk, self.case.pk), (self.judge.pk, other.pk)])
@@ -0,0 +1,137 @@
+"""send_reminders / send_hearing_reminders against a local aiosmtpd server."""
+import io
+import socket
+from datetime import timedelta
+from unittest import mock
+
+from aiosmtpd.controller import Controller
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Firm, User
+from cases.models import Case, HearingReminder
+from cases.reminders import due_reminders, send_reminders
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Inbox:
+    """aiosmtpd handler that keeps every message; drop_first closes that many connections at MAIL FROM."""
+
+    def __init__(self, drop_first=0):
+        self.messages = []
+        self.drop_first = drop_first
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self.drop_first:
+            self.drop_first -= 1
+            server.transport.close()
+            return "421 closing"
+        envelope.mail_from = address
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content.decode()))
+        return "250 OK"
+
+    def to(self, user):
+        return [content for recipients, content in self.messages if user.email in recipients]
+
+
+@mock.patch("cases.reminders.time.sleep")   # no real back-off between retries
+class HearingReminderTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.advocate = self._user("advocate", "advocate")
+        self.judge = self._user("judge", "judge")
+        self.first_client = self._user("first_client", "client")
+        self.second_client = self._user("second_client", "client")
+        self.first = self._case("H/1", self.first_client, days=1, judge=self.judge)
+        self.second = self._case("H/2", self.second_client, days=2)
+        self.firm_id = Firm.default_id()
+
+    def _user(self, username, role):
+        return User.objects.create(username=username, role=role, is_approved=True, email=f"{username}@example.com")
+
+    def _case(self, case_no, client, days, **participants):
+        return Case.objects.create(
+            case_no=case_no, case_title=f"Case {case_no}", court_name="High Court", client=client,
+            client_advocate=self.advocate, next_hearing_date=self.today + timedelta(days=days), **participants,
+        )
+
+    def _smtp(self, inbox):
+        port = _free_port()
+        controller = Controller(inbox, hostname="127.0.0.1", port=port)
+        controller.start()
+        self.addCleanup(controller.stop)
+        return self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=port, EMAIL_USE_TLS=False, EMAIL_TIMEOUT=5,
+        )
+
+    def _send(self, **kwargs):
+        reminders = due_reminders(self.firm_id, self.today, self.today + timedelta(days=2))
+        return send_reminders(reminders, **kwargs)
+
+    def _run_command(self):
+        call_command("send_hearing_reminders", "--days", "2", stdout=io.StringIO())
+
+    def test_one_grouped_message_per_recipient(self, _sleep):
+        inbox = Inbox()
+        with self._smtp(inbox):
+            sent, failed = self._send(connections=2, batch_size=1)
+        self.assertEqual((sent, failed), (4, 0))
+        self.assertEqual(len(inbox.messages), 4)
+        advocate_mail, = inbox.to(self.advocate)
+        self.assertIn("Reminder: 2 upcoming hearings", advocate_mail)
+        self.assertIn("H/1", advocate_mail)
+        self.assertIn("H/2", advocate_mail)
+        client_mail, = inbox.to(self.first_client)
+        self.assertIn("H/1", client_mail)
+        self.assertNotIn("H/2", client_mail)
+        self.assertEqual(len(inbox.to(self.judge)), 1)
+        self.assertEqual(HearingReminder.objects.count(), 5)   # one row per (case, recipient, date)
+
+    def test_rerun_sends_nothing_twice(self, _sleep):
+        inbox = Inbox()
+        with self._smtp(inbox):
+            self._run_command()
+            self._run_command()
+        self.assertEqual(len(inbox.messages), 4)
+
+    def test_moved_hearing_is_reminded_again(self, _sleep):
+        inbox = Inbox()
+        with self._smtp(inbox):
+            self._run_command()
+            Case.objects.filter(pk=self.first.pk).update(next_hearing_date=self.today + timedelta(days=2))
+            self._run_command()
+        self.assertEqual(len(inbox.to(self.first_client)), 2)
+        self.assertEqual(len(inbox.to(self.judge)), 2)
+        self.assertEqual(len(inbox.to(self.advocate)), 2)
+        self.assertEqual(len(inbox.to(self.second_client)), 1)
+        self.assertIn("H/1", inbox.to(self.advocate)[1])
+        self.assertNotIn("H/2", inbox.to(self.advocate)[1])
+
+    def test_dropped_connection_is_reopened_and_retried(self, _sleep):
+        inbox = Inbox(drop_first=2)
+        with self._smtp(inbox), self.assertLogs("casebox.reminders", "WARNING"):
+            sent, failed = self._send(connections=1, retries=3)
+        self.assertEqual((sent, failed), (4, 0))
+        self.assertEqual(len(inbox.messages), 4)
+        self.assertEqual(_sleep.call_count, 2)
+        self.assertEqual(HearingReminder.objects.count(), 5)
+
+    def test_unreachable_server_records_nothing(self, _sleep):
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1", EMAIL_PORT=_free_port(), EMAIL_USE_TLS=False, EMAIL_TIMEOUT=1,
+        ), self.assertLogs("casebox.reminders", "WARNING"):
+            sent, failed = self._send(connections=1, retries=1)
+        self.assertEqual((sent, failed), (0, 4))
+        self.assertEqual(_sleep.call_count, 1)   # gave up on the batch after one message's retries
+        self.assertFalse(HearingReminder.objects.exists())
@@ -0,0 +1,100 @@
+"""
+A case's history for /api/cases/{id}/timeline/, newest first.
+
+Case events (opened, status and progress changes), hearing notes, comments
+and document uploads each come from their own (case, time) index, read
+newest-first with a LIMIT of one page, and are combined with heapq.merge.
+A page therefore reads at most `limit + 1` rows per source, however long the
+history is.
+
+Entries are ordered by (time, source, id), and the cursor is that key for
+the last entry served. Each source resumes strictly after it, so entries
+sharing a timestamp are never skipped or repeated.
+"""
+import base64
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+
+from django.db.models import Q
+from django.utils import timezone
+
+from documents.serializers import DocumentSerializer
+from .models import CaseEvent, HearingNote, CaseComment
+from .serializers import CaseEventSerializer, HearingNoteSerializer, CaseCommentSerializer
+
+COMMENT_ROLES = ("admin", "advocate")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(key):
+    moment, rank, pk = key
+    raw = json.dumps({"t": moment.isoformat(), "s": rank, "i": pk}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        moment = datetime.fromisoformat(raw["t"])
+        key = (moment, int(raw["s"]), int(raw["i"]))
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor("Invalid cursor.")
+    if timezone.is_naive(moment):
+        raise InvalidCursor("Invalid cursor.")
+    return key
+
+
+def _sources(case, user, request):
+    """(entry type, queryset, time field, serializer) per source; the index is its rank in ties."""
+    comments = CaseComment.objects.filter(case=case).select_related("author")
+    if user.role not in COMMENT_ROLES:
+        comments = comments.none()
+    documents = case.documents.select_related("uploaded_by")
+    if user.role == "client":
+        documents = documents.filter(is_visible_to_client=True)
+    return [
+        ("event", CaseEvent.objects.filter(case=case).select_related("actor"), "created_at",
+         CaseEventSerializer()),
+        ("hearing_note", HearingNote.objects.filter(case=case).select_related("added_by"), "created_at",
+         HearingNoteSerializer()),
+        ("comment", comments, "created_at", CaseCommentSerializer()),
+        ("document", documents, "upload_date", DocumentSerializer(context={"request": request})),
+    ]
+
+
+def _read(queryset, field, rank, cursor, limit):
+    if cursor is not None:
+        moment, cursor_rank, cursor_pk = cursor
+        if rank < cursor_rank:    # ranks below the cursor's sort after it at equal times
+            queryset = queryset.filter(**{f"{field}__lte": moment})
+        elif rank > cursor_rank:
+            queryset = queryset.filter(**{f"{field}__lt": moment})
+        else:
+            queryset = queryset.filter(Q(**{f"{field}__lt": moment}) | Q(**{field: moment, "pk__lt": cursor_pk}))
+    for obj in queryset.order_by(f"-{field}", "-pk")[:limit].iterator():
+        yield (getattr(obj, field), rank, obj.pk), obj
+
+
+def case_timeline(case, request, cursor=None, limit=20):
+    """One page of timeline entries after `cursor`, plus the cursor for the next page (or None)."""
+    sources = _sources(case, request.user, request)
+    streams = [_read(qs, field, rank, cursor, limit + 1) for rank, (_, qs, field, _) in enumerate(sources)]
+    merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+    page = list(islice(merged, limit + 1))
+    for stream in streams:
+        stream.close()
+
+    has_more = len(page) > limit
+    page = page[:limit]
+    results = []
+    for (moment, rank, pk), obj in page:
+        kind, _, _, serializer = sources[rank]
+        results.append({"type": kind, "at": moment, "id": pk, "data": serializer.to_representation(obj)})
+    return results, encode_cursor(page[-1][0]) if has_more else None
@@ -1,8 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .stream import case_stream
 from .views import CaseViewSet
 
 router = DefaultRouter()
 router.register("", CaseViewSet, basename="case")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    # Before the router, whose detail route would otherwise take "stream" as a pk
+    path("stream/", case_stream, name="case-stream"),
+    path("", include(router.urls)),
+]
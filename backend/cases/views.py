@@ -2,85 +2,198 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q, Count
+from rest_framework.utils.urls import replace_query_param
+from django.db.models import Q, Count, Exists, OuterRef, Prefetch
+from django.conf import settings
+from django.http import Http404
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
+import re
 
-from .models import Case, HearingNote, CaseComment
+from .models import ArchivedCase, Case, CaseEvent, HearingNote, CaseComment, Tag, CaseTag
 from .serializers import (
     CaseListSerializer, CaseDetailSerializer,
     HearingNoteSerializer, CaseCommentSerializer,
 )
+from .pagination import HearingNotePagination, CommentPagination
+from .facets import parse_facets, cached_facet_counts
+from .changes import collect_changes, decode_token, InvalidToken, EPOCH
+from .timeline import case_timeline, decode_cursor, InvalidCursor
+from .scheduling import hearing_index, describe, PARTICIPANT_FIELDS
+from .relationships import relationship_graph, describe as describe_interests
+from .archive import restore_visible
+from documents.models import Document
 from accounts.permissions import IsAdmin, IsApprovedClient
+from casebox.coalesce import single_flight
+from casebox.db_router import stick_to_primary
+from casebox.instrumentation import phase
 from logs.utils import log_action
 
 
+def _has_tag(qs, names):
+    """Condition: the case carries any of `names`."""
+    if qs.model is ArchivedCase:
+        # Archived cases keep no CaseTag rows; match whole entries of the tags string
+        return Q(tags__iregex=r"(^|,)\s*(%s)\s*(,|$)" % "|".join(re.escape(name) for name in names))
+    return Exists(CaseTag.objects.filter(case=OuterRef("pk"), tag__name__in=names))
+
+
+def filter_cases(qs, params):
+    """
+    Apply the case list's search, status/type/priority and tag filters from
+    query params, to Case or ArchivedCase querysets.
+    """
+    q = params.get("search", "")
+    status_filter = params.get("status", "")
+    type_filter = params.get("case_type", "")
+    priority_filter = params.get("priority", "")
+    tag_names = Tag.parse(",".join(params.getlist("tag")))
+    tag_mode = params.get("tag_mode", "any")
+
+    if q:
+        qs = qs.filter(
+            Q(case_no__icontains=q) |
+            Q(case_title__icontains=q) |
+            Q(court_name__icontains=q) |
+            Q(tags__icontains=q)
+        )
+    if status_filter:
+        qs = qs.filter(status=status_filter)
+    if type_filter:
+        qs = qs.filter(case_type=type_filter)
+    if priority_filter:
+        qs = qs.filter(priority=priority_filter)
+    if tag_names:
+        # ?tag=a,b matches any of the tags; add ?tag_mode=all to require every tag
+        if tag_mode == "all":
+            for name in tag_names:
+                qs = qs.filter(_has_tag(qs, [name]))
+        else:
+            qs = qs.filter(_has_tag(qs, tag_names))
+    return qs
+
+
+def archived_matches(user, params):
+    """Rows for ?include_archived=1: archived cases matching the list filters, after the hot ones."""
+    archived = filter_cases(ArchivedCase.objects.visible_to(user), params)
+    # Opening one restores it (CaseViewSet.get_object, async case_detail)
+    return [{**row, "is_archived": True} for row in archived.values_list("summary", flat=True)]
+
+
 class CaseViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsApprovedClient]
     search_fields = ["case_no", "case_title", "court_name", "tags"]
     ordering_fields = ["created_at", "next_hearing_date", "status", "priority"]
 
     def get_serializer_class(self):
-        if self.action == "retrieve":
+        # Writes need the participant fields, which the list serializer doesn't carry
+        if self.action in ("retrieve", "create", "update", "partial_update"):
             return CaseDetailSerializer
         return CaseListSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        q = self.request.query_params.get("search", "")
-        status_filter = self.request.query_params.get("status", "")
-        type_filter = self.request.query_params.get("case_type", "")
-        priority_filter = self.request.query_params.get("priority", "")
-
-        if user.role == "admin":
-            qs = Case.objects.all()
-        elif user.role == "client":
-            qs = Case.objects.filter(client=user, is_visible_to_client=True)
-        elif user.role == "advocate":
-            qs = Case.objects.filter(
-                Q(client_advocate=user) | Q(opposition_advocate=user)
-            )
-        elif user.role == "judge":
-            qs = Case.objects.filter(judge=user)
-        else:
-            qs = Case.objects.none()
-
-        if q:
-            qs = qs.filter(
-                Q(case_no__icontains=q) |
-                Q(case_title__icontains=q) |
-                Q(court_name__icontains=q) |
-                Q(tags__icontains=q)
+        qs = filter_cases(Case.objects.visible_to(self.request.user), self.request.query_params)
+        qs = qs.select_related("client", "judge", "client_advocate", "opposition_advocate")
+        if self.action == "retrieve":
+            return qs.with_child_counts().prefetch_related(
+                Prefetch("documents", queryset=Document.objects.select_related("uploaded_by"))
             )
-        if status_filter:
-            qs = qs.filter(status=status_filter)
-        if type_filter:
-            qs = qs.filter(case_type=type_filter)
-        if priority_filter:
-            qs = qs.filter(priority=priority_filter)
+        if self.action == "list":
+            return qs.prefetch_related("documents")  # document_count
+        return qs
 
-        return qs.select_related(
-            "client", "judge", "client_advocate", "opposition_advocate"
-        ).prefetch_related("documents", "hearing_notes")
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Not in the hot table: restore it if it was archived and the caller may see it
+            try:
+                case_id = int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+            except (KeyError, ValueError):
+                raise Http404
+            if not restore_visible(self.request.user, case_id):
+                raise
+            stick_to_primary()   # a replica won't have the restored row yet
+            return super().get_object()
 
     def get_permissions(self):
         if self.action in ("create", "update", "partial_update", "destroy"):
             return [IsAdmin()]
-        return [IsAuthenticated(), IsApprovedClient()]
+        # Honours permission_classes=[IsAdmin] on the admin-only actions below
+        return super().get_permissions()
+
+    def _check_conflicts(self, serializer):
+        """
+        409 if the save would double-book the judge or an advocate, or put a
+        party in a conflict of interest, unless ?allow_conflicts=true.
+        """
+        if self.request.query_params.get("allow_conflicts") == "true":
+            return
+        instance, data = serializer.instance, serializer.validated_data
+        parties = ("client", *PARTICIPANT_FIELDS)
+        values = {
+            field: data.get(field, getattr(instance, field, None))
+            for field in ("next_hearing_date", *parties)
+        }
+        changed = {field for field in values if instance is None or values[field] != getattr(instance, field)}
+        exclude = instance.pk if instance else None
+        ids = {field: values[field].pk if values[field] is not None else None for field in parties}
+        if changed & set(parties):
+            relationship_graph.check(ids["client"], ids["client_advocate"], ids["opposition_advocate"],
+                                     ids["judge"], exclude_case=exclude)
+        if changed & {"next_hearing_date", *PARTICIPANT_FIELDS}:
+            hearing_index.check([ids[field] for field in PARTICIPANT_FIELDS], values["next_hearing_date"],
+                                exclude_case=exclude)
+
+    def perform_create(self, serializer):
+        self._check_conflicts(serializer)
+        case = serializer.save()
+        case.sync_tags()
+        CaseEvent.objects.create(case=case, kind="created", actor=self.request.user)
+
+    def perform_update(self, serializer):
+        self._check_conflicts(serializer)
+        before = {"status": serializer.instance.status, "progress": serializer.instance.progress}
+        case = serializer.save()
+        case.sync_tags()
+        CaseEvent.record_changes(case, before, self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        fields = parse_facets(request.query_params.get("facets"))
+        if fields:
+            # Counts share the list's role scope, search and filters
+            queryset = self.filter_queryset(self.get_queryset())
+            facets = cached_facet_counts(request, queryset, fields)
+            if isinstance(response.data, dict):
+                response.data["facets"] = facets
+            else:
+                response.data = {"results": response.data, "facets": facets}
+        if request.query_params.get("include_archived") == "1":
+            rows = archived_matches(request.user, request.query_params)
+            if isinstance(response.data, dict):
+                response.data["results"] = [*response.data["results"], *rows]
+            else:
+                response.data = [*response.data, *rows]
+        return response
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         log_action(request, "view_case", f"Viewed case {instance.case_no}")
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        with phase("serialize"):
+            # Every viewer is still checked and audited; only building the payload is shared.
+            # Saving the case changes updated_at, so a result never outlives an edit.
+            data = single_flight(request, lambda: self.get_serializer(instance).data, instance.updated_at)
+        return Response(data)
 
     # ── Hearing Notes ────────────────────────────────────────────────────────
     @action(detail=True, methods=["get", "post"], url_path="hearing-notes")
     def hearing_notes(self, request, pk=None):
         case = self.get_object()
         if request.method == "GET":
-            notes = case.hearing_notes.all()
-            return Response(HearingNoteSerializer(notes, many=True).data)
+            paginator = HearingNotePagination()
+            notes = paginator.paginate_queryset(case.hearing_notes.select_related("added_by"), request, view=self)
+            return paginator.get_paginated_response(HearingNoteSerializer(notes, many=True).data)
         if request.user.role not in ("admin", "advocate"):
             return Response({"detail": "Only admin or advocates can add hearing notes."}, status=403)
         serializer = HearingNoteSerializer(data=request.data, context={"request": request})
@@ -96,12 +209,34 @@ class CaseViewSet(viewsets.ModelViewSet):
         if request.user.role not in ("admin", "advocate"):
             return Response({"detail": "Not permitted."}, status=403)
         if request.method == "GET":
-            return Response(CaseCommentSerializer(case.comments.all(), many=True).data)
+            paginator = CommentPagination()
+            comments = paginator.paginate_queryset(case.comments.select_related("author"), request, view=self)
+            return paginator.get_paginated_response(CaseCommentSerializer(comments, many=True).data)
         serializer = CaseCommentSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
         serializer.save(case=case)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    # ── Timeline ─────────────────────────────────────────────────────────────
+    @action(detail=True, methods=["get"], url_path="timeline")
+    def timeline(self, request, pk=None):
+        """Events, hearing notes, comments and documents merged newest first, cursor-paginated."""
+        case = self.get_object()
+        try:
+            cursor = decode_cursor(request.query_params.get("cursor"))
+        except InvalidCursor as exc:
+            return Response({"detail": str(exc)}, status=400)
+        try:
+            limit = int(request.query_params.get("limit", settings.CASE_CHILD_PAGE_SIZE))
+        except ValueError:
+            limit = settings.CASE_CHILD_PAGE_SIZE
+        limit = max(1, min(limit, settings.CASE_CHILD_MAX_PAGE_SIZE))
+        results, next_cursor = case_timeline(case, request, cursor, limit)
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+        return Response({"next": next_url, "results": results})
+
     # ── Progress update ───────────────────────────────────────────────────────
     @action(detail=True, methods=["patch"], url_path="progress", permission_classes=[IsAdmin])
     def update_progress(self, request, pk=None):
@@ -112,8 +247,10 @@ class CaseViewSet(viewsets.ModelViewSet):
             return Response({"detail": "Progress must be a number 0–100."}, status=400)
         if not (0 <= progress <= 100):
             return Response({"detail": "Progress must be between 0 and 100."}, status=400)
+        before = {"progress": case.progress}
         case.progress = progress
         case.save()
+        CaseEvent.record_changes(case, before, request.user)
         log_action(request, "edit_case", f"Updated progress for {case.case_no} to {progress}%")
         return Response({"progress": case.progress})
 
@@ -125,9 +262,79 @@ class CaseViewSet(viewsets.ModelViewSet):
         case.save()
         return Response({"is_visible_to_client": case.is_visible_to_client})
 
+    # ── Tag facet counts ─────────────────────────────────────────────────────
+    @action(detail=False, methods=["get"], url_path="tags")
+    def tag_facets(self, request):
+        """Per-tag case counts over the caller's scoped (and filtered) case list."""
+        cases = self.filter_queryset(self.get_queryset())
+        counts = (
+            CaseTag.objects.filter(case__in=cases.values("pk"))
+            .values("tag__name")
+            .annotate(count=Count("case_id"))
+            .order_by("-count", "tag__name")
+        )
+        return Response([{"tag": row["tag__name"], "count": row["count"]} for row in counts])
+
+    # ── Delta sync ───────────────────────────────────────────────────────────
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Cases and children created, updated or deleted in the caller's scope since ?since=."""
+        try:
+            since = decode_token(request.query_params.get("since"))
+        except InvalidToken as exc:
+            return Response({"detail": str(exc)}, status=400)
+        retention = timedelta(days=settings.CASE_TOMBSTONE_RETENTION_DAYS)
+        # Only deletions depend on retention: older tombstones may already be pruned
+        if EPOCH < since["deleted"][0] < timezone.now() - retention:
+            return Response(
+                {"detail": "Sync token has expired; fetch everything again without ?since."},
+                status=status.HTTP_410_GONE,
+            )
+        try:
+            limit = min(int(request.query_params.get("limit", 500)), 1000)
+        except ValueError:
+            limit = 500
+        return Response(collect_changes(request, since, max(limit, 1)))
+
+    # ── Hearing conflicts (admin only) ───────────────────────────────────────
+    @action(detail=False, methods=["get"], url_path="conflicts", permission_classes=[IsAdmin])
+    def hearing_conflicts(self, request):
+        """Judges and advocates with hearings in more than one case on the same day."""
+        from accounts.models import User
+
+        today = timezone.localdate()
+        try:
+            start = date.fromisoformat(request.query_params.get("start", today.isoformat()))
+            end = date.fromisoformat(request.query_params.get("end", (today + timedelta(days=30)).isoformat()))
+        except ValueError:
+            return Response({"detail": "start and end must be YYYY-MM-DD."}, status=400)
+        if end < start or (end - start).days > 366:
+            return Response({"detail": "end must be after start and at most a year later."}, status=400)
+        # The index spans every firm; keep the rows for this firm's people
+        rows = hearing_index.conflicts_in_range(start, end)
+        own = set(User.objects.filter(pk__in={row[0] for row in rows}).values_list("pk", flat=True))
+        return Response(describe([row for row in rows if row[0] in own]))
+
+    # ── Conflicts of interest (admin only) ───────────────────────────────────
+    @action(detail=False, methods=["get"], url_path="conflicts-of-interest", permission_classes=[IsAdmin])
+    def conflicts_of_interest(self, request):
+        """Every open case (all with ?include_closed=1) whose parties conflict with another case."""
+        report = relationship_graph.scan(include_closed=request.query_params.get("include_closed") == "1")
+        cases = Case.objects.in_bulk(list(report))
+        return Response([
+            {
+                "case": {"id": pk, "case_no": cases[pk].case_no, "case_title": cases[pk].case_title},
+                "conflicts": describe_interests(found),
+            }
+            for pk, found in sorted(report.items()) if pk in cases
+        ])
+
     # ── Dashboard stats (admin only) ──────────────────────────────────────────
     @action(detail=False, methods=["get"], url_path="dashboard", permission_classes=[IsAdmin])
     def dashboard(self, request):
+        return Response(single_flight(request, self._dashboard_data))
+
+    def _dashboard_data(self):
         from accounts.models import User
 
         total_cases = Case.objects.count()
@@ -150,11 +357,11 @@ class CaseViewSet(viewsets.ModelViewSet):
         pending_clients = User.objects.filter(role="client", is_approved=False).count()
         total_users = User.objects.count()
 
-        return Response({
+        return {
             "total_cases": total_cases,
             "by_status": by_status,
             "by_type": by_type,
             "pending_clients": pending_clients,
             "total_users": total_users,
             "upcoming_hearings": CaseListSerializer(upcoming, many=True).data,
-        })
+        }
@@ -0,0 +1,82 @@
+# documents/async_views.py
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+
+from casebox.async_api import async_api_view, json_response
+from logs.utils import alog_action
+from . import s3
+from .models import Document
+from .serializers import DocumentSerializer
+from .views import visible_documents
+
+# Storage calls in flight at once per request, so a slow backend overlaps stats
+# without opening hundreds of threads
+STORAGE_CONCURRENCY = 16
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def file_sizes(documents):
+    """{document pk: size in bytes or None}, fetched concurrently from storage."""
+    gate = asyncio.Semaphore(STORAGE_CONCURRENCY)
+
+    async def size(doc):
+        if not doc.file:
+            return None
+        if doc.file_size is not None:
+            return doc.file_size
+        async with gate:
+            try:
+                return await sync_to_async(doc.file.storage.size, thread_sensitive=False)(doc.file.name)
+            except Exception:
+                return None
+
+    sizes = await asyncio.gather(*(size(doc) for doc in documents))
+    return {doc.pk: value for doc, value in zip(documents, sizes)}
+
+
+@async_api_view()
+async def document_list(request):
+    qs = visible_documents(request.user)
+    case_id = request.GET.get("case")
+    if case_id:
+        qs = qs.filter(case_id=case_id)
+    documents = [doc async for doc in qs.select_related("case", "uploaded_by")]
+
+    context = {"request": request, "file_sizes": await file_sizes(documents)}
+    return json_response(DocumentSerializer(documents, many=True, context=context).data)
+
+
+@async_api_view()
+async def document_download(request, pk):
+    try:
+        doc = await visible_documents(request.user).aget(pk=pk)
+    except (Document.DoesNotExist, ValueError):
+        return JsonResponse({"detail": "Not found."}, status=404)
+    if not doc.file:
+        return JsonResponse({"detail": "This document has no file."}, status=404)
+    await Document.amark_accessed(pk=doc.pk)
+    if s3.enabled():
+        await alog_action(request, "view_document", f"Downloaded document {doc.pk}")
+        filename = doc.file.name.rsplit("/", 1)[-1]
+        return HttpResponseRedirect(s3.download_url(doc.file.name, filename))
+
+    try:
+        handle = await sync_to_async(doc.file.storage.open, thread_sensitive=False)(doc.file.name, "rb")
+    except OSError:
+        return JsonResponse({"detail": "File is missing from storage."}, status=404)
+    await alog_action(request, "view_document", f"Downloaded document {doc.pk}")
+
+    async def chunks():
+        read = sync_to_async(handle.read, thread_sensitive=False)
+        try:
+            while chunk := await read(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await sync_to_async(handle.close, thread_sensitive=False)()
+
+    response = StreamingHttpResponse(chunks(), content_type="application/octet-stream")
+    filename = doc.file.name.rsplit("/", 1)[-1]
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
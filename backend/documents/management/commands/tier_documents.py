@@ -0,0 +1,65 @@
+"""
+Management command: python manage.py tier_documents
+
+Gzips document files uploaded more than DOCUMENT_COLD_AFTER_DAYS ago that
+nobody has viewed or downloaded for DOCUMENT_COLD_IDLE_DAYS into the cold
+tier (see documents/storage.py). Recent access is Document.last_accessed_at,
+kept up to date by the detail, download and signed file views. Needs
+DOCUMENT_TIERING=True. Run it nightly from cron.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from documents.models import Document
+from documents.storage import TieredStorage
+
+
+class Command(BaseCommand):
+    help = "Compress old, idle document files into the cold storage tier."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.DOCUMENT_COLD_AFTER_DAYS,
+                            help="Only files uploaded at least this many days ago.")
+        parser.add_argument("--idle-days", type=int, default=settings.DOCUMENT_COLD_IDLE_DAYS,
+                            help="Skip files viewed or downloaded within this many days.")
+        parser.add_argument("--limit", type=int, default=0, help="Stop after this many files (0 = no limit).")
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be moved.")
+
+    def handle(self, *args, **opts):
+        if not isinstance(default_storage, TieredStorage):
+            raise CommandError("Set DOCUMENT_TIERING=True so documents use documents.storage.TieredStorage.")
+
+        now = timezone.now()
+        candidates = (
+            Document.objects.filter(upload_date__lt=now - timedelta(days=opts["days"]))
+            .exclude(last_accessed_at__gte=now - timedelta(days=opts["idle_days"]))
+            .exclude(file="").order_by("upload_date").values_list("file", flat=True)
+        )
+        moved = before = after = 0
+        for name in candidates.iterator():
+            if default_storage.is_cold(name):
+                continue
+            if opts["dry_run"]:
+                self.stdout.write(f"  {name}")
+                moved += 1
+            else:
+                sizes = default_storage.freeze(name)
+                if sizes is None:   # missing from the hot tier too
+                    continue
+                moved += 1
+                before += sizes[0]
+                after += sizes[1]
+            if opts["limit"] and moved >= opts["limit"]:
+                break
+
+        if opts["dry_run"]:
+            self.stdout.write(f"{moved} files would be moved to the cold tier.")
+            return
+        saved = f" ({100 * (1 - after / before):.0f}% smaller)" if before else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Moved {moved} files to the cold tier: {before / 1e6:.1f} MB → {after / 1e6:.1f} MB{saved}."
+        ))
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_indexes'),
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-upload_date'], name='doc_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['case', '-upload_date'], name='doc_case_uploaded_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_visible_to_client', True)), fields=['case', '-upload_date'], name='doc_case_visible_idx'),
+        ),
+        # Drop the single-column FK indexes only once the composites that lead
+        # with the same column exist
+        migrations.AlterField(
+            model_name='document',
+            name='case',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='cases.case'),
+        ),
+    ]
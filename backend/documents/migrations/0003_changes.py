@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:56
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    """Existing documents were last changed when they were uploaded."""
+    apps.get_model("documents", "Document").objects.update(updated_at=F("upload_date"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['updated_at'], name='doc_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_changes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_default_firm(apps, schema_editor):
+    Firm = apps.get_model("accounts", "Firm")
+    Document = apps.get_model("documents", "Document")
+    Document.objects.filter(firm__isnull=True).update(firm=Firm.objects.get(slug="default"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_firm'),
+        ('documents', '0004_file_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RunPython(assign_default_firm, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0005_firm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RemoveIndex(
+            model_name='document',
+            name='doc_uploaded_idx',
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['firm', '-upload_date'], name='doc_uploaded_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-19 16:54
+
+import re
+
+from django.db import migrations, models
+
+ACCESS_DESCRIPTION = re.compile(r"^(?:Viewed|Downloaded) document (\d+)$")
+
+
+def backfill_from_audit_log(apps, schema_editor):
+    # Until now tier_documents read recent access out of view_document audit descriptions
+    AccessLog = apps.get_model("logs", "AccessLog")
+    Document = apps.get_model("documents", "Document")
+    latest = {}
+    entries = AccessLog.objects.filter(action="view_document").values_list("description", "timestamp")
+    for description, timestamp in entries.iterator():
+        match = ACCESS_DESCRIPTION.match(description)
+        if match:
+            pk = int(match.group(1))
+            latest[pk] = max(latest.get(pk, timestamp), timestamp)
+    for pk, timestamp in latest.items():
+        Document.objects.filter(pk=pk).update(last_accessed_at=timestamp)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_firm_required'),
+        ('logs', '0005_firm_required'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='last_accessed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['file'], name='doc_file_idx'),
+        ),
+        migrations.RunPython(backfill_from_audit_log, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,15 @@
 # documents/models.py
+from datetime import timedelta
+
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
+from django.utils import timezone
+from accounts.models import TenantModel
 from cases.models import Case
 
 
-class Document(models.Model):
+class Document(TenantModel):
     SIDE_CHOICES = (
         ("client", "Client"),
         ("opposition", "Opposition"),
@@ -12,7 +17,10 @@ class Document(models.Model):
         ("other", "Other"),
     )
 
-    case = models.ForeignKey(Case, related_name="documents", on_delete=models.CASCADE)
+    case = models.ForeignKey(
+        Case, related_name="documents", on_delete=models.CASCADE,
+        db_index=False,  # covered by doc_case_uploaded_idx
+    )
     title = models.CharField(max_length=255)
     file = models.FileField(upload_to="case_documents/%Y/%m/")
     uploaded_by = models.ForeignKey(
@@ -22,9 +30,48 @@ class Document(models.Model):
     description = models.TextField(blank=True)
     upload_date = models.DateTimeField(auto_now_add=True)
     is_visible_to_client = models.BooleanField(default=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)  # bytes; unset on older rows
+    updated_at = models.DateTimeField(auto_now=True)
+    # Last view or download, to the hour; tier_documents keeps recently used files hot
+    last_accessed_at = models.DateTimeField(null=True, blank=True)
+
+    ACCESS_RESOLUTION = timedelta(hours=1)
 
     class Meta:
         ordering = ["-upload_date"]
+        indexes = [
+            models.Index(fields=["firm", "-upload_date"], name="doc_uploaded_idx"),
+            models.Index(fields=["case", "-upload_date"], name="doc_case_uploaded_idx"),
+            # Client document lists only ever read visible rows
+            models.Index(
+                fields=["case", "-upload_date"], name="doc_case_visible_idx",
+                condition=Q(is_visible_to_client=True),
+            ),
+            models.Index(fields=["updated_at"], name="doc_updated_idx"),
+            models.Index(fields=["file"], name="doc_file_idx"),   # upload confirm looks documents up by key
+        ]
 
     def __str__(self):
         return f"{self.case.case_no} – {self.title}"
+
+    @classmethod
+    def _access_update(cls, lookup):
+        now = timezone.now()
+        # .update() leaves updated_at alone, so reads don't show up in the changes feed
+        return cls.all_firms.filter(**lookup).exclude(last_accessed_at__gte=now - cls.ACCESS_RESOLUTION), now
+
+    @classmethod
+    def mark_accessed(cls, **lookup):
+        """Record a view or download of the matching documents; at most one write per hour each."""
+        queryset, now = cls._access_update(lookup)
+        queryset.update(last_accessed_at=now)
+
+    @classmethod
+    async def amark_accessed(cls, **lookup):
+        queryset, now = cls._access_update(lookup)
+        await queryset.aupdate(last_accessed_at=now)
+
+    def save(self, *args, **kwargs):
+        if self.firm_id is None and self.case_id is not None:
+            self.firm_id = self.case.firm_id   # outside a request there's no current firm to take
+        super().save(*args, **kwargs)
@@ -0,0 +1,174 @@
+"""
+Document bytes in an S3-compatible bucket, moved by the browser rather than
+by Django.
+
+With DOCUMENT_S3_BUCKET set, an upload is three steps:
+
+1. POST /api/documents/uploads/ checks the caller may upload to the case
+   and returns a presigned POST form. Files larger than
+   DOCUMENT_S3_MULTIPART_THRESHOLD get presigned part URLs for a
+   multipart upload instead. Either way the response includes a signed
+   token naming the object key.
+2. The browser sends the file straight to the bucket.
+3. POST /api/documents/uploads/confirm/ finishes the multipart upload if
+   there was one, checks the object landed and is no larger than the size
+   signed into the token (deleting it otherwise), and creates the Document
+   row.
+
+Downloads go through /api/documents/<id>/download/, which applies the
+usual role rules and hands back a presigned GET that expires after
+DOCUMENT_S3_DOWNLOAD_EXPIRY_SECONDS.
+
+S3Storage is the default storage in this mode. Document.file keeps working
+for server-side jobs (archiving, seeding), and request handlers only ever
+issue URLs. Point DOCUMENT_S3_ENDPOINT_URL at MinIO or another local S3
+stand-in for development.
+"""
+import math
+import uuid
+
+import boto3
+from botocore.client import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import Storage
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.text import get_valid_filename
+
+TOKEN_SALT = "documents.s3.upload"
+_client = None
+
+
+def enabled():
+    return bool(settings.DOCUMENT_S3_BUCKET)
+
+
+def client():
+    global _client
+    if _client is None:
+        # boto3 clients are thread-safe; one per process is enough
+        _client = boto3.client(
+            "s3",
+            endpoint_url=settings.DOCUMENT_S3_ENDPOINT_URL or None,
+            region_name=settings.DOCUMENT_S3_REGION or None,
+            config=Config(signature_version="s3v4"),
+        )
+    return _client
+
+
+def _missing(exc):
+    return exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+@deconstructible
+class S3Storage(Storage):
+    """Document.file storage backed by the bucket; url() is a short-lived presigned GET."""
+
+    def _save(self, name, content):
+        content.seek(0)
+        client().upload_fileobj(content, settings.DOCUMENT_S3_BUCKET, name)
+        return name
+
+    def _open(self, name, mode="rb"):
+        try:
+            body = client().get_object(Bucket=settings.DOCUMENT_S3_BUCKET, Key=name)["Body"]
+        except ClientError as exc:
+            if _missing(exc):
+                raise FileNotFoundError(name) from exc
+            raise
+        return File(body, name=name)
+
+    def exists(self, name):
+        return head(name) is not None
+
+    def size(self, name):
+        size = head(name)
+        if size is None:
+            raise FileNotFoundError(name)
+        return size
+
+    def delete(self, name):
+        delete(name)
+
+    def url(self, name):
+        return download_url(name)
+
+
+def head(key):
+    """Object size in bytes, or None if there is no such object."""
+    try:
+        return client().head_object(Bucket=settings.DOCUMENT_S3_BUCKET, Key=key)["ContentLength"]
+    except ClientError as exc:
+        if _missing(exc):
+            return None
+        raise
+
+
+def delete(key):
+    client().delete_object(Bucket=settings.DOCUMENT_S3_BUCKET, Key=key)
+
+
+def new_key(filename):
+    # Same layout as Document.file's upload_to, plus a random segment so keys never collide
+    return f"case_documents/{timezone.now():%Y/%m}/{uuid.uuid4().hex}/{get_valid_filename(filename)}"
+
+
+def start_upload(key, content_type, size):
+    """Presigned POST (or multipart part URLs) for the browser to send `size` bytes to `key`."""
+    bucket, expiry = settings.DOCUMENT_S3_BUCKET, settings.DOCUMENT_S3_UPLOAD_EXPIRY_SECONDS
+    if size <= settings.DOCUMENT_S3_MULTIPART_THRESHOLD:
+        post = client().generate_presigned_post(
+            bucket, key,
+            Fields={"Content-Type": content_type},
+            Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, size]],
+            ExpiresIn=expiry,
+        )
+        return {"method": "post", "url": post["url"], "fields": post["fields"]}, None
+
+    upload_id = client().create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)["UploadId"]
+    part_size = settings.DOCUMENT_S3_PART_SIZE
+    parts = [
+        {
+            "part_number": number,
+            "url": client().generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": bucket, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=expiry,
+            ),
+        }
+        for number in range(1, math.ceil(size / part_size) + 1)
+    ]
+    return {"method": "multipart", "part_size": part_size, "parts": parts}, upload_id
+
+
+def finish_upload(key, upload_id, parts):
+    """Complete a multipart upload from the browser's [{"part_number", "etag"}] list."""
+    client().complete_multipart_upload(
+        Bucket=settings.DOCUMENT_S3_BUCKET, Key=key, UploadId=upload_id,
+        MultipartUpload={"Parts": [
+            {"PartNumber": int(part["part_number"]), "ETag": part["etag"]}
+            for part in sorted(parts, key=lambda part: int(part["part_number"]))
+        ]},
+    )
+
+
+def download_url(key, filename=None):
+    params = {"Bucket": settings.DOCUMENT_S3_BUCKET, "Key": key}
+    if filename:
+        params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+    return client().generate_presigned_url(
+        "get_object", Params=params, ExpiresIn=settings.DOCUMENT_S3_DOWNLOAD_EXPIRY_SECONDS,
+    )
+
+
+def sign_upload(**claims):
+    return signing.dumps(claims, salt=TOKEN_SALT)
+
+
+def read_upload(token):
+    """The claims of a token from start_upload; raises signing.BadSignature if forged or expired."""
+    # Multipart uploads may finish a little after their last part URL was issued
+    return signing.loads(token, salt=TOKEN_SALT, max_age=settings.DOCUMENT_S3_UPLOAD_EXPIRY_SECONDS + 600)
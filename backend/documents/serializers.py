@@ -1,5 +1,8 @@
 # documents/serializers.py
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from . import s3
 from .models import Document
 
 
@@ -26,10 +29,18 @@ class DocumentSerializer(serializers.ModelSerializer):
     def get_file_url(self, obj):
         request = self.context.get("request")
         if obj.file and request:
+            if s3.enabled() or settings.DOCUMENT_TIERING:
+                # Presigned GETs and signed links are short-lived, so hand out the role-checked endpoint that issues one
+                return request.build_absolute_uri(reverse("document-download", args=[obj.pk]))
             return request.build_absolute_uri(obj.file.url)
         return None
 
     def get_file_size(self, obj):
+        if obj.file_size is not None:
+            return obj.file_size
+        sizes = self.context.get("file_sizes")
+        if sizes is not None:  # looked up ahead of time by the async views
+            return sizes.get(obj.pk)
         try:
             return obj.file.size
         except Exception:
@@ -38,4 +49,6 @@ class DocumentSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context.get("request")
         validated_data["uploaded_by"] = request.user
+        if "file_size" not in validated_data and validated_data.get("file"):
+            validated_data["file_size"] = validated_data["file"].size
         return super().create(validated_data)
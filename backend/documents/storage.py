@@ -0,0 +1,157 @@
+"""
+Two-tier file storage for document uploads.
+
+New files land in the hot tier (MEDIA_ROOT) exactly as FileSystemStorage
+would put them. `manage.py tier_documents` later freezes old, idle files:
+each one is gzipped into DOCUMENT_COLD_ROOT under the same name plus ".gz"
+and the hot copy is removed. File names, and so Document.file, never
+change. Files are not served from MEDIA_URL in this mode (cold ones only
+exist compressed): documents/<id>/download/ checks the caller's access and
+hands out a short-lived signed link that streams the file through this
+storage (see sign_download below).
+
+Opening a cold file streams it through gzip into DOCUMENT_CACHE_ROOT and
+serves it from there. The cache is trimmed back to DOCUMENT_CACHE_MAX_BYTES
+by last access, so frequently read cold files stay decompressed. With
+DOCUMENT_CACHE_MAX_BYTES=0, reads stream straight out of gzip instead.
+"""
+import gzip
+import os
+import shutil
+import struct
+import threading
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils._os import safe_join
+
+COPY_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_SALT = "documents.storage.download"
+
+
+def sign_download(document_id):
+    return signing.dumps(document_id, salt=DOWNLOAD_SALT)
+
+
+def read_download(token):
+    """The document id a download link was issued for; raises signing.BadSignature if forged or expired."""
+    return signing.loads(token, salt=DOWNLOAD_SALT, max_age=settings.DOCUMENT_DOWNLOAD_EXPIRY_SECONDS)
+
+
+class TieredStorage(FileSystemStorage):
+    def __init__(self, cold_location=None, cache_location=None, cache_max_bytes=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cold_location = os.fspath(cold_location or settings.DOCUMENT_COLD_ROOT)
+        self.cache_location = os.fspath(cache_location or settings.DOCUMENT_CACHE_ROOT)
+        self.cache_max_bytes = settings.DOCUMENT_CACHE_MAX_BYTES if cache_max_bytes is None else cache_max_bytes
+        self._evict_lock = threading.Lock()
+
+    # ── Paths ────────────────────────────────────────────────────────────────
+
+    def cold_path(self, name):
+        return safe_join(self.cold_location, name + ".gz")
+
+    def cache_path(self, name):
+        return safe_join(self.cache_location, name)
+
+    def is_cold(self, name):
+        return not os.path.exists(self.path(name)) and os.path.exists(self.cold_path(name))
+
+    # ── Storage API ──────────────────────────────────────────────────────────
+
+    def exists(self, name):
+        # Also guards get_available_name, so uploads never reuse a cold file's name
+        return super().exists(name) or os.path.exists(self.cold_path(name))
+
+    def _open(self, name, mode="rb"):
+        try:
+            return super()._open(name, mode)
+        except FileNotFoundError:
+            if not os.path.exists(self.cold_path(name)) or mode not in ("r", "rb"):
+                raise
+        if self.cache_max_bytes <= 0:
+            return File(gzip.open(self.cold_path(name), "rb"), name=name)
+        return File(open(self._cached(name), "rb"), name=name)
+
+    def size(self, name):
+        if not self.is_cold(name):
+            return super().size(name)
+        try:
+            return os.path.getsize(self.cache_path(name))
+        except OSError:
+            pass
+        with open(self.cold_path(name), "rb") as fh:
+            # gzip's trailer records the uncompressed size (mod 2**32; uploads are far smaller)
+            fh.seek(-4, os.SEEK_END)
+            return struct.unpack("<I", fh.read(4))[0]
+
+    def delete(self, name):
+        super().delete(name)
+        for path in (self.cold_path(name), self.cache_path(name)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # ── Tiering ──────────────────────────────────────────────────────────────
+
+    def freeze(self, name):
+        """
+        Move a hot file into the cold tier, gzipped. Returns (bytes before,
+        bytes after), or None if the file isn't in the hot tier.
+        """
+        source = self.path(name)
+        if not os.path.exists(source):
+            return None
+        target = self.cold_path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{uuid.uuid4().hex}.tmp"
+        with open(source, "rb") as src, gzip.open(temp, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        os.replace(temp, target)
+        before = os.path.getsize(source)
+        os.remove(source)   # readers that already opened it keep their handle
+        return before, os.path.getsize(target)
+
+    def _cached(self, name):
+        """Path of the decompressed copy of a cold file in the cache, creating it if needed."""
+        path = self.cache_path(name)
+        try:
+            os.utime(path)   # mtime is the LRU clock
+            return path
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with gzip.open(self.cold_path(name), "rb") as src, open(temp, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+        os.replace(temp, path)
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep=None):
+        """Drop the least recently read cache files until the cache fits its budget."""
+        with self._evict_lock:
+            entries, total = [], 0
+            for root, _, files in os.walk(self.cache_location):
+                for filename in files:
+                    path = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            for _, size, path in sorted(entries):
+                if total <= self.cache_max_bytes:
+                    break
+                if path == keep or path.endswith(".tmp"):
+                    continue
+                try:
+                    os.remove(path)   # open handles keep reading; the next read re-inflates it
+                except FileNotFoundError:
+                    pass
+                total -= size
@@ -0,0 +1,132 @@
+"""Direct-to-bucket uploads and downloads (documents/s3.py) against moto's local S3."""
+import requests
+from django.test import TestCase, override_settings
+from moto import mock_aws
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from cases.models import Case
+from documents import s3
+from documents.models import Document
+
+BUCKET = "casebox-test"
+
+
+@override_settings(DOCUMENT_S3_BUCKET=BUCKET, DOCUMENT_S3_REGION="us-east-1", DOCUMENT_S3_ENDPOINT_URL="")
+class DirectUploadTests(TestCase):
+    def setUp(self):
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+        s3._client = None   # built inside the mock
+        self.addCleanup(setattr, s3, "_client", None)
+        s3.client().create_bucket(Bucket=BUCKET)
+
+        self.advocate = self._user("advocate", "advocate")
+        self.other_advocate = self._user("other_advocate", "advocate")
+        self.client_user = self._user("client", "client")
+        self.other_client = self._user("other_client", "client")
+        self.case = Case.objects.create(
+            case_no="S3/1", case_title="t", court_name="c",
+            client=self.client_user, client_advocate=self.advocate,
+        )
+
+    def _user(self, username, role):
+        return User.objects.create(username=username, role=role, is_approved=True)
+
+    def _api(self, user):
+        api = APIClient()
+        api.force_authenticate(user)
+        return api
+
+    def _start(self, user, content, **extra):
+        return self._api(user).post("/api/documents/uploads/", {
+            "case": self.case.pk, "filename": "order.pdf", "content_type": "application/pdf",
+            "size": len(content), **extra,
+        }, format="json")
+
+    def _send(self, upload, content):
+        """What the browser does with the start_upload response."""
+        if upload["method"] == "post":
+            response = requests.post(upload["url"], data=upload["fields"],
+                                     files={"file": ("order.pdf", content, "application/pdf")})
+            self.assertLess(response.status_code, 300)
+            return []
+        part = upload["parts"][0]
+        response = requests.put(part["url"], data=content)
+        self.assertEqual(response.status_code, 200)
+        return [{"part_number": part["part_number"], "etag": response.headers["ETag"]}]
+
+    def _upload(self, user, content):
+        started = self._start(user, content)
+        self.assertEqual(started.status_code, 201, started.data)
+        parts = self._send(started.data["upload"], content)
+        return started.data["token"], parts
+
+    def _confirm(self, user, token, parts=(), **fields):
+        return self._api(user).post("/api/documents/uploads/confirm/", {
+            "token": token, "parts": list(parts), "title": "Order", **fields,
+        }, format="json")
+
+    def test_start_upload_confirm_creates_document(self):
+        content = b"%PDF-1.4 order"
+        token, parts = self._upload(self.advocate, content)
+        response = self._confirm(self.advocate, token, parts)
+        self.assertEqual(response.status_code, 201, response.data)
+        document = Document.objects.get(pk=response.data["id"])
+        self.assertEqual(document.case, self.case)
+        self.assertEqual(document.uploaded_by, self.advocate)
+        self.assertEqual(document.file_size, len(content))
+        # A retried confirm returns the same document instead of a second row
+        self.assertEqual(self._confirm(self.advocate, token, parts).data["id"], document.pk)
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_confirm_before_upload_is_rejected(self):
+        token = self._start(self.advocate, b"12345").data["token"]
+        self.assertEqual(self._confirm(self.advocate, token).status_code, 400)
+        self.assertFalse(Document.objects.exists())
+
+    def test_token_reused_by_another_user_is_rejected(self):
+        token, parts = self._upload(self.advocate, b"%PDF-1.4 order")
+        response = self._confirm(self.other_advocate, token, parts)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Document.objects.exists())
+
+    def test_only_admins_and_advocates_may_start_uploads(self):
+        self.assertEqual(self._start(self.client_user, b"12345").status_code, 403)
+        # An advocate who isn't on the case can't see it
+        self.assertEqual(self._start(self.other_advocate, b"12345").status_code, 404)
+
+    @override_settings(DOCUMENT_S3_MULTIPART_THRESHOLD=1)
+    def test_multipart_upload_larger_than_declared_is_deleted(self):
+        started = self._start(self.advocate, b"12345")
+        self.assertEqual(started.data["upload"]["method"], "multipart")
+        parts = self._send(started.data["upload"], b"12345" * 100)
+        response = self._confirm(self.advocate, started.data["token"], parts)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Document.objects.exists())
+        self.assertIsNone(s3.head(s3.read_upload(started.data["token"])["key"]))
+
+    @override_settings(DOCUMENT_S3_MULTIPART_THRESHOLD=1)
+    def test_multipart_upload_within_declared_size(self):
+        content = b"%PDF-1.4 order"
+        token, parts = self._upload(self.advocate, content)
+        response = self._confirm(self.advocate, token, parts)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Document.objects.get().file_size, len(content))
+
+    def test_download_role_checks(self):
+        content = b"%PDF-1.4 order"
+        token, parts = self._upload(self.advocate, content)
+        document_id = self._confirm(self.advocate, token, parts, is_visible_to_client=False).data["id"]
+        url = f"/api/documents/{document_id}/download/"
+
+        response = self._api(self.advocate).get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(requests.get(response.data["url"]).content, content)
+        for outsider in (self.other_advocate, self.other_client, self.client_user):
+            self.assertEqual(self._api(outsider).get(url).status_code, 404, outsider.username)
+
+        Document.objects.filter(pk=document_id).update(is_visible_to_client=True)
+        self.assertEqual(self._api(self.client_user).get(url).status_code, 200)
+        self.assertEqual(self._api(self.other_client).get(url).status_code, 404)
@@ -0,0 +1,56 @@
+"""Signed file links handed out by documents/<id>/download/ with tiered storage."""
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from cases.models import Case
+from documents.models import Document
+
+
+class SignedDownloadTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(DOCUMENT_TIERING=True, MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.advocate = User.objects.create(username="advocate", role="advocate", is_approved=True)
+        self.outsider = User.objects.create(username="outsider", role="advocate", is_approved=True)
+        client = User.objects.create(username="client", role="client", is_approved=True)
+        case = Case.objects.create(case_no="D/1", case_title="t", court_name="c",
+                                   client=client, client_advocate=self.advocate)
+        self.document = Document(case=case, title="Order", uploaded_by=self.advocate)
+        self.document.file.save("order.pdf", ContentFile(b"%PDF-1.4 order"))
+
+    def _download(self, user):
+        api = APIClient()
+        api.force_authenticate(user)
+        return api.get(f"/api/documents/{self.document.pk}/download/")
+
+    def test_link_streams_the_file_and_records_access(self):
+        response = self._download(self.advocate)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/api/documents/files/", response.data["url"])
+        fetched = Client().get(response.data["url"])
+        self.assertEqual(fetched.status_code, 200)
+        self.assertEqual(b"".join(fetched.streaming_content), b"%PDF-1.4 order")
+        self.document.refresh_from_db()
+        self.assertIsNotNone(self.document.last_accessed_at)
+
+    def test_caller_outside_the_case_gets_no_link(self):
+        self.assertEqual(self._download(self.outsider).status_code, 404)
+
+    def test_tampered_or_expired_links_are_refused(self):
+        url = self._download(self.advocate).data["url"]
+        self.assertEqual(Client().get(url[:-3] + "abc/").status_code, 404)
+        with override_settings(DOCUMENT_DOWNLOAD_EXPIRY_SECONDS=-1):
+            self.assertEqual(Client().get(url).status_code, 404)
+
+    def test_media_url_is_not_served(self):
+        self.assertEqual(Client().get(f"/media/{self.document.file.name}").status_code, 404)
+        self.document.refresh_from_db()
+        self.assertIsNone(self.document.last_accessed_at)
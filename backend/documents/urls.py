@@ -1,8 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DocumentViewSet
+from .views import DocumentViewSet, document_file
 
 router = DefaultRouter()
 router.register("", DocumentViewSet, basename="document")
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("files/<str:token>/", document_file, name="document-file"),
+    path("", include(router.urls)),
+]
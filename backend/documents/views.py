@@ -1,12 +1,47 @@
+import os
+
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
 from django.db.models import Q
+from django.http import FileResponse, Http404
+from django.urls import reverse
 
+from . import s3
 from .models import Document
+from .storage import read_download, sign_download
 from .serializers import DocumentSerializer
 from accounts.permissions import IsAdmin, IsApprovedClient
+from cases.models import Case
 from logs.utils import log_action
+from casebox.metrics import UPLOAD_BYTES
+
+
+def signed_links():
+    """Whether files are handed out as signed links to document_file (tiered storage, no bucket)."""
+    return settings.DOCUMENT_TIERING and not s3.enabled()
+
+
+def visible_documents(user):
+    if user.role == "admin":
+        return Document.objects.all()
+    if user.role == "client":
+        return Document.objects.filter(
+            case__client=user,
+            is_visible_to_client=True,
+        )
+    if user.role == "advocate":
+        return Document.objects.filter(
+            Q(case__client_advocate=user) | Q(case__opposition_advocate=user)
+        )
+    if user.role == "judge":
+        return Document.objects.filter(case__judge=user)
+    return Document.objects.none()
 
 
 class DocumentViewSet(viewsets.ModelViewSet):
@@ -26,37 +61,25 @@ class DocumentViewSet(viewsets.ModelViewSet):
         # Only admin and advocates can upload
         if request.user.role not in ("admin", "advocate"):
             return Response({"detail": "Only admins and advocates can upload documents."}, status=403)
+        if s3.enabled():
+            return Response({"detail": "Upload through /api/documents/uploads/ so the file goes straight to storage."},
+                            status=400)
         response = super().create(request, *args, **kwargs)
+        for upload in request.FILES.values():
+            UPLOAD_BYTES.observe(upload.size)
         log_action(request, "upload_document", f"Uploaded document: {request.data.get('title', '')}")
         return response
 
     def get_queryset(self):
-        user = self.request.user
+        qs = visible_documents(self.request.user)
         case_id = self.request.query_params.get("case")
-
-        if user.role == "admin":
-            qs = Document.objects.all()
-        elif user.role == "client":
-            qs = Document.objects.filter(
-                case__client=user,
-                is_visible_to_client=True,
-            )
-        elif user.role == "advocate":
-            qs = Document.objects.filter(
-                Q(case__client_advocate=user) | Q(case__opposition_advocate=user)
-            )
-        elif user.role == "judge":
-            qs = Document.objects.filter(case__judge=user)
-        else:
-            qs = Document.objects.none()
-
         if case_id:
             qs = qs.filter(case_id=case_id)
-
         return qs.select_related("case", "uploaded_by")
 
     def retrieve(self, request, *args, **kwargs):
         response = super().retrieve(request, *args, **kwargs)
+        Document.mark_accessed(pk=response.data["id"])
         log_action(request, "view_document", f"Viewed document {kwargs.get('pk')}")
         return response
 
@@ -64,3 +87,110 @@ class DocumentViewSet(viewsets.ModelViewSet):
         ctx = super().get_serializer_context()
         ctx["request"] = self.request
         return ctx
+
+    # ── Direct-to-bucket transfers (see documents/s3.py) ─────────────────────
+    @action(detail=False, methods=["post"], url_path="uploads")
+    def start_upload(self, request):
+        """Presigned POST or multipart part URLs for uploading one file to the bucket."""
+        if not s3.enabled():
+            return Response({"detail": "Direct uploads are not enabled.", "code": "direct_uploads_disabled"},
+                            status=404)
+        if request.user.role not in ("admin", "advocate"):
+            return Response({"detail": "Only admins and advocates can upload documents."}, status=403)
+        filename = str(request.data.get("filename", ""))
+        content_type = str(request.data.get("content_type") or "application/octet-stream")
+        try:
+            size = int(request.data.get("size"))
+        except (TypeError, ValueError):
+            return Response({"detail": "size must be the file's length in bytes."}, status=400)
+        if os.path.splitext(filename)[1].lower() not in settings.ALLOWED_DOCUMENT_EXTENSIONS:
+            return Response({"detail": "This file type is not allowed."}, status=400)
+        if not 0 < size <= settings.DOCUMENT_S3_MAX_UPLOAD_BYTES:
+            return Response({"detail": f"Files must be at most {settings.DOCUMENT_S3_MAX_UPLOAD_BYTES} bytes."},
+                            status=400)
+        case = Case.objects.visible_to(request.user).filter(pk=request.data.get("case")).first()
+        if case is None:
+            return Response({"detail": "Case not found."}, status=404)
+
+        key = s3.new_key(filename)
+        upload, upload_id = s3.start_upload(key, content_type, size)
+        token = s3.sign_upload(key=key, case=case.pk, user=request.user.pk, upload_id=upload_id, size=size)
+        return Response({"token": token, "upload": upload}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"], url_path="uploads/confirm")
+    def confirm_upload(self, request):
+        """Create the Document once its file is in the bucket."""
+        if not s3.enabled():
+            return Response({"detail": "Direct uploads are not enabled.", "code": "direct_uploads_disabled"},
+                            status=404)
+        try:
+            claims = s3.read_upload(str(request.data.get("token", "")))
+        except signing.BadSignature:
+            return Response({"detail": "Upload token is invalid or has expired."}, status=400)
+        if claims["user"] != request.user.pk:
+            return Response({"detail": "Upload token is invalid or has expired."}, status=400)
+        key = claims["key"]
+        existing = Document.objects.filter(file=key).first()
+        if existing is not None:   # confirm retried after a lost response
+            return Response(self.get_serializer(existing).data)
+
+        try:
+            if claims["upload_id"]:
+                s3.finish_upload(key, claims["upload_id"], request.data.get("parts") or [])
+            size = s3.head(key)
+        except (BotoCoreError, ClientError, KeyError, TypeError, ValueError):
+            return Response({"detail": "The upload could not be completed."}, status=400)
+        if size is None:
+            return Response({"detail": "The file has not been uploaded yet."}, status=400)
+        # Presigned POSTs enforce the declared size, multipart part URLs don't
+        if size > min(claims.get("size", size), settings.DOCUMENT_S3_MAX_UPLOAD_BYTES):
+            s3.delete(key)
+            return Response({"detail": "The uploaded file is larger than declared."}, status=400)
+
+        serializer = self.get_serializer(data={
+            "case": claims["case"],
+            **{field: request.data[field] for field in ("title", "side", "description", "is_visible_to_client")
+               if field in request.data},
+        })
+        serializer.fields["file"].required = False   # already in the bucket; attached below
+        serializer.is_valid(raise_exception=True)
+        serializer.save(file=key, file_size=size)
+        UPLOAD_BYTES.observe(size)
+        log_action(request, "upload_document", f"Uploaded document: {serializer.data['title']}")
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get"], url_path="download")
+    def download(self, request, pk=None):
+        """
+        A URL to fetch the file from: a short-lived presigned GET in bucket mode,
+        a short-lived signed document_file link with tiered storage, else MEDIA_URL.
+        """
+        doc = self.get_object()
+        if not doc.file:
+            return Response({"detail": "This document has no file."}, status=404)
+        Document.mark_accessed(pk=doc.pk)
+        log_action(request, "view_document", f"Downloaded document {doc.pk}")
+        if s3.enabled():
+            url = s3.download_url(doc.file.name, doc.file.name.rsplit("/", 1)[-1])
+            return Response({"url": url, "expires_in": settings.DOCUMENT_S3_DOWNLOAD_EXPIRY_SECONDS})
+        if signed_links():
+            url = request.build_absolute_uri(reverse("document-file", args=[sign_download(doc.pk)]))
+            return Response({"url": url, "expires_in": settings.DOCUMENT_DOWNLOAD_EXPIRY_SECONDS})
+        return Response({"url": request.build_absolute_uri(doc.file.url), "expires_in": None})
+
+
+def document_file(request, token):
+    """The file behind a signed link from DocumentViewSet.download; the link is the access check."""
+    try:
+        document_id = read_download(token)
+    except signing.BadSignature:
+        raise Http404("Download link is invalid or has expired.")
+    document = Document.all_firms.filter(pk=document_id).exclude(file="").first()
+    if document is None:
+        raise Http404("File not found.")
+    try:
+        handle = default_storage.open(document.file.name)
+    except OSError:
+        raise Http404("File is missing from storage.")
+    Document.mark_accessed(pk=document.pk)
+    return FileResponse(handle, as_attachment=True, filename=document.file.name.rsplit("/", 1)[-1])
@@ -0,0 +1,19 @@
+# logs/async_views.py
+from casebox.async_api import async_api_view, json_response
+from .models import AccessLog
+from .views import AccessLogSerializer
+
+
+@async_api_view(admin_only=True)
+async def log_list(request):
+    action_filter = request.GET.get("action", "")
+    user_filter = request.GET.get("user", "")
+
+    qs = AccessLog.objects.all().select_related("user")
+    if action_filter:
+        qs = qs.filter(action=action_filter)
+    if user_filter:
+        qs = qs.filter(user__username__icontains=user_filter)
+
+    logs = [log async for log in qs[:200]]
+    return json_response(AccessLogSerializer(logs, many=True).data)
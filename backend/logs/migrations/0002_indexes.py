@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['-timestamp'], name='log_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['action', '-timestamp'], name='log_action_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['user', '-timestamp'], name='log_user_ts_idx'),
+        ),
+        # Drop the single-column FK indexes only once the composites that lead
+        # with the same column exist
+        migrations.AlterField(
+            model_name='accesslog',
+            name='user',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='access_logs', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-19 15:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('logs', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500)),
+                ('route', models.CharField(blank=True, max_length=100)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField()),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('trigger', models.CharField(choices=[('header', 'Requested by admin'), ('slow', 'Latency threshold')], max_length=10)),
+                ('format', models.CharField(choices=[('pstats', 'cProfile stats'), ('collapsed', 'Collapsed stack samples')], max_length=10)),
+                ('profile_data', models.BinaryField()),
+                ('query_log', models.BinaryField()),
+                ('size', models.PositiveIntegerField(help_text='Compressed bytes stored')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_profiles', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at'], name='profile_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_default_firm(apps, schema_editor):
+    firm = apps.get_model("accounts", "Firm").objects.get(slug="default")
+    for name in ("AccessLog", "RequestProfile"):
+        apps.get_model("logs", name).objects.filter(firm__isnull=True).update(firm=firm)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_firm'),
+        ('logs', '0003_request_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accesslog',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AddField(
+            model_name='requestprofile',
+            name='firm',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RunPython(assign_default_firm, migrations.RunPython.noop),
+    ]
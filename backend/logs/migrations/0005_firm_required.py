@@ -0,0 +1,46 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0004_firm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='accesslog',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.AlterField(
+            model_name='requestprofile',
+            name='firm',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.firm'),
+        ),
+        migrations.RemoveIndex(
+            model_name='accesslog',
+            name='log_timestamp_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='accesslog',
+            name='log_action_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['firm', '-timestamp'], name='log_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accesslog',
+            index=models.Index(fields=['firm', 'action', '-timestamp'], name='log_action_ts_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='requestprofile',
+            name='profile_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestprofile',
+            index=models.Index(fields=['firm', '-created_at'], name='profile_created_idx'),
+        ),
+    ]
@@ -2,8 +2,10 @@
 from django.db import models
 from django.conf import settings
 
+from accounts.models import TenantModel
 
-class AccessLog(models.Model):
+
+class AccessLog(TenantModel):
     ACTION_CHOICES = (
         ("login", "Login"),
         ("view_case", "View Case"),
@@ -19,6 +21,7 @@ class AccessLog(models.Model):
         on_delete=models.SET_NULL,
         null=True,
         related_name="access_logs",
+        db_index=False,  # covered by log_user_ts_idx
     )
     action = models.CharField(max_length=30, choices=ACTION_CHOICES)
     description = models.TextField(blank=True)
@@ -27,6 +30,52 @@ class AccessLog(models.Model):
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["firm", "-timestamp"], name="log_timestamp_idx"),
+            models.Index(fields=["firm", "action", "-timestamp"], name="log_action_ts_idx"),
+            models.Index(fields=["user", "-timestamp"], name="log_user_ts_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} – {self.action} at {self.timestamp}"
+
+
+class RequestProfile(TenantModel):
+    """A captured profile of one request, stored zlib-compressed alongside its SQL log."""
+    TRIGGER_CHOICES = (
+        ("header", "Requested by admin"),
+        ("slow", "Latency threshold"),
+    )
+    FORMAT_CHOICES = (
+        ("pstats", "cProfile stats"),
+        ("collapsed", "Collapsed stack samples"),
+    )
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=100, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField(default=0)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    profile_data = models.BinaryField()
+    query_log = models.BinaryField()
+    size = models.PositiveIntegerField(help_text="Compressed bytes stored")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="request_profiles",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["firm", "-created_at"], name="profile_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} – {self.duration_ms:.0f} ms"
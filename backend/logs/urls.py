@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import log_list
+from .views import log_list, profile_list, profile_download
 
 urlpatterns = [
     path("", log_list, name="log-list"),
+    path("profiles/", profile_list, name="profile-list"),
+    path("profiles/<int:pk>/download/", profile_download, name="profile-download"),
 ]
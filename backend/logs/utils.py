@@ -1,20 +1,45 @@
 # logs/utils.py
+import time
+
+from casebox.instrumentation import phase
+from casebox.metrics import AUDIT_WRITE_LATENCY
 from .models import AccessLog
 
 
 def log_action(request, action, description=""):
     """Helper to create an access log entry. Safe to call anywhere."""
+    start = time.perf_counter()
+    with phase("audit"):
+        try:
+            user = request.user if request and request.user.is_authenticated else None
+            ip = _get_client_ip(request)
+            AccessLog.objects.create(
+                user=user,
+                firm_id=user.firm_id if user else None,
+                action=action,
+                description=description,
+                ip_address=ip,
+            )
+        except Exception:
+            pass  # Never let logging crash the actual request
+    AUDIT_WRITE_LATENCY.observe(time.perf_counter() - start, action=action)
+
+
+async def alog_action(request, action, description=""):
+    """log_action for async views: the INSERT goes through the async ORM."""
+    start = time.perf_counter()
     try:
         user = request.user if request and request.user.is_authenticated else None
-        ip = _get_client_ip(request)
-        AccessLog.objects.create(
+        await AccessLog.objects.acreate(
             user=user,
+            firm_id=user.firm_id if user else None,
             action=action,
             description=description,
-            ip_address=ip,
+            ip_address=_get_client_ip(request),
         )
     except Exception:
-        pass  # Never let logging crash the actual request
+        pass
+    AUDIT_WRITE_LATENCY.observe(time.perf_counter() - start, action=action)
 
 
 def _get_client_ip(request):
@@ -1,8 +1,12 @@
+import zlib
+
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import serializers
 from accounts.permissions import IsAdmin
-from .models import AccessLog
+from .models import AccessLog, RequestProfile
 
 
 class AccessLogSerializer(serializers.ModelSerializer):
@@ -33,3 +37,56 @@ def log_list(request):
     # Paginate: last 200 logs
     qs = qs[:200]
     return Response(AccessLogSerializer(qs, many=True).data)
+
+
+class RequestProfileSerializer(serializers.ModelSerializer):
+    user_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RequestProfile
+        fields = [
+            "id", "method", "path", "route", "status_code", "duration_ms",
+            "query_count", "trigger", "format", "size", "user", "user_name", "created_at",
+        ]
+
+    def get_user_name(self, obj):
+        if obj.user:
+            return obj.user.get_full_name() or obj.user.username
+        return None
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def profile_list(request):
+    route_filter = request.query_params.get("route", "")
+    trigger_filter = request.query_params.get("trigger", "")
+
+    qs = RequestProfile.objects.all().select_related("user").defer("profile_data", "query_log")
+    if route_filter:
+        qs = qs.filter(route=route_filter)
+    if trigger_filter:
+        qs = qs.filter(trigger=trigger_filter)
+
+    qs = qs[:200]
+    return Response(RequestProfileSerializer(qs, many=True).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def profile_download(request, pk):
+    """
+    ?part=profile (default) returns the raw profile: a pstats file for cProfile
+    runs (open with snakeviz or pstats), collapsed stacks for sampled ones.
+    ?part=queries returns the request's SQL log as JSON.
+    """
+    profile = get_object_or_404(RequestProfile, pk=pk)
+    if request.query_params.get("part") == "queries":
+        return HttpResponse(zlib.decompress(profile.query_log), content_type="application/json")
+
+    if profile.format == "pstats":
+        content_type, filename = "application/octet-stream", f"profile-{pk}.prof"
+    else:
+        content_type, filename = "text/plain; charset=utf-8", f"profile-{pk}.collapsed.txt"
+    response = HttpResponse(zlib.decompress(profile.profile_data), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -25,15 +25,17 @@ export const usersAPI = {
 export const casesAPI = {
   list:            (params)           => API.get("/cases/", { params }),
   get:             (id)               => API.get(`/cases/${id}/`),
-  create:          (data)             => API.post("/cases/", data),
-  update:          (id, data)         => API.patch(`/cases/${id}/`, data),
+  // params: { allow_conflicts: true } to save despite a hearing double-booking (409)
+  create:          (data, params)     => API.post("/cases/", data, { params }),
+  update:          (id, data, params) => API.patch(`/cases/${id}/`, data, { params }),
   delete:          (id)               => API.delete(`/cases/${id}/`),
   dashboard:       ()                 => API.get("/cases/dashboard/"),
 
-  hearingNotes:    (id)               => API.get(`/cases/${id}/hearing-notes/`),
+  // Newest first, cursor-paginated; pass the previous page's cursor for older entries
+  hearingNotes:    (id, cursor)       => API.get(`/cases/${id}/hearing-notes/`, { params: cursor ? { cursor } : {} }),
   addHearingNote:  (id, data)         => API.post(`/cases/${id}/hearing-notes/`, data),
 
-  comments:        (id)               => API.get(`/cases/${id}/comments/`),
+  comments:        (id, cursor)       => API.get(`/cases/${id}/comments/`, { params: cursor ? { cursor } : {} }),
   addComment:      (id, text)         => API.post(`/cases/${id}/comments/`, { text }),
 
   updateProgress:  (id, progress)     => API.patch(`/cases/${id}/progress/`, { progress }),
@@ -48,13 +50,74 @@ export const docsAPI = {
   }),
   delete:  (id)             => API.delete(`/documents/${id}/`),
   update:  (id, data)       => API.patch(`/documents/${id}/`, data),
+  download:(id)             => API.get(`/documents/${id}/download/`),
+  startUpload:   (data)     => API.post("/documents/uploads/", data),
+  confirmUpload: (data)     => API.post("/documents/uploads/confirm/", data),
 };
 
+// Opens the tab before the request so it isn't popup-blocked; the URL may be a short-lived presigned GET
+export async function openDocument(id) {
+  const win = window.open("", "_blank");
+  try {
+    const r = await docsAPI.download(id);
+    win.location = r.data.url;
+  } catch (err) {
+    win?.close();
+    throw err;
+  }
+}
+
+const storageError = { response: { data: { detail: "Upload to storage failed." } } };
+
+// Sends the file straight to the bucket when the server hands out presigned URLs,
+// otherwise posts it through the API
+export async function uploadDocument(caseId, file, meta) {
+  let start;
+  try {
+    start = await docsAPI.startUpload({
+      case: caseId, filename: file.name, size: file.size,
+      content_type: file.type || "application/octet-stream",
+    });
+  } catch (err) {
+    if (err.response?.data?.code !== "direct_uploads_disabled") throw err;
+    const fd = new FormData();
+    fd.append("case", caseId);
+    Object.entries(meta).forEach(([k, v]) => fd.append(k, v));
+    fd.append("file", file);
+    return docsAPI.upload(fd);
+  }
+
+  const { token, upload } = start.data;
+  let parts = [];
+  // Plain fetch: the bucket must not receive our Authorization header
+  if (upload.method === "post") {
+    const form = new FormData();
+    Object.entries(upload.fields).forEach(([k, v]) => form.append(k, v));
+    form.append("file", file);
+    const res = await fetch(upload.url, { method: "POST", body: form }).catch(() => null);
+    if (!res?.ok) throw storageError;
+  } else {
+    for (const part of upload.parts) {
+      const offset = (part.part_number - 1) * upload.part_size;
+      const res = await fetch(part.url, { method: "PUT", body: file.slice(offset, offset + upload.part_size) })
+        .catch(() => null);
+      if (!res?.ok) throw storageError;
+      parts.push({ part_number: part.part_number, etag: res.headers.get("ETag") });
+    }
+  }
+  return docsAPI.confirmUpload({ token, parts, ...meta });
+}
+
 // ── LOGS (admin) ──────────────────────────────────────────────────────────────
 export const logsAPI = {
   list:  (params)           => API.get("/logs/", { params }),
 };
 
+// Cursor to pass back for the page a paginated response's `next` link points at
+export function nextCursor(next) {
+  return next ? new URL(next).searchParams.get("cursor") : null;
+}
+
 // ── ERROR HELPER ──────────────────────────────────────────────────────────────
 export function getErrorMessage(err) {
   if (!err.response) return "Network error — is the backend running?";
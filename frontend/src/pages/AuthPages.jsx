@@ -10,7 +10,7 @@ export function RegisterPage({ onLogin }) {
   const { register } = useAuth();
   const [form, setForm] = useState({
     first_name: "", last_name: "", username: "", email: "",
-    phone: "", address: "", password: "", confirm: "",
+    phone: "", address: "", firm: "", password: "", confirm: "",
   });
   const [err, setErr]         = useState("");
   const [done, setDone]       = useState(false);
@@ -31,6 +31,7 @@ export function RegisterPage({ onLogin }) {
       email:      form.email,
       phone:      form.phone,
       address:    form.address,
+      firm:       form.firm || undefined,
       password:   form.password,
     });
     if (!res.ok) setErr(res.msg);
@@ -82,6 +83,7 @@ export function RegisterPage({ onLogin }) {
               <Input label="Email *" id="email" type="email" value={form.email} onChange={set("email")} required />
               <Input label="Phone Number" id="phone" value={form.phone} onChange={set("phone")} placeholder="+91 XXXXX XXXXX" />
               <Input label="Address" id="address" value={form.address} onChange={set("address")} placeholder="City, State" />
+              <Input label="Firm Code" id="firm" value={form.firm} onChange={set("firm")} placeholder="Given to you by your law firm" />
               <FormRow>
                 <Input label="Password *" id="pwd" type="password" value={form.password} onChange={set("password")} required />
                 <Input label="Confirm Password *" id="cpwd" type="password" value={form.confirm} onChange={set("confirm")} required />
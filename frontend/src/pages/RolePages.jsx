@@ -1,6 +1,6 @@
 import { useState, useEffect } from "react";
 import { useAuth } from "../context/AuthContext";
-import { casesAPI, docsAPI } from "../api";
+import { casesAPI, docsAPI, getErrorMessage, openDocument } from "../api";
 import {
   Card, CardBody, CardHeader, Badge, Btn, DataTable,
   SearchBar, SectionLabel, ProgressBar, EmptyState, StatCard, toast,
@@ -301,9 +301,8 @@ export function ClientDocumentsPage({ setPage, setDetailCase }) {
               </div>
               <Badge label={d.side} variant={d.side} />
               {d.file_url && (
-                <a href={d.file_url} target="_blank" rel="noopener noreferrer" style={{ textDecoration:"none" }}>
-                  <Btn variant="ghost" size="sm">↓ Download</Btn>
-                </a>
+                <Btn variant="ghost" size="sm"
+                  onClick={() => openDocument(d.id).catch(err => toast(getErrorMessage(err), "error"))}>↓ Download</Btn>
               )}
             </div>
           ))}
@@ -26,6 +26,7 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
   const [filterStatus, setFS]   = useState("");
   const [filterType, setFT]     = useState("");
   const [filterPrio, setFP]     = useState("");
+  const [archived, setArchived] = useState(false);
   const [modal, setModal]       = useState(false);
   const [editing, setEditing]   = useState(null);
   const [form, setForm]         = useState(emptyForm);
@@ -37,11 +38,12 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
 
   const load = useCallback(() => {
     setLoading(true);
-    casesAPI.list({ search: q, status: filterStatus, case_type: filterType, priority: filterPrio })
+    casesAPI.list({ search: q, status: filterStatus, case_type: filterType, priority: filterPrio,
+                    include_archived: archived ? 1 : undefined })
       .then(r => setCases(r.data))
       .catch(() => toast("Failed to load cases.", "error"))
       .finally(() => setLoading(false));
-  }, [q, filterStatus, filterType, filterPrio]);
+  }, [q, filterStatus, filterType, filterPrio, archived]);
 
   useEffect(() => { load(); }, [load]);
 
@@ -67,23 +69,38 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
     setModal(true);
   };
 
-  const save = async () => {
+  const save = async (params) => {
     if (!form.case_no || !form.case_title || !form.court_name || !form.client) {
       toast("Case No, Title, Court, and Client are required.", "error"); return;
     }
+    // Blank date inputs mean "no date"; the API rejects empty strings
+    const payload = { ...form };
+    ["filing_date", "next_hearing_date", "last_hearing_date"].forEach(k => { if (payload[k] === "") payload[k] = null; });
     setSaving(true);
     try {
       if (editing) {
-        await casesAPI.update(editing, form);
+        await casesAPI.update(editing, payload, params);
         toast("Case updated.", "success");
       } else {
-        await casesAPI.create(form);
+        await casesAPI.create(payload, params);
         toast("Case created.", "success");
       }
       setModal(false);
       load();
     } catch (err) {
-      toast(getErrorMessage(err), "error");
+      const data = err.response?.data;
+      const found = data?.conflicts || data?.conflicts_of_interest;
+      if (err.response?.status === 409 && found) {
+        const clashes = found
+          .map(c => `${c.message ? c.message + " " : ""}${c.participant_name}: ${c.cases.map(x => x.case_no).join(", ")}`)
+          .join("\n");
+        if (window.confirm(`${data.detail}\n\n${clashes}\n\nSave anyway?`)) {
+          setSaving(false);
+          return save({ allow_conflicts: true });
+        }
+      } else {
+        toast(getErrorMessage(err), "error");
+      }
     } finally {
       setSaving(false);
     }
@@ -102,7 +119,7 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
     { label:"Client",    render: c => <span style={{ fontSize:"0.84rem" }}>{c.client_name || "—"}</span> },
     { label:"Hearing",   render: c => <span style={{ fontSize:"0.8rem", color:c.next_hearing_date?"#243460":"#7a7a8a" }}>{c.next_hearing_date || "—"}</span> },
     { label:"Progress",  render: c => <div style={{ width:100 }}><ProgressBar value={c.progress} /></div> },
-    { label:"Status",    render: c => <Badge label={c.status} variant={c.status} /> },
+    { label:"Status",    render: c => <Badge label={c.is_archived ? `${c.status} · archived` : c.status} variant={c.status} /> },
     { label:"",          render: c => (
       <Btn variant="ghost" size="sm" onClick={e => { e.stopPropagation(); openEdit(c); }}>Edit</Btn>
     )},
@@ -137,6 +154,10 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
                 {f.opts.map(o=><option key={o} value={o}>{o.replace(/_/g," ")}</option>)}
               </select>
             ))}
+            <label style={{ display:"flex", alignItems:"center", gap:6, fontSize:"0.84rem", color:"#4a4a5a" }}>
+              <input type="checkbox" checked={archived} onChange={e => setArchived(e.target.checked)} />
+              Include archived
+            </label>
           </div>
         </CardBody>
       </Card>
@@ -157,7 +178,7 @@ export default function AdminCasesPage({ setPage, setDetailCase }) {
         title={editing ? "Edit Case" : "Create New Case"} size="lg"
         footer={<>
           <Btn variant="ghost" onClick={() => setModal(false)}>Cancel</Btn>
-          <Btn variant="sage"  onClick={save} disabled={saving}>{saving ? "Saving…" : editing ? "Save Changes" : "Create Case"}</Btn>
+          <Btn variant="sage"  onClick={() => save()} disabled={saving}>{saving ? "Saving…" : editing ? "Save Changes" : "Create Case"}</Btn>
         </>}>
         <FormRow>
           <Input label="Case Number *" id="cno" value={form.case_no}    onChange={set("case_no")}    placeholder="DEL/CIV/2026/001" />
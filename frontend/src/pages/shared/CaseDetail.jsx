@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
 import { useAuth } from "../../context/AuthContext";
-import { casesAPI, docsAPI, getErrorMessage } from "../../api";
+import { casesAPI, docsAPI, getErrorMessage, nextCursor, openDocument, uploadDocument } from "../../api";
 import {
   Card, CardHeader, CardBody, Badge, Btn, Modal, Input, Textarea,
   ProgressBar, SectionLabel, Timeline, EmptyState, Select, toast,
@@ -13,6 +13,12 @@ export default function CaseDetail({ caseId, onBack }) {
   const [loading, setLoading] = useState(true);
   const [err, setErr]         = useState("");
 
+  // Detail embeds only the newest notes/comments; older ones are paged in on demand
+  const [notes, setNotes]               = useState([]);
+  const [noteCursor, setNoteCursor]     = useState(null);
+  const [comments, setComments]         = useState([]);
+  const [commentCursor, setComCursor]   = useState(null);
+
   const [noteModal, setNoteModal]   = useState(false);
   const [progModal, setProgModal]   = useState(false);
   const [comModal,  setComModal]    = useState(false);
@@ -30,7 +36,11 @@ export default function CaseDetail({ caseId, onBack }) {
   const load = () => {
     setLoading(true);
     casesAPI.get(caseId)
-      .then(r => { setC(r.data); setNewProg(r.data.progress); })
+      .then(r => {
+        setC(r.data); setNewProg(r.data.progress);
+        setNotes(r.data.hearing_notes || []); setNoteCursor(null);
+        setComments(r.data.comments || []);   setComCursor(null);
+      })
       .catch(() => setErr("Could not load case. You may not have access."))
       .finally(() => setLoading(false));
   };
@@ -43,6 +53,18 @@ export default function CaseDetail({ caseId, onBack }) {
 
   // Helpers
   const name = (nameField) => nameField || "—";
+  const mergeById = (prev, more) => {
+    const seen = new Set(prev.map(x => x.id));
+    return [...prev, ...more.filter(x => !seen.has(x.id))];
+  };
+
+  const loadOlderNotes = () => casesAPI.hearingNotes(caseId, noteCursor)
+    .then(r => { setNotes(p => mergeById(p, r.data.results)); setNoteCursor(nextCursor(r.data.next)); })
+    .catch(err => toast(getErrorMessage(err),"error"));
+
+  const loadOlderComments = () => casesAPI.comments(caseId, commentCursor)
+    .then(r => { setComments(p => mergeById(p, r.data.results)); setComCursor(nextCursor(r.data.next)); })
+    .catch(err => toast(getErrorMessage(err),"error"));
 
   const saveNote = async () => {
     if (!noteForm.hearing_date || !noteForm.note) { toast("Date and note are required.","error"); return; }
@@ -84,15 +106,11 @@ export default function CaseDetail({ caseId, onBack }) {
 
   const uploadDoc = async () => {
     if (!uploadForm.file || !uploadForm.title) { toast("Title and file are required.","error"); return; }
-    const fd = new FormData();
-    fd.append("case", caseId);
-    fd.append("title", uploadForm.title);
-    fd.append("side", uploadForm.side);
-    fd.append("description", uploadForm.description);
-    fd.append("file", uploadForm.file);
     setSaving(true);
     try {
-      await docsAPI.upload(fd);
+      await uploadDocument(caseId, uploadForm.file, {
+        title: uploadForm.title, side: uploadForm.side, description: uploadForm.description,
+      });
       toast("Document uploaded.","success");
       setUpModal(false);
       setUploadForm({ title:"", side:"client", description:"", file:null });
@@ -109,6 +127,8 @@ export default function CaseDetail({ caseId, onBack }) {
     } catch(err) { toast(getErrorMessage(err),"error"); }
   };
 
+  const downloadDoc = docId => openDocument(docId).catch(err => toast(getErrorMessage(err),"error"));
+
   const deleteDoc = async (docId) => {
     if (!window.confirm("Delete this document? This cannot be undone.")) return;
     try {
@@ -133,7 +153,7 @@ export default function CaseDetail({ caseId, onBack }) {
     </div>
   );
 
-  const timelineItems = (c.hearing_notes || []).map(n => ({
+  const timelineItems = notes.map(n => ({
     date: n.hearing_date, text: n.note, next: n.next_date, who: n.added_by_name,
   }));
 
@@ -236,12 +256,15 @@ export default function CaseDetail({ caseId, onBack }) {
       <div style={{ display:"grid", gridTemplateColumns:"1fr 1fr", gap:16, marginBottom:16 }}>
         {/* Hearing timeline */}
         <Card noPad>
-          <CardHeader title="Hearing History" action={<span style={{ fontSize:"0.74rem", color:"#7a7a8a" }}>{timelineItems.length} entries</span>} />
+          <CardHeader title="Hearing History" action={<span style={{ fontSize:"0.74rem", color:"#7a7a8a" }}>{c.hearing_note_count} entries</span>} />
           <CardBody>
             {timelineItems.length > 0
               ? <Timeline items={timelineItems} />
               : <EmptyState icon={<SketchGavel size={44} />} title="No hearings yet" desc="Hearing notes will appear here." />
             }
+            {notes.length < c.hearing_note_count && (
+              <Btn variant="ghost" size="sm" onClick={loadOlderNotes}>Show older hearings</Btn>
+            )}
           </CardBody>
         </Card>
 
@@ -264,11 +287,7 @@ export default function CaseDetail({ caseId, onBack }) {
                   <div style={{ fontSize:"0.73rem", color:"#7a7a8a" }}>{d.file_type || d.side} · {d.upload_date?.split("T")[0]}</div>
                 </div>
                 <Badge label={d.side} variant={d.side} />
-                {d.file_url && (
-                  <a href={d.file_url} target="_blank" rel="noopener noreferrer" style={{ textDecoration:"none" }}>
-                    <Btn variant="ghost" size="sm">↓</Btn>
-                  </a>
-                )}
+                {d.file_url && <Btn variant="ghost" size="sm" onClick={() => downloadDoc(d.id)}>↓</Btn>}
                 {isAdmin && <Btn variant="danger" size="sm" onClick={() => deleteDoc(d.id)}>✕</Btn>}
               </div>
             )) : <EmptyState icon={<SketchFolder size={44} />} title="No documents" desc="Documents appear here." />}
@@ -281,7 +300,7 @@ export default function CaseDetail({ caseId, onBack }) {
         <Card noPad>
           <CardHeader title="Internal Comments" action={<span style={{ fontSize:"0.74rem", color:"#7a7a8a" }}>Visible to advocates & admin only</span>} />
           <CardBody>
-            {(c.comments || []).length > 0 ? (c.comments || []).map(cm => (
+            {comments.length > 0 ? comments.map(cm => (
               <div key={cm.id} style={{ padding:"12px 14px", background:"#f8f4ed", borderRadius:8, marginBottom:8, border:"1px solid #d6cfc2" }}>
                 <div style={{ fontSize:"0.74rem", color:"#7a7a8a", marginBottom:5 }}>
                   {cm.author_name} · {new Date(cm.created_at).toLocaleDateString("en-IN")}
@@ -289,6 +308,9 @@ export default function CaseDetail({ caseId, onBack }) {
                 <p style={{ fontSize:"0.86rem", color:"#1a1a2e", lineHeight:1.6 }}>{cm.text}</p>
               </div>
             )) : <EmptyState icon={<SketchPen size={44} />} title="No comments yet" desc="Internal notes for your team." />}
+            {comments.length < c.comment_count && (
+              <Btn variant="ghost" size="sm" onClick={loadOlderComments}>Show older comments</Btn>
+            )}
           </CardBody>
         </Card>
       )}